@@ -0,0 +1,347 @@
+"""
+Throughput and memory benchmarks for the public entry points of csv_utilite.
+
+Synthetic datasets are generated locally, and every benchmark runs in its own
+subprocess, so that its peak resident memory is measured in isolation. Only
+the timed region is measured: the memory held by the setup of a benchmark is
+reported as its baseline, and regressions are checked on the growth above it.
+
+Usage:
+    python benchmarks/run.py --size 64MB --output results.json
+    python benchmarks/run.py --size 64MB --compare baseline.json --threshold 0.1
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from csv_utilite import Reader, Writer, csv_to_json, merge_files, generate_from_db  # noqa: E402
+
+DATASETS = ('narrow', 'wide', 'numeric', 'quoted')
+BENCHMARKS = ('reader', 'writer', 'csv_to_json', 'merge_files', 'generate_from_db')
+WORDS = ['alpha', 'beta', 'gamma', 'delta', 'epsilon', 'zeta', 'eta', 'theta']
+
+
+def dataset_rows(name: str, seed: int = 0) -> Iterator[List[str]]:
+    """
+    Yield an endless, deterministic stream of rows for a dataset, starting with its header.
+
+    Args:
+        name (str): 'narrow' (3 mixed columns), 'wide' (60 mixed columns),
+            'numeric' (12 int and float columns) or 'quoted' (text with delimiters,
+            quotes and newlines).
+        seed (int): The random seed.
+
+    Returns:
+        Iterator[List[str]]: The header, then the data rows.
+    """
+    rng = random.Random(seed)
+    if name == 'narrow':
+        yield ['id', 'category', 'amount']
+        index = 0
+        while True:
+            index += 1
+            yield [str(index), rng.choice(WORDS), f'{rng.random() * 1000:.2f}']
+    elif name == 'wide':
+        yield [f'col{index}' for index in range(60)]
+        while True:
+            yield [str(rng.randrange(100000)) if index % 3 == 0 else
+                   f'{rng.random():.6f}' if index % 3 == 1 else rng.choice(WORDS)
+                   for index in range(60)]
+    elif name == 'numeric':
+        yield [f'x{index}' for index in range(12)]
+        while True:
+            yield [str(rng.randrange(-10 ** 9, 10 ** 9)) if index % 2 else repr(rng.gauss(0, 1e6))
+                   for index in range(12)]
+    elif name == 'quoted':
+        yield ['id', 'title', 'body']
+        index = 0
+        while True:
+            index += 1
+            words = rng.choices(WORDS, k=rng.randrange(3, 20))
+            yield [str(index), f'{words[0]}, "{words[1]}"', '\n'.join(' '.join(words[i:i + 4]) for i in range(0, len(words), 4))]
+    else:
+        raise ValueError(f"Unknown dataset: {name}")
+
+
+def generate_dataset(name: str, size: int, data_dir: str) -> str:
+    """
+    Write a dataset of about size bytes, reusing a previously generated file.
+
+    Returns:
+        str: The path of the CSV file.
+    """
+    path = os.path.join(data_dir, f'{name}_{size}.csv')
+    if os.path.exists(path):
+        return path
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        for row in dataset_rows(name):
+            writer.writerow(row)
+            if file.tell() >= size:
+                break
+    os.replace(tmp_path, path)
+    return path
+
+
+def count_rows(path: str) -> int:
+    with open(path, newline='', encoding='utf-8') as file:
+        return sum(1 for _ in csv.reader(file)) - 1
+
+
+# Each bench_* function prepares a benchmark and returns the function to time,
+# which returns the number of rows and of CSV bytes it read or wrote. Inputs
+# are prepared outside of that function, so that only the library is timed.
+
+def bench_reader(path: str, work_dir: str) -> Callable[[], Tuple[int, int]]:
+    def run():
+        with open(path, newline='', encoding='utf-8') as file:
+            return sum(1 for _ in Reader(file)) - 1, os.path.getsize(path)
+    return run
+
+
+def bench_writer(path: str, work_dir: str) -> Callable[[], Tuple[int, int]]:
+    with open(path, newline='', encoding='utf-8') as file:
+        rows = list(csv.reader(file))
+    output_path = os.path.join(work_dir, 'writer.csv')
+
+    def run():
+        with Writer(output_path, encoding='utf-8') as writer:
+            writer.writerows(rows)
+        return len(rows) - 1, os.path.getsize(output_path)
+    return run
+
+
+def bench_csv_to_json(path: str, work_dir: str) -> Callable[[], Tuple[int, int]]:
+    def run():
+        with open(path, newline='', encoding='utf-8') as file:
+            return len(csv_to_json(Reader(file))), os.path.getsize(path)
+    return run
+
+
+def bench_merge_files(path: str, work_dir: str) -> Callable[[], Tuple[int, int]]:
+    rows = count_rows(path)
+    output_path = os.path.join(work_dir, 'merged.csv')
+
+    def run():
+        merge_files([path, path], output_path)
+        return rows * 2, os.path.getsize(path) * 2
+    return run
+
+
+def bench_generate_from_db(path: str, work_dir: str) -> Callable[[], Tuple[int, int]]:
+    connection = sqlite3.connect(os.path.join(work_dir, 'bench.db'))
+    with open(path, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        columns = ', '.join(f'"{column}"' for column in header)
+        connection.execute(f'CREATE TABLE data ({columns})')
+        connection.executemany(f'INSERT INTO data VALUES ({", ".join("?" * len(header))})', reader)
+    connection.commit()
+    rows = connection.execute('SELECT COUNT(*) FROM data').fetchone()[0]
+    output_path = os.path.join(work_dir, 'exported.csv')
+
+    def run():
+        generate_from_db('SELECT * FROM data', connection, output_path, headers=header)
+        return rows, os.path.getsize(output_path)
+    return run
+
+
+def run_one(benchmark: str, path: str) -> Dict[str, Any]:
+    """
+    Run a single benchmark in the current process and return its measurements.
+    """
+    with tempfile.TemporaryDirectory(prefix='csv_utilite_bench_') as work_dir:
+        run = globals()[f'bench_{benchmark}'](path, work_dir)
+        reset_peak_rss()
+        baseline = current_rss_mb()
+        if baseline is None:
+            baseline = peak_rss_mb()
+        start = time.perf_counter()
+        rows, size = run()
+        seconds = time.perf_counter() - start
+        peak = peak_rss_mb()
+    return {
+        'rows': rows,
+        'bytes': size,
+        'seconds': seconds,
+        'rows_per_sec': rows / seconds if seconds else None,
+        'mb_per_sec': size / seconds / 1e6 if seconds else None,
+        'baseline_rss_mb': baseline,
+        'peak_rss_mb': peak,
+        'rss_growth_mb': max(peak - baseline, 0.0) if peak is not None and baseline is not None else None,
+    }
+
+
+def _proc_status_mb(field: str) -> Optional[float]:
+    """
+    Return a memory field of /proc/self/status, such as VmRSS or VmHWM, in megabytes, where available.
+    """
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1e3
+    except OSError:
+        pass
+    return None
+
+
+def current_rss_mb() -> Optional[float]:
+    """
+    Return the resident memory of the current process in megabytes, where available.
+    """
+    return _proc_status_mb('VmRSS')
+
+
+def reset_peak_rss() -> None:
+    """
+    Reset the peak resident memory to the current one, where the platform allows it (Linux 4.0+).
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as file:
+            file.write('5')
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Return the peak resident memory of the current process in megabytes, where available.
+
+    On Linux, this is the peak since the last reset_peak_rss(). Elsewhere, it is the
+    peak since the process started.
+    """
+    peak = _proc_status_mb('VmHWM')
+    if peak is not None:
+        return peak
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+def run_suite(benchmarks: List[str], datasets: List[str], size: int, data_dir: str, repeat: int) -> List[Dict[str, Any]]:
+    """
+    Run every benchmark on every dataset, each in a fresh subprocess, keeping the fastest run.
+    """
+    results = []
+    for dataset in datasets:
+        path = generate_dataset(dataset, size, data_dir)
+        for benchmark in benchmarks:
+            runs = []
+            for _ in range(repeat):
+                output = subprocess.run([sys.executable, os.path.abspath(__file__), '--run-one', benchmark, path],
+                                        check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+                runs.append(json.loads(output))
+            best = min(runs, key=lambda result: result['seconds'])
+            for field in ('peak_rss_mb', 'rss_growth_mb'):
+                values = [result[field] for result in runs if result[field] is not None]
+                best[field] = max(values) if values else None
+            result = dict(benchmark=benchmark, dataset=dataset, **best)
+            print(f"{benchmark:>18} {dataset:>8}  {result['rows_per_sec']:>12,.0f} rows/s  "
+                  f"{result['mb_per_sec']:>8.1f} MB/s  {result['rss_growth_mb'] or 0:>8.1f} MB growth", file=sys.stderr)
+            results.append(result)
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float) -> List[str]:
+    """
+    Return a description of every regression of the results against a baseline.
+
+    A regression is a throughput lower, or a memory growth higher, than the
+    baseline by more than threshold (a fraction). Baselines recorded without
+    a memory growth are compared on their peak memory.
+    """
+    previous = {(result['benchmark'], result['dataset']): result for result in baseline}
+    regressions = []
+    for result in results:
+        base = previous.get((result['benchmark'], result['dataset']))
+        if base is None:
+            continue
+        name = f"{result['benchmark']} on {result['dataset']}"
+        if base['rows_per_sec'] and result['rows_per_sec'] < base['rows_per_sec'] * (1 - threshold):
+            regressions.append(f"{name}: {result['rows_per_sec']:,.0f} rows/s, baseline {base['rows_per_sec']:,.0f}")
+        field = 'rss_growth_mb' if base.get('rss_growth_mb') is not None else 'peak_rss_mb'
+        label = 'growth' if field == 'rss_growth_mb' else 'peak'
+        if base.get(field) and result.get(field) and result[field] > base[field] * (1 + threshold):
+            regressions.append(f"{name}: {result[field]:.1f} MB {label}, baseline {base[field]:.1f}")
+    return regressions
+
+
+def parse_size(value: str) -> int:
+    units = {'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30}
+    value = value.strip().upper()
+    for unit, factor in units.items():
+        if value.endswith(unit):
+            return int(float(value[:-len(unit)]) * factor)
+    return int(value)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=parse_size, default=parse_size('16MB'),
+                        help='approximate size of each dataset, such as 16MB or 4GB (default: 16MB)')
+    parser.add_argument('--datasets', default=','.join(DATASETS), help='comma-separated datasets (default: all)')
+    parser.add_argument('--benchmarks', default=','.join(BENCHMARKS), help='comma-separated benchmarks (default: all)')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'csv_utilite_bench'),
+                        help='where generated datasets are kept between runs')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per benchmark, the fastest is kept (default: 3)')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--compare', metavar='BASELINE', help='a previous JSON output to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='tolerated slowdown or memory growth as a fraction (default: 0.1)')
+    parser.add_argument('--run-one', nargs=2, metavar=('BENCHMARK', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_one:
+        print(json.dumps(run_one(*args.run_one)))
+        return 0
+
+    datasets = args.datasets.split(',')
+    benchmarks = args.benchmarks.split(',')
+    for name in datasets:
+        if name not in DATASETS:
+            parser.error(f"unknown dataset: {name}")
+    for name in benchmarks:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = run_suite(benchmarks, datasets, args.size, args.data_dir, args.repeat)
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'size': args.size,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file)['results'], args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,42 @@
-from .reader import Reader
-from .writer import Writer
-from .validation import validate_rows, validate_headers
-from .conversion import csv_to_json, json_to_csv
-from .manipulation import filter_rows, sort_rows, merge_files
-from .generation import generate_from_db, generate_from_dict
-from .formating import quote_fields, remove_quotes, handle_newlines
\ No newline at end of file
+import importlib
+
+# The public names of each submodule. Submodules are imported on first access,
+# so that `import csv_utilite` and the command line start quickly. A name is never
+# both a submodule and an export: the follow() function is csv_utilite.follow.follow.
+_SUBMODULES = {
+    'reader': ['Reader'],
+    'sniffing': ['sniff', 'clear_sniff_cache'],
+    'writer': ['Writer'],
+    'validation': ['validate_rows', 'validate_headers'],
+    'conversion': ['csv_to_json', 'json_to_csv', 'csv_to_parquet', 'parquet_to_csv'],
+    'manipulation': ['filter_rows', 'sort_rows', 'merge_files', 'top_n', 'merge_top_n', 'sample_rows', 'merge_samples', 'split_file', 'semi_join'],
+    'generation': ['generate_from_db', 'generate_from_dict', 'generate_from_records'],
+    'formating': ['quote_fields', 'remove_quotes', 'handle_newlines', 'format_rows'],
+    'pipeline': ['scan', 'Pipeline'],
+    'cache': ['ColumnarCache', 'read_cached'],
+    'follow': ['Follower'],
+    'diff': ['diff_files'],
+    'profiling': ['profile_file', 'FileProfile'],
+    'metrics': ['Metrics', 'collect_metrics'],
+    'bloom': ['BloomFilter'],
+}
+_ALIASES = {'collect_metrics': 'collect'}
+_EXPORTS = {name: module for module, names in _SUBMODULES.items() for name in names}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        if name in _SUBMODULES:
+            return importlib.import_module(f'.{name}', __name__)
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), _ALIASES.get(name, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import math
+import mmap
+import struct
+from typing import Iterable
+
+_MAGIC = b'CSVBLM02'
+_HEADER = struct.Struct('<8sQQQQ')
+
+
+class BloomFilter:
+    """
+    A compact, probabilistic set of strings.
+
+    Membership tests never miss a key that was added, and report a key that
+    was not added with a probability of about error_rate. A filter can be
+    saved to a file and loaded back memory-mapped, so that several processes
+    share one copy of it through the page cache. The metadata dictionary is
+    saved along with it, to describe how it was built.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Initialize an empty BloomFilter instance.
+
+        Args:
+            capacity (int): The expected number of keys.
+            error_rate (float, optional): The false positive rate at capacity keys. Default is 0.01.
+
+        Raises:
+            ValueError: If error_rate is not between 0 and 1.
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError(f"Invalid 'error_rate' value: {error_rate}")
+        capacity = max(capacity, 1)
+        num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_bits = num_bits
+        self.num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        self.count = 0
+        self.metadata = {}
+        self._bits = bytearray((num_bits + 7) // 8)
+        self._mmap = None
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[str], capacity: int, error_rate: float = 0.01) -> 'BloomFilter':
+        """
+        Build a filter holding keys.
+
+        Args:
+            keys (Iterable[str]): The keys to add.
+            capacity (int): The expected number of keys.
+            error_rate (float, optional): The false positive rate at capacity keys. Default is 0.01.
+
+        Returns:
+            BloomFilter: The filter.
+        """
+        bloom = cls(capacity, error_rate)
+        for key in keys:
+            bloom.add(key)
+        return bloom
+
+    @classmethod
+    def load(cls, path: str) -> 'BloomFilter':
+        """
+        Load a filter saved with save(), memory-mapped and read-only.
+
+        Args:
+            path (str): The file path of the filter.
+
+        Returns:
+            BloomFilter: The filter. Call close() to release the mapping.
+
+        Raises:
+            ValueError: If the file is not a saved filter.
+        """
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < _HEADER.size:
+            mapped.close()
+            raise ValueError(f"{path} is not a Bloom filter file")
+        magic, num_bits, num_hashes, count, meta_size = _HEADER.unpack_from(mapped)
+        offset = _HEADER.size + meta_size
+        if magic != _MAGIC or len(mapped) != offset + (num_bits + 7) // 8:
+            mapped.close()
+            raise ValueError(f"{path} is not a Bloom filter file")
+
+        bloom = cls.__new__(cls)
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.count = count
+        bloom.metadata = json.loads(mapped[_HEADER.size:offset].decode('utf-8'))
+        bloom._mmap = mapped
+        bloom._bits = memoryview(mapped)[offset:]
+        return bloom
+
+    def save(self, path: str) -> None:
+        """
+        Save the filter and its metadata to a file, for use with load().
+
+        Args:
+            path (str): The file path of the filter.
+        """
+        meta = json.dumps(self.metadata).encode('utf-8')
+        with open(path, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, self.num_bits, self.num_hashes, self.count, len(meta)))
+            file.write(meta)
+            file.write(self._bits)
+
+    def add(self, key: str) -> None:
+        """
+        Add a key to the filter.
+
+        Raises:
+            TypeError: If the filter was loaded from a file, and is read-only.
+        """
+        bits = self._bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        for position in self._positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The size of the bit array in bytes.
+        """
+        return len(self._bits)
+
+    def close(self) -> None:
+        """
+        Release the memory mapping of a loaded filter.
+        """
+        if self._mmap is not None:
+            self._bits.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> 'BloomFilter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _positions(self, key: str):
+        """
+        Yield the bit positions of a key, derived from two 64-bit hashes.
+        """
+        digest = hashlib.blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        num_bits = self.num_bits
+        for index in range(self.num_hashes):
+            yield (first + index * second) % num_bits
+
+
+def _estimate_records(path: str, chunk_size: int = 1 << 20) -> int:
+    """
+    Return an upper bound of the number of records of a file, by counting its line breaks.
+    """
+    count = 1
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            count += chunk.count(b'\n')
+    return count
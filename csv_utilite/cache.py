@@ -0,0 +1,414 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Iterator, Any, List, Optional, Sequence, Union
+
+from .reader import Reader
+
+_MAGIC = b'CSVUC002'
+_PREAMBLE = struct.Struct('<8sQ')
+_ALIGN = 8
+_TYPECODES = {'int': 'q', 'float': 'd', 'bool': 'b', 'dict': 'I'}
+
+
+def default_cache_dir() -> str:
+    """
+    Return the default cache directory, under XDG_CACHE_HOME or ~/.cache.
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'csv_utilite')
+
+
+class ColumnarCache:
+    """
+    A directory of typed, columnar binary sidecars of parsed CSV files.
+
+    The first load of a file parses it with Reader and writes a sidecar holding
+    raw int64/float64/bool arrays for numeric columns and dictionary-encoded
+    codes for the others. Columns mixing ints and floats are stored as float64
+    with a per-row tag of the ints, unless an int does not fit float64 exactly. Later loads memory-map the sidecar instead of
+    parsing the CSV again. The directory is kept under max_bytes by evicting
+    the least recently used sidecars.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 1 << 30):
+        """
+        Initialize a ColumnarCache instance.
+
+        Args:
+            cache_dir (str, optional): The directory holding the sidecars. Default is default_cache_dir().
+            max_bytes (int, optional): The maximum total size of the sidecars. Default is 1 GiB.
+        """
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def load(self, file_path: str, dialect: str = 'excel', has_header: bool = True,
+             na_values: Optional[List[str]] = None, encoding: Optional[str] = None,
+             type_cast: bool = True) -> 'CachedTable':
+        """
+        Load a CSV file, from its sidecar when the sidecar is still valid.
+
+        A sidecar is valid when the file size and modification time match those
+        recorded. A file that was touched but not modified is recognized by its
+        content hash.
+
+        Args:
+            file_path (str): The file path for the CSV file.
+            dialect (str, optional): The dialect to use for parsing the CSV file.
+            has_header (bool, optional): Whether the CSV file has a header row.
+            na_values (list, optional): Strings representing missing values, as in Reader.
+            encoding (str, optional): The encoding of the CSV file.
+            type_cast (bool, optional): Whether to cast values as Reader does.
+
+        Returns:
+            CachedTable: The columns of the CSV file.
+        """
+        options = [os.path.abspath(file_path), dialect, has_header, na_values or [''], encoding, type_cast]
+        name = hashlib.sha1(json.dumps(options).encode('utf-8')).hexdigest() + '.csvc'
+        sidecar = os.path.join(self.cache_dir, name)
+        stat = os.stat(file_path)
+
+        table = self._open(sidecar, file_path, stat, na_values)
+        if table is not None:
+            os.utime(sidecar)
+            return table
+
+        self._build(sidecar, file_path, stat, dialect, has_header, na_values, encoding, type_cast)
+        self._evict(keep=sidecar)
+        return self._open(sidecar, file_path, stat, na_values)
+
+    def clear(self) -> None:
+        """
+        Remove every sidecar from the cache directory.
+        """
+        for path, _, _ in self._entries():
+            os.remove(path)
+
+    def _open(self, sidecar, file_path, stat, na_values) -> Optional['CachedTable']:
+        """
+        Memory-map a sidecar, returning None if it is missing or stale.
+        """
+        try:
+            file = open(sidecar, 'rb')
+        except FileNotFoundError:
+            return None
+        with file:
+            preamble = file.read(_PREAMBLE.size)
+            if len(preamble) < _PREAMBLE.size:
+                return None
+            magic, meta_size = _PREAMBLE.unpack(preamble)
+            if magic != _MAGIC:
+                return None
+            meta = json.loads(file.read(meta_size).decode('utf-8'))
+            source = meta['source']
+            if meta['byteorder'] != sys.byteorder or source['size'] != stat.st_size:
+                return None
+            if source['mtime_ns'] != stat.st_mtime_ns:
+                if source['hash'] != _content_hash(file_path):
+                    return None
+                # The file was touched but not modified: record its new time, so
+                # that the next loads do not hash it again.
+                source['mtime_ns'] = stat.st_mtime_ns
+                self._write(sidecar, meta, iter(lambda: file.read(1 << 20), b''))
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return CachedTable(meta, mapped, Reader([], na_values=na_values)._cast_value)
+
+    def _build(self, sidecar, file_path, stat, dialect, has_header, na_values, encoding, type_cast) -> None:
+        """
+        Parse a CSV file and write its sidecar atomically.
+        """
+        with open(file_path, 'r', newline='', encoding=encoding) as file:
+            reader = Reader(file, dialect=dialect, type_cast=False, na_values=na_values)
+            headers = next(reader, []) if has_header else None
+            dictionaries = []
+            codes = []
+            n_rows = 0
+            for row in reader:
+                while len(codes) < len(row):
+                    dictionaries.append({})
+                    # Columns first seen in a later row start with empty values.
+                    codes.append(array('I', [_code(dictionaries[-1], '')]) * n_rows)
+                for index, column in enumerate(codes):
+                    value = row[index] if index < len(row) else ''
+                    column.append(_code(dictionaries[index], value))
+                n_rows += 1
+            cast = reader._cast_value
+
+        if headers is None:
+            headers = list(range(len(codes)))
+        while len(codes) < len(headers):
+            dictionaries.append({'': 0})
+            codes.append(array('I', [0]) * n_rows)
+
+        segments = []
+        columns = []
+        for dictionary, column in zip(dictionaries, codes):
+            values = list(dictionary)
+            kind = _column_kind([cast(value) for value in values]) if type_cast else 'dict'
+            if kind == 'dict':
+                columns.append({'kind': kind, 'dictionary': values, 'cast': type_cast})
+                segments.append(column)
+                continue
+            casted = [cast(value) for value in values]
+            default = 0.0 if kind == 'float' else 0
+            data = array(_TYPECODES[kind], [default if casted[code] is None else casted[code] for code in column])
+            nulls = array('B', [casted[code] is None for code in column])
+            # Float columns also holding ints tag them per row, so that they are read back as ints.
+            ints = array('B', [type(casted[code]) is int for code in column]) if kind == 'float' else None
+            columns.append({'kind': kind, 'nulls': any(nulls), 'ints': ints is not None and any(ints)})
+            segments.append(data)
+            if columns[-1]['nulls']:
+                segments.append(nulls)
+            if columns[-1]['ints']:
+                segments.append(ints)
+
+        meta = {
+            'source': {'path': os.path.abspath(file_path), 'size': stat.st_size,
+                       'mtime_ns': stat.st_mtime_ns, 'hash': _content_hash(file_path)},
+            'byteorder': sys.byteorder,
+            'headers': headers,
+            'n_rows': n_rows,
+            'columns': columns,
+        }
+        self._write(sidecar, meta, (segment.tobytes() for segment in segments))
+
+    def _write(self, sidecar: str, meta: dict, segments: Iterator[bytes]) -> None:
+        """
+        Write a sidecar atomically from its metadata and data segments.
+        """
+        blob = json.dumps(meta).encode('utf-8')
+        blob += b' ' * (-(_PREAMBLE.size + len(blob)) % _ALIGN)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                out.write(_PREAMBLE.pack(_MAGIC, len(blob)))
+                out.write(blob)
+                for data in segments:
+                    out.write(data)
+                    out.write(b'\0' * (-len(data) % _ALIGN))
+            os.replace(tmp_path, sidecar)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def _entries(self):
+        """
+        Return (path, size, last use) for every sidecar in the cache directory.
+        """
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            if name.endswith('.csvc'):
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                entries.append((path, stat.st_size, stat.st_mtime_ns))
+        return entries
+
+    def _evict(self, keep: str) -> None:
+        """
+        Remove the least recently used sidecars until the directory fits in max_bytes.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if path != keep:
+                os.remove(path)
+                total -= size
+
+
+class CachedTable:
+    """
+    The memory-mapped columns of a cached CSV file.
+    """
+
+    def __init__(self, meta: dict, mapped: mmap.mmap, cast):
+        """
+        Initialize a CachedTable instance. Use ColumnarCache.load() to create one.
+
+        Args:
+            meta (dict): The sidecar metadata.
+            mapped (mmap.mmap): The memory-mapped sidecar.
+            cast (callable): The function casting dictionary values, as Reader does.
+        """
+        self.headers = meta['headers']
+        self._mapped = mapped
+        self._n_rows = meta['n_rows']
+        view = memoryview(mapped)
+        offset = _PREAMBLE.size + _PREAMBLE.unpack_from(mapped)[1]
+
+        def segment(typecode):
+            nonlocal offset
+            size = array(typecode).itemsize * self._n_rows
+            data = view[offset:offset + size].cast(typecode)
+            offset += size + (-size % _ALIGN)
+            return data
+
+        self.columns = []
+        for column in meta['columns']:
+            kind = column['kind']
+            data = segment(_TYPECODES[kind])
+            if kind == 'dict':
+                dictionary = column['dictionary']
+                if column['cast']:
+                    dictionary = [cast(value) for value in dictionary]
+                self.columns.append(_DictionaryColumn(data, dictionary))
+            else:
+                nulls = segment('B') if column['nulls'] else None
+                ints = segment('B') if column.get('ints') else None
+                self.columns.append(_ArrayColumn(data, nulls, kind == 'bool', ints))
+
+    def __len__(self) -> int:
+        return self._n_rows
+
+    def column(self, name: Union[int, str]) -> Sequence[Any]:
+        """
+        Return a column by header name or index.
+
+        Args:
+            name (int or str): The header name, or the column index.
+
+        Returns:
+            Sequence[Any]: The column values. Numeric columns without missing
+            values are returned as memoryviews over the sidecar.
+        """
+        index = self.headers.index(name) if name in self.headers else name
+        column = self.columns[index]
+        if isinstance(column, _ArrayColumn) and column.plain:
+            return column.data
+        return column
+
+    def rows(self) -> Iterator[List[Any]]:
+        """
+        Yield the rows as lists, as Reader would.
+        """
+        columns = [column.data if isinstance(column, _ArrayColumn) and column.plain else column
+                   for column in self.columns]
+        for index in range(self._n_rows):
+            yield [column[index] for column in columns]
+
+    def close(self) -> None:
+        """
+        Release the memory map. Columns must not be used afterwards.
+        """
+        self.columns = []
+        try:
+            self._mapped.close()
+        except BufferError:
+            # Views handed out to the caller are still alive; the map is released with them.
+            pass
+
+
+class _ArrayColumn:
+    """
+    A numeric column backed by an array, with an optional null mask, and for
+    float columns, an optional mask of the values that were ints.
+    """
+
+    def __init__(self, data: memoryview, nulls: Optional[memoryview], is_bool: bool,
+                 ints: Optional[memoryview] = None):
+        self.data = data
+        self.nulls = nulls
+        self.is_bool = is_bool
+        self.ints = ints
+        # Whether the raw data holds the values as they are.
+        self.plain = nulls is None and not is_bool and ints is None
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: int) -> Any:
+        if self.nulls is not None and self.nulls[index]:
+            return None
+        value = self.data[index]
+        if self.is_bool:
+            return bool(value)
+        if self.ints is not None and self.ints[index]:
+            return int(value)
+        return value
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self.data)):
+            yield self[index]
+
+
+class _DictionaryColumn:
+    """
+    A dictionary-encoded column: codes into a list of distinct values.
+    """
+
+    def __init__(self, codes: memoryview, dictionary: List[Any]):
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.dictionary[self.codes[index]]
+
+    def __iter__(self) -> Iterator[Any]:
+        dictionary = self.dictionary
+        for code in self.codes:
+            yield dictionary[code]
+
+
+def read_cached(file_path: str, cache_dir: Optional[str] = None, max_bytes: int = 1 << 30, **kwargs) -> CachedTable:
+    """
+    Load a CSV file through a ColumnarCache.
+
+    Args:
+        file_path (str): The file path for the CSV file.
+        cache_dir (str, optional): The directory holding the sidecars. Default is default_cache_dir().
+        max_bytes (int, optional): The maximum total size of the sidecars. Default is 1 GiB.
+        **kwargs: Options passed to ColumnarCache.load().
+
+    Returns:
+        CachedTable: The columns of the CSV file.
+    """
+    return ColumnarCache(cache_dir, max_bytes).load(file_path, **kwargs)
+
+
+def _code(dictionary: dict, value: str) -> int:
+    code = dictionary.get(value)
+    if code is None:
+        code = dictionary[value] = len(dictionary)
+    return code
+
+
+def _column_kind(values: List[Any]) -> str:
+    """
+    Return the storage kind for a column from its distinct cast values.
+    """
+    present = [value for value in values if value is not None]
+    if not present:
+        return 'dict'
+    if all(isinstance(value, bool) for value in present):
+        return 'bool'
+    if all(isinstance(value, int) and not isinstance(value, bool) and -(1 << 63) <= value < (1 << 63)
+           for value in present):
+        return 'int'
+    # Ints mixed with floats are stored as float64 when they fit it exactly.
+    if all(isinstance(value, float) or isinstance(value, int) and not isinstance(value, bool)
+           and -(1 << 53) <= value <= (1 << 53) for value in present):
+        return 'float'
+    return 'dict'
+
+
+def _content_hash(file_path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
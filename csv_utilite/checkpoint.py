@@ -0,0 +1,136 @@
+import io
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+
+class Checkpoint:
+    """
+    The periodically saved progress of a long-running job writing a CSV file.
+
+    Every saved state records the byte offset of the output next to the
+    caller's input position. The output is flushed and synced to disk before
+    the state is written, so that a restarted job can truncate the output to
+    that offset and continue from the input position, producing exactly the
+    bytes an uninterrupted run would have written.
+
+    Every state also records the identity of the job (its output path and a
+    description of its inputs), so that a checkpoint is never applied to a
+    different job.
+
+    A Checkpoint without a path does nothing, so jobs can use one unconditionally.
+    """
+
+    def __init__(self, path: Optional[str], every: int = 100000, identity: Optional[Dict[str, Any]] = None):
+        """
+        Initialize a Checkpoint instance.
+
+        Args:
+            path (str, optional): The file the state is saved to. None disables checkpointing.
+            every (int, optional): The number of rows between two saves. Default is 100000.
+            identity (dict, optional): A JSON-serializable description of the job's inputs, such as
+                file_identity() of its input files. A saved state with another identity is rejected.
+        """
+        self.path = path
+        self.every = every
+        self.identity = identity or {}
+        self._pending = 0
+
+    def load(self, output_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the saved state of the job writing output_path, or None to start over.
+
+        A state is discarded when the output is missing or shorter than its saved
+        offset, since the rows written before the checkpoint would be lost.
+
+        Args:
+            output_path (str): The file path for the output CSV file.
+
+        Returns:
+            dict, optional: The saved state, or None if there is no usable one.
+
+        Raises:
+            ValueError: If the saved state belongs to a job with another output or other inputs.
+        """
+        self.identity = dict(self.identity, output_path=os.path.abspath(output_path))
+        if self.path is None or not os.path.exists(self.path):
+            return None
+        with open(self.path) as file:
+            state = json.load(file)
+        if state.get('identity') != self.identity:
+            raise ValueError(f"Checkpoint {self.path} was saved by a different job "
+                             f"(output or inputs changed); remove it to start over.")
+        if not os.path.exists(output_path) or os.path.getsize(output_path) < state['output_offset']:
+            os.remove(self.path)
+            return None
+        return state
+
+    def open_output(self, output_path: str, state: Optional[Dict[str, Any]], encoding: Optional[str] = None) -> TextIO:
+        """
+        Open the output for writing, truncated to the saved offset when resuming.
+
+        Args:
+            output_path (str): The file path for the output CSV file.
+            state (dict, optional): The state returned by load(), or None to start over.
+            encoding (str, optional): The encoding of the output. Default is the platform default.
+
+        Returns:
+            TextIO: The output file, opened with newline=''.
+        """
+        if state is None or not os.path.exists(output_path):
+            return open(output_path, 'w', newline='', encoding=encoding)
+        raw = open(output_path, 'r+b')
+        raw.truncate(state['output_offset'])
+        raw.seek(state['output_offset'])
+        return io.TextIOWrapper(raw, encoding=encoding, newline='')
+
+    def tick(self, output: TextIO, position: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Count one written row, saving the state every `every` rows.
+
+        Args:
+            output (TextIO): The output file.
+            position (Callable[[], dict]): Returns the input position to resume from.
+                It is only called when the state is saved.
+        """
+        if self.path is None:
+            return
+        self._pending += 1
+        if self._pending >= self.every:
+            self.save(output, position())
+
+    def save(self, output: TextIO, position: Dict[str, Any]) -> None:
+        """
+        Sync the output and save its offset together with the input position.
+
+        Args:
+            output (TextIO): The output file.
+            position (dict): The input position to resume from.
+        """
+        if self.path is None:
+            return
+        output.flush()
+        os.fsync(output.fileno())
+        state = dict(position, output_offset=output.buffer.tell(), identity=self.identity)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(state, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+        self._pending = 0
+
+    def complete(self) -> None:
+        """
+        Remove the saved state once the job has finished.
+        """
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def file_identity(path: str) -> List[Any]:
+    """
+    Describe an input file by its absolute path, size and modification time, for Checkpoint identities.
+    """
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
@@ -0,0 +1,344 @@
+import argparse
+import os
+import re
+import sys
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+# Buffer size for stdin, stdout and files opened by the command line.
+BUFFER_SIZE = 1 << 20
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the csv-utilite command line.
+
+    Args:
+        argv (Optional[List[str]]): The arguments, without the program name. Default is sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.command(args) or 0
+    except BrokenPipeError:
+        # The reader of stdout went away, as with `| head`: exit quietly.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    except (ValueError, OSError) as error:
+        print(f"csv-utilite {args.name}: error: {error}", file=sys.stderr)
+        return 1
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='csv-utilite', description='Stream, transform and check CSV files.')
+    subparsers = parser.add_subparsers(title='commands', metavar='COMMAND')
+    subparsers.required = True
+
+    def command(name, handler, help, inputs='?'):
+        subparser = subparsers.add_parser(name, help=help, description=help)
+        subparser.set_defaults(command=handler, name=name)
+        if inputs == '?':
+            subparser.add_argument('input', nargs='?', default='-', help="input CSV file (default: '-', stdin)")
+        elif inputs:
+            subparser.add_argument('input', nargs=inputs, help='input CSV files')
+        subparser.add_argument('-d', '--dialect', default='excel',
+                               help="CSV dialect: excel, excel-tab, unix, or auto to sniff a file (default: excel)")
+        subparser.add_argument('--encoding', default='utf-8', help='encoding of inputs and output (default: utf-8)')
+        subparser.add_argument('--no-header', dest='has_header', action='store_false',
+                               help='the input has no header row')
+        return subparser
+
+    def output(subparser):
+        subparser.add_argument('-o', '--output', default='-', help="output file (default: '-', stdout)")
+
+    merge = command('merge', _merge, 'Concatenate CSV files with the same header.', inputs='+')
+    output(merge)
+
+    sort = command('sort', _sort, 'Sort rows by one or more columns, in memory.')
+    sort.add_argument('-k', '--by', action='append', required=True, metavar='COLUMN[:desc]',
+                      help='sort column, by name or index, optionally followed by :asc or :desc; repeatable')
+    sort.add_argument('--nulls', choices=['first', 'last'], default='last', help='where empty values go (default: last)')
+    output(sort)
+
+    convert = command('convert', _convert, 'Convert between CSV, JSON and JSON lines.')
+    convert.add_argument('--from', dest='source', choices=['csv', 'json', 'jsonl'], default='csv',
+                         help='input format (default: csv)')
+    convert.add_argument('--to', dest='target', choices=['csv', 'json', 'jsonl'], default='json',
+                         help='output format (default: json)')
+    convert.add_argument('--no-type-cast', dest='type_cast', action='store_false',
+                         help='keep CSV values as strings in JSON output')
+    output(convert)
+
+    filter_ = command('filter', _filter, 'Keep the rows matching every condition.')
+    filter_.add_argument('-w', '--where', action='append', required=True, metavar='CONDITION',
+                         help="a condition like 'age>=30', 'name==Ann' or 'email~@example\\.com$' "
+                              "(operators: == != < <= > >= ~); repeatable")
+    output(filter_)
+
+    split = command('split', _split, 'Split a CSV file into shards.')
+    split.add_argument('output_dir', help='directory the shards are written to')
+    split.add_argument('-n', type=int, required=True,
+                       help='rows per shard, bytes per shard, or number of shards, depending on --by')
+    split.add_argument('--by', choices=['rows', 'bytes', 'key_hash'], default='rows', help='split strategy (default: rows)')
+    split.add_argument('--key', help='column to hash for --by key_hash')
+
+    validate = command('validate', _validate, 'Check headers and values, passing valid rows through.')
+    validate.add_argument('--require', action='append', default=[], metavar='HEADER',
+                          help='a header that must be present; repeatable')
+    validate.add_argument('-c', '--check', action='append', default=[], metavar='COLUMN:RULE',
+                          help="a rule for a column: int, float, bool, nonempty or re:PATTERN; repeatable")
+    output(validate)
+    return parser
+
+
+def _open_input(path: str, encoding: str) -> TextIO:
+    if path == '-':
+        return open(sys.stdin.fileno(), 'r', newline='', encoding=encoding, buffering=BUFFER_SIZE, closefd=False)
+    return open(path, 'r', newline='', encoding=encoding, buffering=BUFFER_SIZE)
+
+
+def _open_output(path: str, encoding: str) -> TextIO:
+    if path == '-':
+        sys.stdout.flush()
+        return open(sys.stdout.fileno(), 'w', newline='', encoding=encoding, buffering=BUFFER_SIZE, closefd=False)
+    return open(path, 'w', newline='', encoding=encoding, buffering=BUFFER_SIZE)
+
+
+def _reader(file: TextIO, args: argparse.Namespace, type_cast: bool = False):
+    from .reader import Reader
+
+    dialect = args.dialect
+    if dialect == 'auto' and not file.seekable():
+        raise ValueError("--dialect auto requires an input file, not a pipe")
+    return Reader(file, dialect=dialect, type_cast=type_cast)
+
+
+def _output_dialect(reader, args: argparse.Namespace) -> str:
+    return reader.sniffed.dialect if reader.sniffed is not None else args.dialect
+
+
+def _merge(args: argparse.Namespace) -> None:
+    if args.output != '-':
+        from .manipulation import merge_files
+
+        merge_files(args.input, args.output, dialect=args.dialect, has_header=args.has_header, encoding=args.encoding)
+        return
+
+    from .writer import Writer
+
+    header = None
+    with _open_output(args.output, args.encoding) as output:
+        writer = None
+        for path in args.input:
+            with _open_input(path, args.encoding) as file:
+                reader = _reader(file, args)
+                if writer is None:
+                    writer = Writer(output, dialect=_output_dialect(reader, args))
+                if args.has_header:
+                    file_header = next(reader, [])
+                    if header is None:
+                        header = file_header
+                        writer.writerow(header)
+                    elif file_header != header:
+                        raise ValueError(f"{path} has a different header.")
+                writer.writerows(row for row in reader if row)
+
+
+def _sort(args: argparse.Namespace) -> None:
+    from .manipulation import sort_rows, _column_index
+    from .reader import Reader
+    from .writer import Writer
+
+    with _open_input(args.input, args.encoding) as file:
+        reader = _reader(file, args)
+        header = next(reader, []) if args.has_header else None
+        rows = [row for row in reader if row]
+
+    by = []
+    for spec in args.by:
+        column, _, direction = spec.rpartition(':') if spec.endswith((':asc', ':desc')) else (spec, '', 'asc')
+        by.append((_column_index(int(column) if column.isdigit() else column, header), direction))
+
+    # Sort typed copies of the key columns, so that numbers compare as numbers, and
+    # write the original text of the rows in the resulting order.
+    cast = Reader([])._cast_value
+    keys = [[cast(row[index]) if index < len(row) else None for index, _ in by] for row in rows]
+    order = sort_rows(keys, by=[(position, direction) for position, (_, direction) in enumerate(by)],
+                      nulls=args.nulls, return_indices=True)
+
+    with _open_output(args.output, args.encoding) as output:
+        writer = Writer(output, dialect=_output_dialect(reader, args))
+        if header is not None:
+            writer.writerow(header)
+        writer.writerows(rows[index] for index in order)
+
+
+def _convert(args: argparse.Namespace) -> None:
+    import json
+
+    from .writer import Writer
+
+    with _open_input(args.input, args.encoding) as file, _open_output(args.output, args.encoding) as output:
+        if args.source == 'csv':
+            reader = _reader(file, args, type_cast=args.type_cast)
+            header = next(reader, []) if args.has_header else None
+            if header is None:
+                records = (row for row in reader if row)
+            else:
+                records = (dict(zip(header, row)) for row in reader if row)
+        elif args.source == 'json':
+            data = json.load(file)
+            records = iter(data if isinstance(data, list) else list(data.values()))
+        else:
+            records = (json.loads(line) for line in file if line.strip())
+
+        if args.target == 'jsonl':
+            for record in records:
+                output.write(json.dumps(record, ensure_ascii=False))
+                output.write('\n')
+        elif args.target == 'json':
+            output.write('[')
+            for index, record in enumerate(records):
+                output.write(',\n' if index else '\n')
+                output.write(json.dumps(record, ensure_ascii=False))
+            output.write('\n]\n')
+        else:
+            writer = Writer(output, dialect='excel' if args.dialect == 'auto' else args.dialect)
+            first = next(records, None)
+            if first is None:
+                return
+            if isinstance(first, dict):
+                header = list(first)
+                writer.writerow(header)
+                writer.writerows([record.get(name) for name in header] for record in _chain(first, records))
+            else:
+                writer.writerows(_chain(first, records))
+
+
+def _filter(args: argparse.Namespace) -> None:
+    from .writer import Writer
+
+    with _open_input(args.input, args.encoding) as file, _open_output(args.output, args.encoding) as output:
+        reader = _reader(file, args)
+        header = next(reader, []) if args.has_header else None
+        conditions = [_condition(condition, header) for condition in args.where]
+        writer = Writer(output, dialect=_output_dialect(reader, args))
+        if header is not None:
+            writer.writerow(header)
+        writer.writerows(row for row in reader if row and all(condition(row) for condition in conditions))
+
+
+_CONDITION = re.compile(r'^(.+?)\s*(==|!=|<=|>=|<|>|~)\s*(.*)$')
+
+
+def _condition(text: str, header: Optional[List[str]]) -> Callable[[List[str]], bool]:
+    """
+    Compile a condition like 'age>=30' into a predicate on a row of strings.
+    """
+    import operator
+
+    from .manipulation import _column_index
+    from .reader import Reader
+
+    match = _CONDITION.match(text)
+    if match is None:
+        raise ValueError(f"Invalid condition: {text}")
+    column, op, literal = match.groups()
+    index = _column_index(int(column) if column.isdigit() else column, header)
+
+    if op == '~':
+        pattern = re.compile(literal)
+        return lambda row: index < len(row) and pattern.search(row[index]) is not None
+
+    cast = Reader([])._cast_value
+    expected = cast(literal)
+    compare = {'==': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le,
+               '>': operator.gt, '>=': operator.ge}[op]
+
+    def predicate(row):
+        value = cast(row[index]) if index < len(row) else None
+        try:
+            return compare(value, expected)
+        except TypeError:
+            return False
+    return predicate
+
+
+def _split(args: argparse.Namespace) -> None:
+    from .manipulation import split_file
+
+    if args.input == '-':
+        raise ValueError("split requires an input file, not stdin")
+    key = int(args.key) if args.key is not None and args.key.isdigit() else args.key
+    paths = split_file(args.input, args.output_dir, args.n, by=args.by, key=key, dialect=args.dialect,
+                       has_header=args.has_header, encoding=args.encoding)
+    for path in paths:
+        print(path)
+
+
+def _is_float(value: str) -> bool:
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
+
+_RULES = {
+    'int': lambda value: re.fullmatch(r'[+-]?\d+', value.strip()) is not None,
+    'float': _is_float,
+    'bool': lambda value: value.lower() in ('true', 't', 'false', 'f'),
+    'nonempty': lambda value: value != '',
+}
+
+
+def _validate(args: argparse.Namespace) -> int:
+    from .manipulation import _column_index
+    from .validation import validate_headers, validate_rows
+    from .writer import Writer
+
+    with _open_input(args.input, args.encoding) as file, _open_output(args.output, args.encoding) as output:
+        reader = _reader(file, args)
+        header = next(reader, []) if args.has_header else None
+        if args.require and not validate_headers(header or [], args.require):
+            missing = [name for name in args.require if name not in (header or [])]
+            raise ValueError(f"Missing required headers: {', '.join(missing)}")
+
+        validators: Dict[int, Callable[[Any], bool]] = {}
+        for check in args.check:
+            column, _, rule = check.partition(':')
+            if rule.startswith('re:'):
+                pattern = re.compile(rule[3:])
+                validator = lambda value, pattern=pattern: pattern.fullmatch(value) is not None
+            elif rule in _RULES:
+                validator = _RULES[rule]
+            else:
+                raise ValueError(f"Invalid rule in check: {check}")
+            index = _column_index(int(column) if column.isdigit() else column, header)
+            previous = validators.get(index)
+            validators[index] = validator if previous is None else \
+                lambda value, first=previous, second=validator: first(value) and second(value)
+
+        writer = Writer(output, dialect=_output_dialect(reader, args))
+        if header is not None:
+            writer.writerow(header)
+        invalid = 0
+        width = max(validators, default=-1) + 1
+        for line, row in enumerate(reader, start=2 if header is not None else 1):
+            if not row:
+                continue
+            padded = row + [''] * (width - len(row)) if len(row) < width else row
+            if validate_rows([padded], validators):
+                writer.writerow(row)
+            else:
+                invalid += 1
+                print(f"row {line}: invalid: {row}", file=sys.stderr)
+    return 1 if invalid else 0
+
+
+def _chain(first: Any, rest):
+    yield first
+    yield from rest
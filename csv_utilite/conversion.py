@@ -1,7 +1,15 @@
 import csv
+import hashlib
 import json
+import os
+import tempfile
+from itertools import islice
 from typing import Iterable, Any, Union, List, Dict, Optional
 
+from .checkpoint import Checkpoint
+from .reader import Reader
+from .writer import Writer
+
 def csv_to_json(rows: Iterable[Iterable[Any]], headers: Optional[List[str]] = None, orient: str = 'records') -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Convert CSV data to JSON format.
@@ -41,7 +49,8 @@ def csv_to_json(rows: Iterable[Iterable[Any]], headers: Optional[List[str]] = No
     else:
         raise ValueError(f"Invalid 'orient' value: {orient}")
 
-def json_to_csv(data: Union[List[Dict[str, Any]], Dict[str, Any]], headers: Optional[List[str]] = None, output_path: Optional[str] = None) -> List[List[Any]]:
+def json_to_csv(data: Union[List[Dict[str, Any]], Dict[str, Any]], headers: Optional[List[str]] = None, output_path: Optional[str] = None,
+                checkpoint_path: Optional[str] = None, checkpoint_every: int = 100000) -> List[List[Any]]:
     """
     Convert JSON data to CSV format.
 
@@ -51,6 +60,10 @@ def json_to_csv(data: Union[List[Dict[str, Any]], Dict[str, Any]], headers: Opti
         headers (Optional[List[str]]): An optional list containing the desired CSV headers.
                                        If not provided, the keys from the first dictionary in the JSON data will be used.
         output_path (Optional[str]): The file path to write the CSV data to. If not provided, the data will be returned as a list of lists.
+        checkpoint_path (Optional[str]): A file where progress is saved every checkpoint_every rows while writing to
+                                         output_path. If it exists when the conversion starts, writing resumes from it.
+                                         It is removed once the conversion completes.
+        checkpoint_every (int): The number of rows between two checkpoints.
 
     Returns:
         List[List[Any]]: The CSV data as a list of lists, unless an output_path is provided.
@@ -66,8 +79,161 @@ def json_to_csv(data: Union[List[Dict[str, Any]], Dict[str, Any]], headers: Opti
         rows = [[row[header] for header in headers] for row in list(data.values())]
 
     if output_path:
-        with open(output_path, 'w', newline='') as file:
+        digest = hashlib.blake2b(json.dumps(rows, default=str).encode('utf-8'), digest_size=16).hexdigest()
+        identity = {'rows': len(rows), 'headers': list(headers) if headers else None, 'digest': digest}
+        checkpoint = Checkpoint(checkpoint_path, checkpoint_every, identity)
+        state = checkpoint.load(output_path)
+        with checkpoint.open_output(output_path, state) as file:
             writer = csv.writer(file)
-            if headers:
-                writer.writerow(headers)
-            writer.writerows(rows)
\ No newline at end of file
+            if state is None:
+                state = {'rows_written': 0}
+                if headers:
+                    writer.writerow(headers)
+            rows_written = state['rows_written']
+            position = lambda: {'rows_written': rows_written}
+            for row in rows[rows_written:]:
+                writer.writerow(row)
+                rows_written += 1
+                checkpoint.tick(file, position)
+        checkpoint.complete()
+
+def csv_to_parquet(csv_path: str, parquet_path: str, dialect: str = 'excel', has_header: bool = True,
+                   encoding: str = 'utf-8', na_values: Optional[List[str]] = None,
+                   dtypes: Optional[Union[List[str], Dict[int, str]]] = None, compression: Optional[str] = 'snappy',
+                   row_group_size: int = 65536) -> int:
+    """
+    Convert a CSV file to a Parquet file, one row group at a time. Requires pyarrow.
+
+    Column types are inferred like Reader casts values: int columns become int64,
+    float columns float64, bool columns bool, and any other column string.
+    Without dtypes, the types are inferred from the first row group, and a later
+    value that does not fit its column raises an error; profile_file(...).dtypes()
+    gives the types of the whole file.
+
+    Args:
+        csv_path (str): The file path for the input CSV file.
+        parquet_path (str): The file path for the output Parquet file.
+        dialect (str): The dialect to use for parsing the CSV file.
+        has_header (bool): Whether the CSV file has a header row. Without one, columns are
+            named column_0, column_1, ...
+        encoding (str): The encoding of the CSV file.
+        na_values (Optional[List[str]]): Strings representing missing values, as in Reader.
+        dtypes (Optional[Union[List[str], Dict[int, str]]]): The type of each column, 'int', 'float',
+            'bool' or 'str', as in Reader.
+        compression (Optional[str]): The compression codec, such as 'snappy' (default), 'zstd',
+            'gzip' or None.
+        row_group_size (int): The number of rows per row group, which bounds the memory used.
+
+    Returns:
+        int: The number of rows written.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+        ValueError: If a dtype is invalid, a row has more fields than the header (or than the
+            widest row of the first row group), or a value does not fit the type of its column.
+            No Parquet file is left behind.
+    """
+    pa, pq = _import_pyarrow()
+    arrow_types = {'int': pa.int64(), 'float': pa.float64(), 'bool': pa.bool_(), 'str': pa.string()}
+
+    with open(csv_path, 'r', newline='', encoding=encoding) as file:
+        rows = Reader(file, dialect=dialect, type_cast=False)
+        header = next(rows, []) if has_header else None
+        if header and header[0].startswith('\ufeff'):
+            header[0] = header[0][1:]
+        batch = list(islice(rows, row_group_size))
+        width = len(header) if header is not None else max(map(len, batch), default=0)
+        names = header if header is not None else [f'column_{index}' for index in range(width)]
+
+        if dtypes is None:
+            from .profiling import profile_rows
+
+            dtypes = profile_rows(batch, na_values=na_values).dtypes()
+        if not isinstance(dtypes, dict):
+            dtypes = dict(enumerate(dtypes))
+        types = [dtypes.get(index) or 'str' for index in range(width)]
+        for dtype in types:
+            if dtype not in arrow_types:
+                raise ValueError(f"Invalid dtype: {dtype}")
+        schema = pa.schema([pa.field(name, arrow_types[dtype]) for name, dtype in zip(names, types)])
+        cast = Reader([], na_values=na_values, dtypes=types)._cast_row
+        # A value that does not parse as its dtype falls back to the automatic cast;
+        # pyarrow would silently truncate such a float in an int column, so check exact types.
+        python_types = [{'int': int, 'float': float, 'bool': bool, 'str': str}[dtype] for dtype in types]
+
+        # Write next to the output and rename it on success, so that a failed
+        # conversion never leaves a truncated Parquet file behind.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(parquet_path)), suffix='.tmp')
+        os.close(fd)
+        rows_written = 0
+        try:
+            with pq.ParquetWriter(tmp_path, schema, compression=compression) as writer:
+                while batch:
+                    columns = [[] for _ in range(width)]
+                    for offset, row in enumerate(batch):
+                        if len(row) > width:
+                            raise ValueError(f"Row {rows_written + offset + 1} has {len(row)} fields, "
+                                             f"but there are {width} columns")
+                        values = cast(row)
+                        for index, column in enumerate(columns):
+                            value = values[index] if index < len(values) else None
+                            if value is not None and type(value) is not python_types[index]:
+                                raise ValueError(f"Row {rows_written + offset + 1}: {row[index]!r} does not fit the "
+                                                 f"column {names[index]!r} of type {types[index]}; pass "
+                                                 f"dtypes=profile_file(...).dtypes() to infer the types from the whole file")
+                            column.append(value)
+                    try:
+                        arrays = [pa.array(column, type=field.type) for column, field in zip(columns, schema)]
+                    except (pa.ArrowInvalid, pa.ArrowTypeError) as error:
+                        raise ValueError(f"A value does not fit the inferred column types {types}; pass "
+                                         f"dtypes=profile_file(...).dtypes() to infer them from the whole file: {error}")
+                    writer.write_table(pa.Table.from_arrays(arrays, schema=schema), row_group_size=row_group_size)
+                    rows_written += len(batch)
+                    batch = list(islice(rows, row_group_size))
+            os.replace(tmp_path, parquet_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    return rows_written
+
+def parquet_to_csv(parquet_path: str, csv_path: str, dialect: str = 'excel', na_rep: str = '',
+                   encoding: Optional[str] = None, batch_size: int = 65536) -> int:
+    """
+    Convert a Parquet file to a CSV file, one batch at a time. Requires pyarrow.
+
+    Args:
+        parquet_path (str): The file path for the input Parquet file.
+        csv_path (str): The file path for the output CSV file.
+        dialect (str): The dialect to use for writing the CSV file.
+        na_rep (str): The value written for missing values.
+        encoding (Optional[str]): The encoding of the CSV file.
+        batch_size (int): The maximum number of rows read at a time, which bounds the memory used.
+
+    Returns:
+        int: The number of rows written.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    _, pq = _import_pyarrow()
+
+    parquet = pq.ParquetFile(parquet_path)
+    rows_written = 0
+    with Writer(csv_path, dialect=dialect, na_rep=na_rep, encoding=encoding, buffer_size=1 << 20) as writer:
+        writer.writerow(parquet.schema_arrow.names)
+        for batch in parquet.iter_batches(batch_size=batch_size):
+            columns = [column.to_pylist() for column in batch.columns]
+            writer.writerows(list(row) for row in zip(*columns))
+            rows_written += batch.num_rows
+    return rows_written
+
+def _import_pyarrow():
+    """
+    Import pyarrow and pyarrow.parquet, which are optional dependencies.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError("Parquet conversion requires pyarrow. Install it with: pip install pyarrow") from error
+    return pyarrow, pyarrow.parquet
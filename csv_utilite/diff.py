@@ -0,0 +1,180 @@
+import hashlib
+import math
+import os
+import shutil
+import tempfile
+import zlib
+from typing import Iterator, Dict, List, Optional, Tuple, Union
+
+from .manipulation import _column_index, _ShardPool
+from .reader import Reader
+from .writer import Writer
+
+Key = Union[int, str, List[Union[int, str]]]
+
+# Parsed rows held in a dict take several times their size on disk.
+_MEMORY_FACTOR = 8
+
+
+def diff_files(old_path: str, new_path: str, output_path: str, key: Key, dialect: str = 'excel',
+               encoding: Optional[str] = None, memory_budget: int = 256 * 1024 * 1024,
+               assume_sorted: bool = False, tmp_dir: Optional[str] = None) -> Dict[str, int]:
+    """
+    Compare two CSV snapshots by key and write the added, removed and changed rows.
+
+    The output has the header of the new file, preceded by a '_change' column
+    holding 'added', 'removed' or 'changed'. Added and changed rows are written
+    as they appear in the new file, removed rows as they appear in the old one.
+
+    When the old file is too large for memory_budget, both files are first
+    hash-partitioned on the key into temporary files, and the partitions are
+    compared one at a time. When both files are sorted by key, assume_sorted
+    compares them in a single streaming pass without any partitioning.
+
+    Args:
+        old_path (str): The file path for the old CSV file.
+        new_path (str): The file path for the new CSV file.
+        output_path (str): The file path for the output CSV file.
+        key (Union[int, str, List[Union[int, str]]]): The key column, or a list of key columns, as header
+            names or indexes. Keys must be unique within each file.
+        dialect (str): The dialect to use for parsing and writing the CSV files.
+        encoding (Optional[str]): The encoding of the CSV files.
+        memory_budget (int): The approximate number of bytes the comparison may use.
+        assume_sorted (bool): Whether both files are sorted by key, compared as strings.
+        tmp_dir (Optional[str]): The directory for the partitions. Default is the system temporary directory.
+
+    Returns:
+        Dict[str, int]: The number of 'added', 'removed' and 'changed' rows.
+
+    Raises:
+        ValueError: If the files have different headers, or are not sorted while assume_sorted is True.
+    """
+    counts = {'added': 0, 'removed': 0, 'changed': 0}
+    with _RowFile(old_path, dialect, encoding) as old, _RowFile(new_path, dialect, encoding) as new:
+        if old.header != new.header:
+            raise ValueError("The old and new files have different headers.")
+        key_indexes = [_column_index(column, old.header) for column in (key if isinstance(key, list) else [key])]
+
+        with Writer(output_path, dialect=dialect, encoding=encoding) as writer:
+            writer.writerow(['_change'] + new.header)
+
+            def emit(change, row):
+                counts[change] += 1
+                writer.writerow([change] + row)
+
+            if assume_sorted:
+                _diff_sorted(old.rows, new.rows, key_indexes, emit)
+                return counts
+
+            partitions = math.ceil(os.path.getsize(old_path) * _MEMORY_FACTOR / memory_budget)
+            if partitions <= 1:
+                _diff_hashed(old.rows, new.rows, key_indexes, emit)
+                return counts
+
+            work_dir = tempfile.mkdtemp(prefix='csv_utilite_diff_', dir=tmp_dir)
+            try:
+                old_parts = _partition(old.rows, key_indexes, partitions, os.path.join(work_dir, 'old'))
+                new_parts = _partition(new.rows, key_indexes, partitions, os.path.join(work_dir, 'new'))
+                for old_part, new_part in zip(old_parts, new_parts):
+                    with _RowFile(old_part, 'excel', 'utf-8', has_header=False) as old_rows, \
+                            _RowFile(new_part, 'excel', 'utf-8', has_header=False) as new_rows:
+                        _diff_hashed(old_rows.rows, new_rows.rows, key_indexes, emit)
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+    return counts
+
+
+def _diff_hashed(old_rows: Iterator[List[str]], new_rows: Iterator[List[str]], key_indexes: List[int], emit) -> None:
+    """
+    Compare rows by loading the old ones into a dict of key -> (row hash, row).
+    """
+    old = {}
+    for row in old_rows:
+        old[_key(row, key_indexes)] = (_row_hash(row), row)
+
+    for row in new_rows:
+        previous = old.pop(_key(row, key_indexes), None)
+        if previous is None:
+            emit('added', row)
+        elif previous[0] != _row_hash(row):
+            emit('changed', row)
+
+    for _, row in old.values():
+        emit('removed', row)
+
+
+def _diff_sorted(old_rows: Iterator[List[str]], new_rows: Iterator[List[str]], key_indexes: List[int], emit) -> None:
+    """
+    Compare two streams sorted by key with a merge join.
+    """
+    old_row = next(old_rows, None)
+    new_row = next(new_rows, None)
+    old_key = _sorted_key(old_row, key_indexes, None)
+    new_key = _sorted_key(new_row, key_indexes, None)
+
+    while old_row is not None or new_row is not None:
+        if new_row is None or (old_row is not None and old_key < new_key):
+            emit('removed', old_row)
+            old_row = next(old_rows, None)
+            old_key = _sorted_key(old_row, key_indexes, old_key)
+        elif old_row is None or new_key < old_key:
+            emit('added', new_row)
+            new_row = next(new_rows, None)
+            new_key = _sorted_key(new_row, key_indexes, new_key)
+        else:
+            if old_row != new_row:
+                emit('changed', new_row)
+            old_row = next(old_rows, None)
+            old_key = _sorted_key(old_row, key_indexes, old_key)
+            new_row = next(new_rows, None)
+            new_key = _sorted_key(new_row, key_indexes, new_key)
+
+
+def _sorted_key(row: Optional[List[str]], key_indexes: List[int], previous: Optional[Tuple[str, ...]]) -> Optional[Tuple[str, ...]]:
+    if row is None:
+        return None
+    key = _key(row, key_indexes)
+    if previous is not None and key <= previous:
+        raise ValueError(f"Rows are not sorted by key: {key!r} follows {previous!r}")
+    return key
+
+
+def _partition(rows: Iterator[List[str]], key_indexes: List[int], partitions: int, prefix: str) -> List[str]:
+    """
+    Write rows to partition files by the hash of their key, returning the file paths.
+    """
+    paths = [f"{prefix}_{index:05d}.csv" for index in range(partitions)]
+    shards = _ShardPool(paths.__getitem__, None, False, 'excel', 'utf-8', 1 << 16, 256)
+    try:
+        for index in range(partitions):
+            shards.create(index)
+        for row in rows:
+            shards.write(zlib.crc32('\x1f'.join(_key(row, key_indexes)).encode('utf-8')) % partitions, row)
+    finally:
+        shards.close()
+    return paths
+
+
+def _key(row: List[str], key_indexes: List[int]) -> Tuple[str, ...]:
+    return tuple(row[index] if index < len(row) else '' for index in key_indexes)
+
+
+def _row_hash(row: List[str]) -> bytes:
+    return hashlib.blake2b('\x1f'.join(row).encode('utf-8'), digest_size=16).digest()
+
+
+class _RowFile:
+    """
+    Open a CSV file as a header and an iterator of untyped, non-empty rows.
+    """
+
+    def __init__(self, path: str, dialect: str, encoding: Optional[str], has_header: bool = True):
+        self._file = open(path, 'r', newline='', encoding=encoding)
+        self.rows = (row for row in Reader(self._file, dialect=dialect, type_cast=False) if row)
+        self.header = next(self.rows, []) if has_header else None
+
+    def __enter__(self) -> '_RowFile':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._file.close()
@@ -0,0 +1,324 @@
+import collections
+import csv
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import sys
+import time
+from typing import Iterator, Any, List, Optional
+
+from .manipulation import _iter_raw_records
+from .reader import Reader
+
+
+class Follower:
+    """
+    Incrementally read the rows appended to a CSV file.
+
+    The Follower remembers the byte offset just past the last complete record
+    it returned, so every poll only reads newly appended data. A truncated file
+    is read again from the start, and a rotated file (a new file at the same
+    path) is read from the start once the rest of the old file is consumed.
+    The offset can be persisted to a checkpoint file so that a restarted
+    consumer resumes where it stopped.
+    """
+
+    def __init__(self, file_path: str, dialect='excel', has_header: bool = False, type_cast: bool = True,
+                 na_values=None, encoding: str = 'utf-8', checkpoint_path: Optional[str] = None,
+                 start: str = 'beginning'):
+        """
+        Initialize a Follower instance.
+
+        Args:
+            file_path (str): The file path of the CSV file to follow.
+            dialect (str, optional): The dialect to use for parsing the CSV file. Default is 'excel'.
+            has_header (bool, optional): Whether the file starts with a header row. The header
+                is not returned as a row, and is available as the header attribute.
+            type_cast (bool, optional): Whether to automatically cast data types, as in Reader.
+            na_values (str or list, optional): Strings representing missing values, as in Reader.
+            encoding (str, optional): The encoding of the CSV file. It must be ASCII-compatible.
+                Default is 'utf-8'.
+            checkpoint_path (str, optional): A file where the position is saved after every poll,
+                and restored from on start.
+            start (str, optional): Where to start without a usable checkpoint: 'beginning'
+                (default) or 'end' to only read rows appended from now on.
+
+        Raises:
+            ValueError: If start is invalid.
+        """
+        if start not in ('beginning', 'end'):
+            raise ValueError(f"Invalid 'start' value: {start}")
+        self.file_path = file_path
+        self.has_header = has_header
+        self.header = None
+        self.checkpoint_path = checkpoint_path
+        self._encoding = encoding
+        self._dialect = dialect
+        self._quotechar = (csv.reader([], dialect).dialect.quotechar or '"').encode(encoding)
+        self._feed = _Feed()
+        self._reader = Reader(self._feed, dialect=dialect, type_cast=type_cast, na_values=na_values)
+        self._file = None
+        self._identity = None
+        self._offset = 0
+        self._saved = None
+
+        checkpoint = self._load_checkpoint()
+        if self._open():
+            if checkpoint is not None and checkpoint['identity'] == self._identity:
+                self._offset = checkpoint['offset']
+            elif start == 'end':
+                self._offset = os.fstat(self._file.fileno()).st_size
+            self._read_header()
+
+    @property
+    def offset(self) -> int:
+        """
+        The byte offset just past the last complete record returned.
+        """
+        return self._offset
+
+    def poll(self) -> Iterator[List[Any]]:
+        """
+        Yield the complete rows appended since the last poll.
+
+        A trailing record without its line terminator is left for a later poll.
+
+        Returns:
+            Iterator[List[Any]]: The new rows.
+        """
+        try:
+            if self._file is None:
+                if not self._open():
+                    return
+                self._read_header()
+            yield from self._read_records()
+
+            try:
+                stat = os.stat(self.file_path)
+            except FileNotFoundError:
+                return
+            if (stat.st_dev, stat.st_ino) != self._identity:
+                # Rotated: the old file was fully consumed above, switch to the new one.
+                self._file.close()
+                self._file = None
+                if self._open():
+                    self._offset = 0
+                    self._read_header()
+                    yield from self._read_records()
+            elif stat.st_size < self._offset:
+                # Truncated in place: start over.
+                self._offset = 0
+                self._read_header()
+                yield from self._read_records()
+        finally:
+            self.save_checkpoint()
+
+    def follow(self, poll_interval: float = 1.0, idle_timeout: Optional[float] = None) -> Iterator[List[Any]]:
+        """
+        Yield rows as they are appended, waiting for new data between polls.
+
+        File changes are watched with inotify on Linux, and by polling every
+        poll_interval seconds elsewhere.
+
+        Args:
+            poll_interval (float, optional): The maximum number of seconds to wait between polls.
+                Default is 1.0.
+            idle_timeout (float, optional): Stop after this many seconds without new rows.
+                Default is None (follow forever).
+
+        Returns:
+            Iterator[List[Any]]: The rows, as they are appended.
+        """
+        watcher = _watcher(self.file_path)
+        try:
+            idle_since = time.monotonic()
+            while True:
+                for row in self.poll():
+                    idle_since = None
+                    yield row
+                if idle_since is None:
+                    idle_since = time.monotonic()
+                timeout = poll_interval
+                if idle_timeout is not None:
+                    remaining = idle_timeout - (time.monotonic() - idle_since)
+                    if remaining <= 0:
+                        return
+                    timeout = min(timeout, remaining)
+                watcher.wait(timeout)
+        finally:
+            watcher.close()
+
+    def save_checkpoint(self) -> None:
+        """
+        Save the current position to checkpoint_path, if set and changed.
+        """
+        if self.checkpoint_path is None or self._identity is None:
+            return
+        state = {'path': os.path.abspath(self.file_path), 'identity': list(self._identity), 'offset': self._offset}
+        if state == self._saved:
+            return
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(state, file)
+        os.replace(tmp_path, self.checkpoint_path)
+        self._saved = state
+
+    def close(self) -> None:
+        """
+        Save the checkpoint and close the followed file.
+        """
+        self.save_checkpoint()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'Follower':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _open(self) -> bool:
+        """
+        Open the file, returning False if it does not exist (yet).
+        """
+        try:
+            self._file = open(self.file_path, 'rb')
+        except FileNotFoundError:
+            return False
+        stat = os.fstat(self._file.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        return True
+
+    def _load_checkpoint(self) -> Optional[dict]:
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path) as file:
+            state = json.load(file)
+        self._saved = dict(state)
+        state['identity'] = tuple(state['identity'])
+        return state
+
+    def _read_header(self) -> None:
+        """
+        Read the header record, and skip it if reading from the start of the file.
+        """
+        if not self.has_header:
+            return
+        self._file.seek(0)
+        for record in _iter_raw_records(self._file, self._quotechar):
+            if _is_complete(record, self._quotechar):
+                self.header = next(csv.reader([record.decode(self._encoding)], self._dialect))
+                self._offset = max(self._offset, len(record))
+            break
+
+    def _read_records(self) -> Iterator[List[Any]]:
+        if self.has_header and self.header is None:
+            self._read_header()
+            if self.header is None:
+                return
+        self._file.seek(self._offset)
+        for record in _iter_raw_records(self._file, self._quotechar):
+            if not _is_complete(record, self._quotechar):
+                break
+            self._feed.append(record.decode(self._encoding))
+            row = next(self._reader)
+            self._offset += len(record)
+            yield row
+
+
+class _Feed:
+    """
+    An iterator of lines that can be refilled after it runs dry.
+    """
+
+    def __init__(self):
+        self._lines = collections.deque()
+
+    def append(self, line: str) -> None:
+        self._lines.append(line)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self._lines:
+            raise StopIteration
+        return self._lines.popleft()
+
+
+def _is_complete(record: bytes, quotechar: bytes) -> bool:
+    return record.endswith(b'\n') and record.count(quotechar) % 2 == 0
+
+
+class _PollWatcher:
+    """
+    Wait for file changes by sleeping.
+    """
+
+    def wait(self, timeout: float) -> None:
+        time.sleep(timeout)
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyWatcher:
+    """
+    Wait for changes in the directory of a file with inotify.
+    """
+
+    _MASK = 0x2 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200  # MODIFY, CLOSE_WRITE, MOVED_FROM/TO, CREATE, DELETE
+
+    def __init__(self, libc, file_path: str):
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        directory = os.path.dirname(os.path.abspath(file_path))
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), self._MASK) < 0:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(), 'inotify_add_watch failed')
+
+    def wait(self, timeout: float) -> None:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if ready:
+            try:
+                while os.read(self._fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def _watcher(file_path: str):
+    """
+    Return an inotify watcher when available, and a polling watcher otherwise.
+    """
+    if sys.platform.startswith('linux'):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            return _InotifyWatcher(libc, file_path)
+        except (OSError, AttributeError):
+            pass
+    return _PollWatcher()
+
+
+def follow(file_path: str, poll_interval: float = 1.0, idle_timeout: Optional[float] = None, **kwargs) -> Iterator[List[Any]]:
+    """
+    Yield the rows of a CSV file, then the rows appended to it, as they arrive.
+
+    Args:
+        file_path (str): The file path of the CSV file to follow.
+        poll_interval (float, optional): The maximum number of seconds to wait between polls.
+        idle_timeout (float, optional): Stop after this many seconds without new rows.
+        **kwargs: Options passed to Follower, such as checkpoint_path.
+
+    Returns:
+        Iterator[List[Any]]: The rows, as they are appended.
+    """
+    with Follower(file_path, **kwargs) as follower:
+        yield from follower.follow(poll_interval=poll_interval, idle_timeout=idle_timeout)
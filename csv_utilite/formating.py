@@ -1,7 +1,7 @@
 import csv
-from typing import Iterable, Any, List, Optional
+from typing import Iterable, Iterator, Any, Callable, List, Optional, Union
 
-def quote_fields(rows: Iterable[Iterable[Any]], quoting: Optional[int] = csv.QUOTE_MINIMAL) -> List[List[str]]:
+def quote_fields(rows: Iterable[Iterable[Any]], quoting: Optional[int] = csv.QUOTE_MINIMAL) -> Iterator[List[str]]:
   """
   Quote fields in CSV rows based on the specified quoting mode.
 
@@ -15,22 +15,13 @@ def quote_fields(rows: Iterable[Iterable[Any]], quoting: Optional[int] = csv.QUO
           - csv.QUOTE_NONE: Never quote fields.
 
   Returns:
-      List[List[str]]: A list of lists containing the quoted rows.
+      Iterator[List[str]]: A lazy iterator over the quoted rows.
   """
-  quoted_rows = []
+  quote = _quoter(quoting)
   for row in rows:
-      quoted_row = []
-      for value in row:
-          if quoting == csv.QUOTE_ALL or (quoting == csv.QUOTE_NONNUMERIC and not isinstance(value, (int, float))):
-              quoted_row.append('"' + str(value) + '"')  # Use double quotes directly
-          elif quoting == csv.QUOTE_MINIMAL and (isinstance(value, str) and (',' in value or '\n' in value)):
-              quoted_row.append('"' + value + '"')
-          else:
-              quoted_row.append(str(value))
-      quoted_rows.append(quoted_row)
-  return quoted_rows
-
-def remove_quotes(rows: Iterable[Iterable[Any]]) -> List[List[str]]:
+      yield [quote(value) for value in row]
+
+def remove_quotes(rows: Iterable[Iterable[Any]]) -> Iterator[List[str]]:
   """
   Remove quotes from fields in CSV rows.
 
@@ -38,15 +29,12 @@ def remove_quotes(rows: Iterable[Iterable[Any]]) -> List[List[str]]:
       rows (Iterable[Iterable[Any]]): An iterable of iterables containing the CSV data rows.
 
   Returns:
-      List[List[str]]: A list of lists containing the rows with quotes removed.
+      Iterator[List[str]]: A lazy iterator over the rows with quotes removed.
   """
-  unquoted_rows = []
   for row in rows:
-      unquoted_row = [str(value).strip('"') for value in row]
-      unquoted_rows.append(unquoted_row)
-  return unquoted_rows
+      yield [_unquote(value) for value in row]
 
-def handle_newlines(rows: Iterable[Iterable[Any]], replacement: str = '\\n') -> List[List[str]]:
+def handle_newlines(rows: Iterable[Iterable[Any]], replacement: str = '\\n') -> Iterator[List[str]]:
   """
   Replace newline characters within fields in CSV rows with a specified replacement string.
 
@@ -55,10 +43,106 @@ def handle_newlines(rows: Iterable[Iterable[Any]], replacement: str = '\\n') ->
       replacement (str): The string to replace newline characters with. Default is '\\n'.
 
   Returns:
-      List[List[str]]: A list of lists containing the rows with newline characters replaced.
+      Iterator[List[str]]: A lazy iterator over the rows with newline characters replaced.
   """
-  formatted_rows = []
+  replace = _newline_replacer(replacement)
   for row in rows:
-      formatted_row = [str(value).replace('\n', replacement) for value in row]
-      formatted_rows.append(formatted_row)
-  return formatted_rows
\ No newline at end of file
+      yield [replace(value) for value in row]
+
+def format_rows(rows: Iterable[Iterable[Any]], quoting: Optional[int] = None, strip_quotes: bool = False,
+                newline_replacement: Optional[str] = None,
+                batch_size: Optional[int] = None) -> Iterator[Union[List[str], List[List[str]]]]:
+  """
+  Apply several formatting steps to CSV rows in a single pass.
+
+  The steps run in the order remove_quotes, handle_newlines, quote_fields, and give
+  the same result as chaining those functions, without building intermediate rows.
+
+  Args:
+      rows (Iterable[Iterable[Any]]): An iterable of iterables containing the CSV data rows.
+      quoting (Optional[int]): The quoting mode, as in quote_fields. Default is None (no quoting step).
+      strip_quotes (bool): Whether to remove quotes, as remove_quotes does. Default is False.
+      newline_replacement (Optional[str]): The string to replace newline characters with, as in
+          handle_newlines. Default is None (no newline step).
+      batch_size (Optional[int]): If given, yield lists of up to batch_size formatted rows
+          instead of single rows.
+
+  Returns:
+      Iterator[Union[List[str], List[List[str]]]]: A lazy iterator over the formatted rows, or over
+      batches of formatted rows.
+  """
+  steps = []
+  if strip_quotes:
+      steps.append(_unquote)
+  if newline_replacement is not None:
+      steps.append(_newline_replacer(newline_replacement))
+  if quoting is not None:
+      steps.append(_quoter(quoting))
+
+  if not steps:
+      formatted = ([_to_str(value) for value in row] for row in rows)
+  elif len(steps) == 1:
+      step = steps[0]
+      formatted = ([step(value) for value in row] for row in rows)
+  else:
+      def compose(value):
+          for step in steps:
+              value = step(value)
+          return value
+      formatted = ([compose(value) for value in row] for row in rows)
+
+  if batch_size is None:
+      return formatted
+  return _batched(formatted, batch_size)
+
+def _batched(rows: Iterator[List[str]], batch_size: int) -> Iterator[List[List[str]]]:
+  """
+  Group rows into lists of up to batch_size rows.
+  """
+  batch = []
+  for row in rows:
+      batch.append(row)
+      if len(batch) == batch_size:
+          yield batch
+          batch = []
+  if batch:
+      yield batch
+
+def _to_str(value: Any) -> str:
+  """
+  Convert a value to a string, skipping the conversion for strings.
+  """
+  return value if type(value) is str else str(value)
+
+def _unquote(value: Any) -> str:
+  """
+  Strip surrounding double quotes from a value.
+  """
+  return _to_str(value).strip('"')
+
+def _newline_replacer(replacement: str) -> Callable[[Any], str]:
+  """
+  Build a function replacing newlines with a precompiled translate table.
+  """
+  table = str.maketrans({'\n': replacement})
+
+  def replace(value: Any) -> str:
+      value = _to_str(value)
+      return value.translate(table) if '\n' in value else value
+  return replace
+
+def _quoter(quoting: Optional[int]) -> Callable[[Any], str]:
+  """
+  Build a function quoting a value for the given quoting mode.
+  """
+  if quoting == csv.QUOTE_ALL:
+      return lambda value: '"' + _to_str(value) + '"'  # Use double quotes directly
+  if quoting == csv.QUOTE_NONNUMERIC:
+      return lambda value: str(value) if isinstance(value, (int, float)) else '"' + _to_str(value) + '"'
+  if quoting == csv.QUOTE_MINIMAL:
+      def quote_minimal(value: Any) -> str:
+          if isinstance(value, str):
+              return '"' + value + '"' if (',' in value or '\n' in value) else value
+          return str(value)
+      return quote_minimal
+  return _to_str
@@ -1,5 +1,11 @@
 import csv
-from typing import Iterable, Any, Union, List, Dict, Optional
+import operator
+import pickle
+import tempfile
+from typing import Iterable, Iterator, Any, Union, List, Dict, Optional
+
+from .checkpoint import Checkpoint
+from .writer import Writer
 
 
 def generate_csv_rows(data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> List[List[str]]:
@@ -47,16 +53,140 @@ def generate_from_dict(data: List[Dict[str, Any]], output_path: str, headers: Op
         writer.writerows(rows)
 
 
-def generate_from_db(query: str, db_connection, output_path: str, headers: Optional[List[str]] = None) -> None:
+def generate_from_records(records: Iterable[Dict[str, Any]], output_path: str, headers: Optional[List[str]] = None,
+                          union: str = 'first', batch_size: int = 10000, na_rep: str = '', dialect: str = 'excel',
+                          encoding: Optional[str] = None, spill_dir: Optional[str] = None) -> int:
+    """
+    Generate a CSV file from any iterable of dictionaries, streaming it in batches.
+
+    Args:
+        records (Iterable[Dict[str, Any]]): The records, for example a generator.
+        output_path (str): The file path for the output CSV file.
+        headers (Optional[List[str]]): The keys to write, in order, also used as the header row.
+            Missing keys are written as na_rep and other keys are ignored. If not provided,
+            the header is discovered according to union.
+        union (str): How to discover the header without explicit headers:
+            'first' (default) uses the keys of the first record,
+            'two_pass' iterates over records twice to collect the keys of all records, so records
+            must be re-iterable (a list, or an object whose __iter__ starts over), and
+            'spill' collects the keys of all records in a single pass, spilling the records
+            to a temporary file before writing them.
+        batch_size (int): The number of rows passed to the Writer at a time.
+        na_rep (str): The value written for missing keys and None values.
+        dialect (str): The dialect to use for writing the CSV file.
+        encoding (Optional[str]): The encoding of the output file.
+        spill_dir (Optional[str]): The directory of the spill file. Default is the system temporary directory.
+
+    Returns:
+        int: The number of rows written, not counting the header.
+
+    Raises:
+        ValueError: If union is invalid, or 'two_pass' is given a one-shot iterator.
+    """
+    if union not in ('first', 'two_pass', 'spill'):
+        raise ValueError(f"Invalid 'union' value: {union}")
+
+    spill = None
+    if headers is None:
+        if union == 'first':
+            records = iter(records)
+            first = next(records, None)
+            headers = list(first) if first is not None else []
+            records = _prepend(first, records) if first is not None else records
+        elif union == 'two_pass':
+            if iter(records) is records:
+                raise ValueError("union='two_pass' requires re-iterable records, not an iterator")
+            headers = list(_union_keys(records))
+        else:
+            spill = tempfile.TemporaryFile(dir=spill_dir)
+            keys = {}
+            for record in records:
+                keys.update(dict.fromkeys(record))
+                pickle.dump(record, spill, pickle.HIGHEST_PROTOCOL)
+            headers = list(keys)
+            spill.seek(0)
+            records = _unspill(spill)
+
+    try:
+        rows_written = 0
+        with Writer(output_path, dialect=dialect, na_rep=na_rep, encoding=encoding, buffer_size=1 << 20) as writer:
+            if not headers:
+                return 0
+            writer.writerow(headers)
+            batch = []
+            for row in _record_rows(records, headers):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    writer.writerows(batch)
+                    rows_written += len(batch)
+                    batch = []
+            writer.writerows(batch)
+            rows_written += len(batch)
+        return rows_written
+    finally:
+        if spill is not None:
+            spill.close()
+
+
+def _record_rows(records: Iterable[Dict[str, Any]], headers: List[str]) -> Iterator[List[Any]]:
+    """
+    Yield the values of headers in each record, with None for missing keys.
+    """
+    # itemgetter looks all keys up in C; records missing a key fall back to dict.get.
+    getter = operator.itemgetter(*headers)
+    single = len(headers) == 1
+    for record in records:
+        try:
+            values = getter(record)
+        except KeyError:
+            yield [record.get(header) for header in headers]
+            continue
+        yield [values] if single else list(values)
+
+
+def _union_keys(records: Iterable[Dict[str, Any]]) -> Dict[str, None]:
+    """
+    Return the keys of all records in order of first appearance, as the keys of a dict.
+    """
+    keys = {}
+    for record in records:
+        keys.update(dict.fromkeys(record))
+    return keys
+
+
+def _unspill(spill) -> Iterator[Dict[str, Any]]:
+    while True:
+        try:
+            yield pickle.load(spill)
+        except EOFError:
+            return
+
+
+def _prepend(first: Any, rest: Iterator[Any]) -> Iterator[Any]:
+    yield first
+    yield from rest
+
+
+def generate_from_db(query: str, db_connection, output_path: str, headers: Optional[List[str]] = None,
+                     checkpoint_path: Optional[str] = None, checkpoint_every: int = 100000, batch_size: int = 10000) -> None:
     """
     Generate a CSV file from a database query.
 
+    Rows are fetched in batches of batch_size and written as they arrive.
+
     Args:
         query (str): The SQL query to execute.
         db_connection: The database connection object.
         output_path (str): The file path for the output CSV file.
         headers (Optional[List[str]]): An optional list of headers to use for the CSV file.
                  If not provided, the column names from the query result will be used.
+        checkpoint_path (Optional[str]): A file where progress is saved every checkpoint_every rows.
+                 If it exists when the export starts, the query is executed again, the rows already
+                 written are skipped, and the output is truncated to the last checkpoint, so the
+                 query must return rows in a deterministic order (e.g. with ORDER BY).
+                 It is removed once the export completes.
+        checkpoint_every (int): The number of rows between two checkpoints.
+        batch_size (int): The number of rows fetched at a time.
 
     Raises:
         ValueError: If the database connection or the query result is invalid.
@@ -65,19 +195,40 @@ def generate_from_db(query: str, db_connection, output_path: str, headers: Optio
     try:
         cursor = db_connection.cursor()
         cursor.execute(query)
-        rows = cursor.fetchall()
+        rows = cursor.fetchmany(batch_size)
     except Exception as e:
         raise ValueError(f"Error executing the query: {e}")
 
-    if not rows:
+    checkpoint = Checkpoint(checkpoint_path, checkpoint_every, {'query': query})
+    state = checkpoint.load(output_path)
+
+    if not rows and state is None:
         raise ValueError("Query returned no results.")
 
     if headers is None:
         headers = [desc[0] for desc in cursor.description]
 
-    with open(output_path, 'w', newline='') as file:
+    with checkpoint.open_output(output_path, state) as file:
         writer = csv.writer(file)
-        writer.writerow(headers)
-        writer.writerows(rows)
-
-    cursor.close()
\ No newline at end of file
+        if state is None:
+            state = {'rows_written': 0}
+            writer.writerow(headers)
+
+        # Skip the rows written before the last checkpoint.
+        skip = state['rows_written']
+        while rows and skip >= len(rows):
+            skip -= len(rows)
+            rows = cursor.fetchmany(batch_size)
+        rows = rows[skip:]
+
+        rows_written = state['rows_written']
+        position = lambda: {'rows_written': rows_written}
+        while rows:
+            for row in rows:
+                writer.writerow(row)
+                rows_written += 1
+                checkpoint.tick(file, position)
+            rows = cursor.fetchmany(batch_size)
+
+    checkpoint.complete()
+    cursor.close()
@@ -1,5 +1,22 @@
 import csv
-from typing import Iterable, Any, Callable, List, Dict, Optional
+import heapq
+import numbers
+import operator
+import os
+import pickle
+import random
+import tempfile
+import zlib
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Iterable, Iterator, Any, Callable, List, Dict, Optional, Tuple, Union, IO
+
+from . import metrics as _metrics
+from .bloom import BloomFilter, _estimate_records
+from .checkpoint import Checkpoint, file_identity
+from .reader import Reader
+from .sniffing import sniff
+from .writer import Writer
 
 def filter_rows(rows: Iterable[Iterable[Any]], filter_func: Callable[[Iterable[Any]], bool]) -> List[List[Any]]:
     """
@@ -15,55 +32,578 @@ def filter_rows(rows: Iterable[Iterable[Any]], filter_func: Callable[[Iterable[A
     """
     return [row for row in rows if filter_func(row)]
 
-def sort_rows(rows: Iterable[Iterable[Any]], key: Optional[Callable[[Iterable[Any]], Any]] = None, reverse: bool = False) -> List[List[Any]]:
+def semi_join(rows: Iterable[Iterable[Any]], keys_path: str, column: Union[int, str], mode: str = 'exact',
+              anti: bool = False, verify: bool = False, headers: Optional[List[str]] = None,
+              key_column: Union[int, str] = 0, keys_has_header: bool = False, dialect: str = 'excel',
+              encoding: str = 'utf-8', bloom_path: Optional[str] = None, error_rate: float = 0.01,
+              tmp_dir: Optional[str] = None) -> Iterator[List[Any]]:
+    """
+    Keep the rows whose key appears in a column of a key file, or with anti=True, the rows whose key does not.
+
+    Keys are compared as text: row values are converted with str(), and None matches an empty key.
+    Reading the rows with type_cast=False keeps keys such as '007' intact.
+
+    With mode='exact', the keys are loaded into a set. With mode='bloom', they are
+    added to a compact Bloom filter instead, which may let through a fraction
+    error_rate of the rows it should drop (or, with anti=True, drop rows it should
+    keep). With verify=True, those errors are removed by a second scan of the key
+    file: the rows are buffered in a temporary file in the meantime, and only the
+    keys of candidate rows are held in memory.
+
+    Args:
+        rows (Iterable[Iterable[Any]]): An iterable of iterables containing the CSV data rows.
+        keys_path (str): The file path of the CSV file holding the keys.
+        column (Union[int, str]): The column of the rows holding the key, as an index or a name in headers.
+        mode (str): 'exact' (default) or 'bloom'.
+        anti (bool): If True, keep the rows whose key is not in the key file.
+        verify (bool): With mode='bloom', remove false positives with an exact verification pass.
+        headers (Optional[List[str]]): The headers of the rows, required when column is a name.
+        key_column (Union[int, str]): The column of the key file holding the keys. Default is the first one.
+        keys_has_header (bool): Whether the key file has a header row.
+        dialect (str): The dialect to use for parsing the key file.
+        encoding (str): The encoding of the key file.
+        bloom_path (Optional[str]): With mode='bloom', a file where the filter is saved, and loaded
+            memory-mapped from by later calls while it is newer than the key file and was built
+            with the same key file, key_column, keys_has_header, dialect, encoding and error_rate.
+        error_rate (float): With mode='bloom', the false positive rate of the filter.
+        tmp_dir (Optional[str]): The directory of the verification buffer. Default is the system temporary directory.
+
+    Returns:
+        Iterator[List[Any]]: The matching rows, in their original order.
+
+    Raises:
+        ValueError: If mode or a column is invalid.
+    """
+    if mode not in ('exact', 'bloom'):
+        raise ValueError(f"Invalid 'mode' value: {mode}")
+    index = _column_index(column, headers)
+    keys = lambda: _read_keys(keys_path, key_column, keys_has_header, dialect, encoding)
+
+    if mode == 'exact':
+        key_set = set(keys())
+        return (row for row in rows if (_key_text(row, index) in key_set) != anti)
+
+    # A saved filter is reused only if it was built from the same keys with the same options.
+    options = {'keys_path': os.path.abspath(keys_path), 'key_column': key_column, 'keys_has_header': keys_has_header,
+               'dialect': dialect, 'encoding': encoding, 'error_rate': error_rate}
+    bloom = None
+    if bloom_path is not None and os.path.exists(bloom_path) \
+            and os.path.getmtime(bloom_path) >= os.path.getmtime(keys_path):
+        try:
+            bloom = BloomFilter.load(bloom_path)
+        except ValueError:
+            bloom = None
+        if bloom is not None and bloom.metadata != options:
+            bloom.close()
+            bloom = None
+    if bloom is None:
+        bloom = BloomFilter.from_keys(keys(), _estimate_records(keys_path), error_rate)
+        bloom.metadata = options
+        if bloom_path is not None:
+            bloom.save(bloom_path)
+    if not verify:
+        return _bloom_join(rows, index, bloom, anti)
+    return _verified_join(rows, index, bloom, anti, keys, tmp_dir)
+
+def _bloom_join(rows: Iterable[Iterable[Any]], index: int, bloom: BloomFilter, anti: bool) -> Iterator[List[Any]]:
+    with bloom:
+        for row in rows:
+            if (_key_text(row, index) in bloom) != anti:
+                yield row
+
+def _verified_join(rows: Iterable[Iterable[Any]], index: int, bloom: BloomFilter, anti: bool,
+                   keys: Callable[[], Iterator[str]], tmp_dir: Optional[str]) -> Iterator[List[Any]]:
+    """
+    Filter rows with a Bloom filter, confirming the candidate keys with a second scan of the key file.
+    """
+    candidates = set()
+    with bloom, tempfile.TemporaryFile(dir=tmp_dir) as buffer:
+        for row in rows:
+            key = _key_text(row, index)
+            candidate = key in bloom
+            if candidate:
+                candidates.add(key)
+            pickle.dump((candidate, row), buffer, pickle.HIGHEST_PROTOCOL)
+
+        confirmed = candidates.intersection(keys()) if candidates else set()
+        del candidates
+        buffer.seek(0)
+        while True:
+            try:
+                candidate, row = pickle.load(buffer)
+            except EOFError:
+                return
+            if (candidate and _key_text(row, index) in confirmed) != anti:
+                yield row
+
+def _read_keys(keys_path: str, key_column: Union[int, str], has_header: bool, dialect: str, encoding: str) -> Iterator[str]:
+    """
+    Yield the keys of a column of a CSV file.
     """
-    Sort rows in a CSV data based on a given key function.
+    with open(keys_path, 'r', newline='', encoding=encoding) as file:
+        reader = csv.reader(file, dialect=dialect)
+        header = next(reader, []) if has_header else None
+        index = _column_index(key_column, header)
+        for row in reader:
+            if row:
+                yield row[index] if index < len(row) else ''
+
+def _key_text(row: Iterable[Any], index: int) -> str:
+    value = row[index] if index < len(row) else None
+    return '' if value is None else str(value)
+
+def sort_rows(rows: Iterable[Iterable[Any]], key: Optional[Callable[[Iterable[Any]], Any]] = None, reverse: bool = False,
+              by: Optional[List[Tuple[Union[int, str], str]]] = None, headers: Optional[List[str]] = None,
+              nulls: str = 'last', return_indices: bool = False) -> Union[List[List[Any]], List[int]]:
+    """
+    Sort rows in a CSV data based on a given key function or a list of columns.
 
     Args:
         rows (Iterable[Iterable[Any]]): An iterable of iterables containing the CSV data rows.
         key (Optional[Callable[[Iterable[Any]], Any]]): A function that takes a row as input and returns
             the value to sort by. If not provided, the rows will be sorted based on their original order.
         reverse (bool): If True, the rows will be sorted in descending order.
+        by (Optional[List[Tuple[Union[int, str], str]]]): A list of (column, direction) pairs, e.g.
+            [('date', 'asc'), ('amount', 'desc')]. Columns are indexes, or names looked up in headers.
+            When given, key and reverse are ignored.
+        headers (Optional[List[str]]): The CSV headers, required when by refers to columns by name.
+        nulls (str): Where None values are placed for each column, either 'last' (default) or 'first'.
+        return_indices (bool): If True, return the sorted permutation of row indexes instead of the rows.
+
+    Returns:
+        Union[List[List[Any]], List[int]]: A list of lists containing the sorted rows, or the sorted
+            row indexes if return_indices is True.
+
+    Raises:
+        ValueError: If a direction, nulls value or column name is invalid.
+    """
+    if by is None:
+        if return_indices:
+            data = rows if isinstance(rows, list) else list(rows)
+            return sorted(range(len(data)), key=None if key is None else lambda i: key(data[i]), reverse=reverse)
+        return sorted(rows, key=key, reverse=reverse)
+
+    if nulls not in ('first', 'last'):
+        raise ValueError(f"Invalid 'nulls' value: {nulls}")
+
+    # Sorting a permutation leaves the caller's rows untouched and avoids copying them.
+    data = rows if isinstance(rows, list) else list(rows)
+    order = list(range(len(data)))
+
+    # Multi-pass stable sort: sort by the least significant column first.
+    for column, direction in reversed(by):
+        if direction not in ('asc', 'desc'):
+            raise ValueError(f"Invalid sort direction for column {column!r}: {direction}")
+        values = _typed_column(data, _column_index(column, headers))
+        present = [idx for idx in order if values[idx] is not None]
+        missing = [idx for idx in order if values[idx] is None]
+        present.sort(key=values.__getitem__, reverse=direction == 'desc')
+        order = present + missing if nulls == 'last' else missing + present
+
+    if return_indices:
+        return order
+    return [data[idx] for idx in order]
+
+def _column_index(column: Union[int, str], headers: Optional[List[str]]) -> int:
+    """
+    Resolve a column name or index to an index.
+    """
+    if isinstance(column, int):
+        return column
+    if headers is None or column not in headers:
+        raise ValueError(f"Unknown column: {column!r}")
+    return list(headers).index(column)
+
+def _typed_column(data: List[Iterable[Any]], index: int) -> List[Any]:
+    """
+    Extract a column once as a list of comparable sort keys.
+
+    Columns holding a single type of value, or only numbers, keep their values;
+    columns mixing incomparable types are compared as strings. Short rows
+    contribute None.
+    """
+    values = [row[index] if index < len(row) else None for row in data]
+    kinds = {'number' if isinstance(value, (numbers.Real, Decimal)) else type(value)
+             for value in values if value is not None}
+    if len(kinds) > 1:
+        values = [None if value is None else str(value) for value in values]
+    return values
+
+def top_n(rows: Iterable[Iterable[Any]], n: int, key: Union[int, Callable[[Iterable[Any]], Any]], largest: bool = True) -> List[List[Any]]:
+    """
+    Return the n rows with the largest (or smallest) key without sorting all rows.
+
+    The rows are consumed as a stream and only a heap of n rows is kept in memory.
+
+    Args:
+        rows (Iterable[Iterable[Any]]): An iterable of iterables containing the CSV data rows.
+        n (int): The number of rows to return.
+        key (Union[int, Callable[[Iterable[Any]], Any]]): A column index, or a function that takes a row
+            as input and returns the value to rank by.
+        largest (bool): If True (default), return the largest rows, otherwise the smallest.
+
+    Returns:
+        List[List[Any]]: A list of at most n rows, ordered from best to worst.
+    """
+    if isinstance(key, int):
+        key = operator.itemgetter(key)
+    if largest:
+        return heapq.nlargest(n, rows, key=key)
+    return heapq.nsmallest(n, rows, key=key)
+
+def merge_top_n(partials: Iterable[List[List[Any]]], n: int, key: Union[int, Callable[[Iterable[Any]], Any]], largest: bool = True) -> List[List[Any]]:
+    """
+    Merge top_n results computed separately, e.g. on chunks in worker processes.
+
+    Args:
+        partials (Iterable[List[List[Any]]]): The top_n results of each chunk.
+        n (int): The number of rows to return.
+        key (Union[int, Callable[[Iterable[Any]], Any]]): The key used for every partial result.
+        largest (bool): Must match the value used for the partial results.
+
+    Returns:
+        List[List[Any]]: The overall top n rows.
+    """
+    return top_n((row for partial in partials for row in partial), n, key, largest=largest)
+
+def sample_rows(rows: Iterable[Iterable[Any]], k: int, seed: Optional[int] = None, return_count: bool = False) -> Union[List[List[Any]], Tuple[List[List[Any]], int]]:
+    """
+    Draw a uniform random sample of k rows from a stream using reservoir sampling.
+
+    Only k rows are kept in memory, whatever the size of the input.
+
+    Args:
+        rows (Iterable[Iterable[Any]]): An iterable of iterables containing the CSV data rows.
+        k (int): The sample size.
+        seed (Optional[int]): An optional seed for reproducible samples.
+        return_count (bool): If True, also return the number of rows seen, as needed by merge_samples.
+
+    Returns:
+        Union[List[List[Any]], Tuple[List[List[Any]], int]]: The sampled rows in random order, or a
+            (sample, count) tuple if return_count is True.
+    """
+    rng = random.Random(seed)
+    reservoir = []
+    count = 0
+    for count, row in enumerate(rows, 1):
+        if count <= k:
+            reservoir.append(row)
+        else:
+            slot = rng.randrange(count)
+            if slot < k:
+                reservoir[slot] = row
+    rng.shuffle(reservoir)
+    if return_count:
+        return reservoir, count
+    return reservoir
+
+def merge_samples(partials: Iterable[Tuple[List[List[Any]], int]], k: int, seed: Optional[int] = None) -> List[List[Any]]:
+    """
+    Merge samples drawn separately into a uniform sample of the combined population.
+
+    Args:
+        partials (Iterable[Tuple[List[List[Any]], int]]): (sample, count) tuples as returned by
+            sample_rows(..., return_count=True), each drawn with the same k.
+        k (int): The sample size.
+        seed (Optional[int]): An optional seed for reproducible samples.
 
     Returns:
-        List[List[Any]]: A list of lists containing the sorted rows.
+        List[List[Any]]: The merged sample.
     """
-    return sorted(rows, key=key, reverse=reverse)
+    rng = random.Random(seed)
+    partials = list(partials)
+    samples = [list(sample) for sample, _ in partials]
+    remaining = [count for _, count in partials]
 
-def merge_files(file_paths: List[str], output_path: str, dialect: str = 'excel', has_header: bool = True, header: Optional[List[str]] = None):
+    merged = []
+    total = sum(remaining)
+    while len(merged) < k and total > 0:
+        # Pick a partial with probability proportional to its remaining population.
+        pick = rng.randrange(total)
+        for idx, count in enumerate(remaining):
+            if pick < count:
+                break
+            pick -= count
+        merged.append(samples[idx].pop())
+        remaining[idx] -= 1
+        total -= 1
+    return merged
+
+def merge_files(file_paths: List[str], output_path: str, dialect: str = 'excel', has_header: bool = True, header: Optional[List[str]] = None,
+                checkpoint_path: Optional[str] = None, checkpoint_every: int = 100000, encoding: Optional[str] = None):
     """
     Merge multiple CSV files into a single output file.
 
+    The input files are streamed one after the other, so they never need to fit in memory.
+
     Args:
         file_paths (List[str]): A list of file paths for the input CSV files.
         output_path (str): The file path for the output CSV file.
-        dialect (str): The dialect to use for parsing and writing the CSV files.
+        dialect (str): The dialect to use for parsing and writing the CSV files. With 'auto', the
+            dialect and encoding of each input file are sniffed, and the output uses the
+            dialect of the first file.
         has_header (bool): Whether the input CSV files have a header row.
         header (Optional[List[str]]): A custom header to use for the output file.
             If not provided, the header from the first input file will be used.
+        checkpoint_path (Optional[str]): A file where progress is saved every checkpoint_every rows.
+            If it exists when the merge starts, the merge resumes from it, and the output is
+            byte-identical to an uninterrupted run. It is removed once the merge completes.
+        checkpoint_every (int): The number of rows between two checkpoints.
+        encoding (Optional[str]): The encoding of the input and output files, overriding the sniffed
+            encodings with dialect='auto'. Default is the platform default, or the sniffed encodings.
 
     Raises:
         ValueError: If the input files have different headers and no custom header is provided.
     """
-    headers = []
-    rows = []
-
+    sources = []
     for file_path in file_paths:
-        with open(file_path, 'r') as file:
-            reader = csv.reader(file, dialect=dialect)
-            if has_header:
-                header = next(reader)
-                if headers and header != headers[0]:
-                    if not header:
-                        raise ValueError("Input files have different headers, and no custom header is provided.")
-                headers.append(header)
-            rows.extend(reader)
-
-    if header is None:
+        if dialect == 'auto':
+            sniffed = sniff(file_path)
+            sources.append((file_path, encoding or sniffed.encoding, sniffed.dialect))
+        else:
+            sources.append((file_path, encoding, dialect))
+    output_dialect = sources[0][2] if dialect == 'auto' and sources else dialect
+    if output_dialect == 'auto':
+        output_dialect = 'excel'
+
+    if has_header and header is None:
+        headers = []
+        for file_path, file_encoding, file_dialect in sources:
+            with open(file_path, 'r', newline='', encoding=file_encoding) as file:
+                headers.append(next(csv.reader(file, dialect=file_dialect), []))
+        if any(file_header != headers[0] for file_header in headers):
+            raise ValueError("Input files have different headers, and no custom header is provided.")
         header = headers[0] if headers else []
 
-    with open(output_path, 'w', newline='') as file:
-        writer = csv.writer(file, dialect=dialect)
-        if header:
-            writer.writerow(header)
-        writer.writerows(rows)
\ No newline at end of file
+    metrics = _metrics._active
+    identity = {'inputs': [file_identity(file_path) for file_path in file_paths], 'header': header}
+    checkpoint = Checkpoint(checkpoint_path, checkpoint_every, identity)
+    state = checkpoint.load(output_path)
+    with checkpoint.open_output(output_path, state, encoding) as output:
+        if metrics is not None:
+            writer = metrics.timed_writer(csv.writer(metrics.timed_file(output, 'merge_files'), dialect=output_dialect),
+                                          'merge_files.format')
+        else:
+            writer = csv.writer(output, dialect=output_dialect)
+        if state is None:
+            state = {'file_index': 0, 'input_offset': None}
+            if header:
+                writer.writerow(header)
+
+        for file_index in range(state['file_index'], len(sources)):
+            file_path, file_encoding, file_dialect = sources[file_index]
+            with open(file_path, 'r', newline='', encoding=file_encoding) as file:
+                if file_index == state['file_index'] and state['input_offset'] is not None:
+                    file.seek(state['input_offset'])
+                # readline() rather than iteration keeps file.tell() usable for checkpoints.
+                lines = iter(file.readline, '')
+                if metrics is not None:
+                    lines = metrics.timed_lines(lines, 'merge_files')
+                reader = csv.reader(lines, dialect=file_dialect)
+                if has_header and file.tell() == 0:
+                    next(reader, None)
+                position = lambda: {'file_index': file_index, 'input_offset': file.tell()}
+                if metrics is not None:
+                    reader = metrics.timed_rows(reader, 'merge_files.parse', 'merge_files.rows')
+                for row in reader:
+                    writer.writerow(row)
+                    checkpoint.tick(output, position)
+
+    checkpoint.complete()
+
+def split_file(file_path: str, output_dir: str, n: int, by: str = 'rows', key: Optional[Union[int, str]] = None,
+               dialect: str = 'excel', has_header: bool = True, encoding: str = 'utf-8',
+               output_dialect: Optional[str] = None, output_encoding: Optional[str] = None,
+               max_open_files: int = 64, buffer_size: int = 1 << 20) -> List[str]:
+    """
+    Split a CSV file into shards, streaming the input once.
+
+    Args:
+        file_path (str): The file path for the input CSV file.
+        output_dir (str): The directory the shards are written to, as <name>_00000<ext>, <name>_00001<ext>, ...
+        n (int): The shard size or count: the number of data rows per shard for by='rows', the maximum
+            number of bytes per shard for by='bytes', or the number of shards for by='key_hash'.
+        by (str): The split strategy, one of 'rows' (default), 'bytes' or 'key_hash'.
+        key (Optional[Union[int, str]]): The column index or header name to hash for by='key_hash'.
+        dialect (str): The dialect to use for parsing the input file.
+        has_header (bool): Whether the input file has a header row. The header is repeated in every shard.
+        encoding (str): The encoding of the input file.
+        output_dialect (Optional[str]): The dialect for the shards. Defaults to the input dialect.
+        output_encoding (Optional[str]): The encoding for the shards. Defaults to the input encoding.
+        max_open_files (int): The maximum number of shard files kept open at once for by='key_hash'.
+        buffer_size (int): The buffer size in bytes used for every shard file.
+
+    Returns:
+        List[str]: The file paths of the shards, in order.
+
+    Raises:
+        ValueError: If 'by', n or key is invalid.
+    """
+    if by not in ('rows', 'bytes', 'key_hash'):
+        raise ValueError(f"Invalid 'by' value: {by}")
+    if n < 1:
+        raise ValueError("n must be a positive integer")
+    if by == 'key_hash' and key is None:
+        raise ValueError("A key column is required to split by key hash")
+
+    os.makedirs(output_dir, exist_ok=True)
+    stem, ext = os.path.splitext(os.path.basename(file_path))
+    paths = []
+
+    def shard_path(index: int) -> str:
+        while len(paths) <= index:
+            paths.append(os.path.join(output_dir, f"{stem}_{len(paths):05d}{ext or '.csv'}"))
+        return paths[index]
+
+    input_dialect = csv.reader([], dialect).dialect
+    quotechar = input_dialect.quotechar or '"'
+    # Records can be copied byte for byte when the output is identical, the
+    # encoding keeps the quote and newline characters as single ASCII bytes,
+    # and quotes are only escaped by doubling them, so that their parity
+    # tells where a record ends.
+    raw = (output_dialect is None and (output_encoding is None or output_encoding == encoding)
+           and quotechar.encode(encoding) == quotechar.encode('ascii') and '\n'.encode(encoding) == b'\n'
+           and input_dialect.escapechar is None and input_dialect.doublequote)
+
+    with open(file_path, 'rb') if raw else open(file_path, 'r', newline='', encoding=encoding) as source:
+        if raw:
+            records = _iter_raw_records(source, quotechar.encode('ascii'))
+            header = next(records, None) if has_header else None
+            parse = lambda record: next(csv.reader([record.decode(encoding)], dialect))
+        else:
+            records = Reader(source, dialect=dialect, type_cast=False)
+            header = next(records, None) if has_header else None
+            parse = lambda record: record
+
+        key_index = None
+        if by == 'key_hash':
+            key_header = parse(header) if header is not None else None
+            if key_header and key_header[0].startswith('\ufeff'):
+                key_header = [key_header[0][1:]] + key_header[1:]
+            key_index = _column_index(key, key_header)
+
+        shards = _ShardPool(shard_path, header, raw, output_dialect or dialect, output_encoding or encoding,
+                            buffer_size, max_open_files if by == 'key_hash' else 1)
+        try:
+            if by == 'key_hash':
+                # Create every shard up front so that the shard count is always n.
+                for index in range(n):
+                    shards.create(index)
+            index = 0
+            rows_in_shard = 0
+            for record in records:
+                if by == 'key_hash':
+                    fields = parse(record)
+                    value = fields[key_index] if key_index < len(fields) else ''
+                    shards.write(zlib.crc32(value.encode('utf-8')) % n, record)
+                    continue
+                if by == 'rows':
+                    if rows_in_shard == n:
+                        index += 1
+                        rows_in_shard = 0
+                elif rows_in_shard and shards.size(index) + _record_size(record, raw, encoding) > n:
+                    index += 1
+                    rows_in_shard = 0
+                shards.write(index, record)
+                rows_in_shard += 1
+        finally:
+            shards.close()
+
+    return paths
+
+def _iter_raw_records(file: IO[bytes], quotechar: bytes = b'"') -> Iterator[bytes]:
+    """
+    Yield the raw bytes of each CSV record, including its line terminator.
+
+    Records spanning several lines because of quoted newlines are kept together
+    by tracking the parity of quote characters.
+    """
+    pending = []
+    in_quotes = False
+    for line in file:
+        if line.count(quotechar) % 2:
+            in_quotes = not in_quotes
+        if in_quotes:
+            pending.append(line)
+            continue
+        if pending:
+            pending.append(line)
+            line = b''.join(pending)
+            pending = []
+        yield line
+    if pending:
+        yield b''.join(pending)
+
+def _record_size(record: Union[bytes, List[str]], raw: bool, encoding: str) -> int:
+    """
+    Return the size in bytes of a raw record, or an estimate for a parsed one.
+    """
+    if raw:
+        return len(record)
+    return sum(len(value.encode(encoding)) + 1 for value in record) + 1
+
+class _ShardPool:
+    """
+    Keep at most max_open shard files open, reopening evicted shards in append mode.
+    """
+
+    def __init__(self, shard_path: Callable[[int], str], header, raw: bool, dialect: str, encoding: str,
+                 buffer_size: int, max_open: int):
+        self._shard_path = shard_path
+        self._header = header
+        self._raw = raw
+        self._dialect = dialect
+        self._encoding = encoding
+        self._buffer_size = buffer_size
+        self._max_open = max(1, max_open)
+        self._open = OrderedDict()
+        self._sizes = {}
+
+    def write(self, index: int, record) -> None:
+        """Write a raw or parsed record to a shard."""
+        file, writer = self._handle(index)
+        if writer is None:
+            file.write(record)
+            self._sizes[index] += len(record)
+        else:
+            writer.writerow(record)
+            self._sizes[index] += _record_size(record, False, self._encoding)
+
+    def create(self, index: int) -> None:
+        """Create a shard, writing its header."""
+        self._handle(index)
+
+    def size(self, index: int) -> int:
+        """Return the number of bytes written to a shard."""
+        return self._sizes.get(index, 0)
+
+    def close(self) -> None:
+        """Close every open shard file."""
+        while self._open:
+            self._open.popitem(last=False)[1][0].close()
+
+    def _handle(self, index: int) -> Tuple[IO, Optional[Writer]]:
+        """Return the open file and Writer of a shard, opening it if needed."""
+        handle = self._open.get(index)
+        if handle is not None:
+            self._open.move_to_end(index)
+            return handle
+
+        if len(self._open) >= self._max_open:
+            self._open.popitem(last=False)[1][0].close()
+
+        created = index not in self._sizes
+        mode = 'w' if created else 'a'
+        path = self._shard_path(index)
+        if self._raw:
+            handle = (open(path, mode + 'b', buffering=self._buffer_size), None)
+        else:
+            file = open(path, mode, newline='', encoding=self._encoding, buffering=self._buffer_size)
+            handle = (file, Writer(file, dialect=self._dialect))
+        self._open[index] = handle
+
+        if created:
+            self._sizes[index] = 0
+            if self._header is not None:
+                self.write(index, self._header)
+        return handle
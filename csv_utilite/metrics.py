@@ -0,0 +1,257 @@
+import contextlib
+import sys
+import time
+from collections import defaultdict
+from typing import Callable, Iterable, Iterator, Any, Dict, List, Optional, TextIO
+
+# The Metrics instance collecting measurements, or None when metrics are disabled.
+# Readers, Writers and merge_files look it up once when they start, so a
+# disabled registry costs a single attribute check per row.
+_active = None
+
+
+class Metrics:
+    """
+    A registry of counters and stage timings.
+
+    Counters are named '<component>.<what>', such as 'reader.rows',
+    'reader.bytes_read' or 'reader.cast_failures.int', which counts the values
+    of a column declared as int that could not be parsed. Timings are named
+    '<component>.<stage>' in seconds, where the stage is one of 'parse', 'cast',
+    'format' or 'io'. Parse and format timings exclude the time spent in I/O.
+    Byte counts of text sources and outputs are counted in characters.
+    """
+
+    def __init__(self, callbacks: Optional[List[Callable[[Dict[str, float]], None]]] = None):
+        """
+        Initialize a Metrics instance.
+
+        Args:
+            callbacks (list, optional): Functions called with snapshot() whenever publish()
+                is called, for example to export the values to Prometheus or statsd.
+        """
+        self.counters = defaultdict(int)
+        self.timings = defaultdict(float)
+        self.callbacks = list(callbacks or [])
+        self._io_seconds = 0.0
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Add value to a counter.
+        """
+        self.counters[name] += value
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """
+        Add seconds to a stage timing.
+        """
+        self.timings[name] += seconds
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Return every counter, and every timing as '<name>_seconds', in a flat dictionary.
+        """
+        values = dict(self.counters)
+        values.update((f'{name}_seconds', seconds) for name, seconds in self.timings.items())
+        return values
+
+    def publish(self) -> None:
+        """
+        Call every callback with the current snapshot.
+        """
+        values = self.snapshot()
+        for callback in self.callbacks:
+            callback(values)
+
+    def reset(self) -> None:
+        """
+        Set every counter and timing back to zero.
+        """
+        self.counters.clear()
+        self.timings.clear()
+        self._io_seconds = 0.0
+
+    def report(self, file: Optional[TextIO] = None) -> None:
+        """
+        Print a per-component breakdown of the stage timings and counters.
+
+        Args:
+            file (TextIO, optional): Where to print. Default is sys.stderr.
+        """
+        file = file or sys.stderr
+        components = sorted({name.split('.', 1)[0] for name in list(self.counters) + list(self.timings)})
+        for component in components:
+            timings = {name.split('.', 1)[1]: seconds for name, seconds in self.timings.items()
+                       if name.startswith(component + '.')}
+            total = sum(timings.values())
+            rows = self.counters.get(f'{component}.rows', 0)
+            rate = f', {rows / total:,.0f} rows/s' if total and rows else ''
+            print(f'{component}: {total:.3f}s{rate}', file=file)
+            for stage, seconds in sorted(timings.items(), key=lambda item: -item[1]):
+                print(f'  {stage:<24} {seconds:>10.3f}s {seconds / total if total else 0:>7.1%}', file=file)
+            for name, value in sorted(self.counters.items()):
+                if name.startswith(component + '.'):
+                    print(f'  {name.split(".", 1)[1]:<24} {value:>11,}', file=file)
+
+    def timed_lines(self, lines: Iterable[Any], component: str) -> Iterator[Any]:
+        """
+        Wrap an iterator of input lines, timing reads as '<component>.io' and counting '<component>.bytes_read'.
+        """
+        lines = iter(lines)
+        perf_counter = time.perf_counter
+        io_name, bytes_name = f'{component}.io', f'{component}.bytes_read'
+        while True:
+            start = perf_counter()
+            try:
+                line = next(lines)
+            except StopIteration:
+                return
+            elapsed = perf_counter() - start
+            self.timings[io_name] += elapsed
+            self._io_seconds += elapsed
+            self.counters[bytes_name] += len(line)
+            yield line
+
+    def timed_rows(self, rows: Iterable[Any], stage: str, counter: Optional[str] = None) -> Iterator[Any]:
+        """
+        Wrap an iterator of rows, timing each step as stage, excluding nested I/O, and counting counter.
+        """
+        rows = iter(rows)
+        perf_counter = time.perf_counter
+        while True:
+            start, io_before = perf_counter(), self._io_seconds
+            try:
+                row = next(rows)
+            except StopIteration:
+                return
+            self._charge(stage, start, io_before)
+            if counter is not None:
+                self.counters[counter] += 1
+            yield row
+
+    def timed_file(self, file: TextIO, component: str) -> '_TimedFile':
+        """
+        Wrap an output file, timing writes as '<component>.io' and counting '<component>.bytes_written'.
+        """
+        return _TimedFile(file, self, component)
+
+    def timed_writer(self, writer, stage: str, counter: Optional[str] = None) -> '_TimedWriter':
+        """
+        Wrap a csv writer, timing writerow as stage, excluding nested I/O, and counting counter.
+        """
+        return _TimedWriter(writer, self, stage, counter)
+
+    def _charge(self, stage: str, start: float, io_before: float) -> None:
+        """
+        Add the time since start to stage, excluding the I/O measured in between.
+        """
+        self.timings[stage] += time.perf_counter() - start - (self._io_seconds - io_before)
+
+
+class _TimedFile:
+    """
+    A file proxy timing and counting writes.
+    """
+
+    def __init__(self, file: TextIO, metrics: Metrics, component: str):
+        self._file = file
+        self._metrics = metrics
+        self._io_name = f'{component}.io'
+        self._bytes_name = f'{component}.bytes_written'
+
+    def write(self, data: str) -> int:
+        start = time.perf_counter()
+        written = self._file.write(data)
+        elapsed = time.perf_counter() - start
+        metrics = self._metrics
+        metrics.timings[self._io_name] += elapsed
+        metrics._io_seconds += elapsed
+        metrics.counters[self._bytes_name] += len(data)
+        return written
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._file, name)
+
+
+class _TimedWriter:
+    """
+    A csv writer proxy timing and counting rows.
+    """
+
+    def __init__(self, writer, metrics: Metrics, stage: str, counter: Optional[str]):
+        self._writer = writer
+        self._metrics = metrics
+        self._stage = stage
+        self._counter = counter
+
+    def writerow(self, row: Iterable[Any]) -> Any:
+        metrics = self._metrics
+        start, io_before = time.perf_counter(), metrics._io_seconds
+        result = self._writer.writerow(row)
+        metrics._charge(self._stage, start, io_before)
+        if self._counter is not None:
+            metrics.counters[self._counter] += 1
+        return result
+
+    def writerows(self, rows: Iterable[Iterable[Any]]) -> None:
+        for row in rows:
+            self.writerow(row)
+
+
+def enable(metrics: Optional[Metrics] = None) -> Metrics:
+    """
+    Start collecting metrics in the given registry, or in a new one.
+
+    Only Readers, Writers and merges started while metrics are enabled are instrumented.
+
+    Returns:
+        Metrics: The active registry.
+    """
+    global _active
+    _active = metrics if metrics is not None else Metrics()
+    return _active
+
+
+def disable() -> None:
+    """
+    Stop collecting metrics.
+    """
+    global _active
+    _active = None
+
+
+def active() -> Optional[Metrics]:
+    """
+    Return the active registry, or None when metrics are disabled.
+    """
+    return _active
+
+
+@contextlib.contextmanager
+def collect(report: bool = True, file: Optional[TextIO] = None, metrics: Optional[Metrics] = None) -> Iterator[Metrics]:
+    """
+    Collect metrics for the duration of a with block.
+
+    On exit, the registry is published to its callbacks, the per-stage breakdown
+    is printed if report is True, and the previously active registry is restored.
+
+    Args:
+        report (bool, optional): Whether to print the breakdown on exit. Default is True.
+        file (TextIO, optional): Where to print the breakdown. Default is sys.stderr.
+        metrics (Metrics, optional): The registry to collect into. Default is a new one.
+
+    Returns:
+        Iterator[Metrics]: The registry, as the target of the with statement.
+    """
+    previous = _active
+    current = enable(metrics)
+    try:
+        yield current
+    finally:
+        if previous is not None:
+            enable(previous)
+        else:
+            disable()
+        current.publish()
+        if report:
+            current.report(file)
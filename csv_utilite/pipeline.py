@@ -0,0 +1,421 @@
+import itertools
+from typing import Iterable, Iterator, Any, Callable, List, Optional, Tuple, Union
+
+from .manipulation import sort_rows
+from .reader import Reader
+from .writer import Writer
+
+Column = Union[int, str]
+
+
+def scan(file_path: str, dialect: str = 'excel', has_header: bool = True, headers: Optional[List[Column]] = None,
+         type_cast: bool = True, na_values: Optional[List[str]] = None, encoding: Optional[str] = None) -> 'Pipeline':
+    """
+    Start a lazy pipeline over a CSV file.
+
+    Nothing is read until the pipeline is iterated, collected or sunk.
+
+    Args:
+        file_path (str): The file path for the input CSV file.
+        dialect (str): The dialect to use for parsing the CSV file, or 'auto' to sniff it.
+        has_header (bool): Whether the CSV file has a header row.
+        headers (Optional[List[Column]]): Column names to use instead of the header row. Without a
+            header row and without headers, columns are named by their index.
+        type_cast (bool): Whether to automatically cast data types, as in Reader.
+        na_values (Optional[List[str]]): Strings representing missing values, as in Reader.
+        encoding (Optional[str]): The encoding of the CSV file. Ignored with dialect='auto'.
+
+    Returns:
+        Pipeline: A pipeline yielding the rows of the file.
+    """
+    return Pipeline(_Source(file_path, dialect, has_header, headers, type_cast, na_values, encoding))
+
+
+class Pipeline:
+    """
+    A lazy chain of row operations over a CSV file.
+
+    Every method returns a new Pipeline. When the pipeline runs, consecutive
+    per-row stages are fused into a single loop, filters on explicit columns
+    are evaluated by the scan before the other columns are cast, and only the
+    columns used downstream are cast at all. Only sort buffers rows.
+    """
+
+    def __init__(self, source: '_Source', stages: Tuple[tuple, ...] = ()):
+        """
+        Initialize a Pipeline instance. Use scan() to create one.
+
+        Args:
+            source (_Source): The CSV file to read.
+            stages (Tuple[tuple, ...]): The operations applied to the rows, in order.
+        """
+        self._source = source
+        self._stages = stages
+
+    def filter(self, predicate: Callable[..., bool], columns: Optional[List[Column]] = None) -> 'Pipeline':
+        """
+        Keep the rows for which a predicate is true.
+
+        Args:
+            predicate (Callable[..., bool]): Called with the values of columns as arguments when
+                columns is given, or with the whole row otherwise.
+            columns (Optional[List[Column]]): The columns the predicate reads. Declaring them lets the
+                filter run inside the scan.
+
+        Returns:
+            Pipeline: The extended pipeline.
+        """
+        return self._extend(('filter', predicate, _as_list(columns)))
+
+    def select(self, *columns: Column) -> 'Pipeline':
+        """
+        Keep only the given columns, in the given order.
+
+        Returns:
+            Pipeline: The extended pipeline.
+        """
+        return self._extend(('select', list(columns)))
+
+    def with_column(self, name: Column, func: Callable[..., Any], columns: Optional[List[Column]] = None) -> 'Pipeline':
+        """
+        Add a computed column, or replace an existing one.
+
+        Args:
+            name (Column): The name of the column.
+            func (Callable[..., Any]): Called with the values of columns as arguments when columns is
+                given, or with the whole row otherwise.
+            columns (Optional[List[Column]]): The columns func reads.
+
+        Returns:
+            Pipeline: The extended pipeline.
+        """
+        return self._extend(('with_column', name, func, _as_list(columns)))
+
+    def sort(self, by: Union[Column, List[Tuple[Column, str]]], nulls: str = 'last') -> 'Pipeline':
+        """
+        Sort the rows, as sort_rows(by=...) does. This stage buffers all rows.
+
+        Args:
+            by (Union[Column, List[Tuple[Column, str]]]): A column to sort ascending by, or a list of
+                (column, 'asc'|'desc') pairs.
+            nulls (str): Where None values are placed, either 'last' (default) or 'first'.
+
+        Returns:
+            Pipeline: The extended pipeline.
+        """
+        if not isinstance(by, list):
+            by = [(by, 'asc')]
+        return self._extend(('sort', by, nulls))
+
+    def head(self, n: int) -> 'Pipeline':
+        """
+        Keep only the first n rows. Reading stops as soon as they are produced.
+
+        Returns:
+            Pipeline: The extended pipeline.
+        """
+        return self._extend(('head', n))
+
+    @property
+    def columns(self) -> List[Column]:
+        """
+        The column names of the rows produced by the pipeline.
+        """
+        return self._schemas()[-1]
+
+    def explain(self) -> str:
+        """
+        Describe how the pipeline will run.
+
+        Returns:
+            str: One line for the scan and one line per fused segment or barrier.
+        """
+        plan = self._plan()
+        lines = [f"scan {self._source.file_path} columns={plan.source_columns} pushed_filters={len(plan.pushed)}"]
+        for ops, barrier in plan.segments:
+            if ops:
+                lines.append(f"fused [{', '.join(op for op, _ in ops)}]")
+            if barrier is not None:
+                lines.append(f"{barrier[0]} {barrier[1]}")
+        return '\n'.join(lines)
+
+    def collect(self) -> List[List[Any]]:
+        """
+        Run the pipeline and return its rows.
+
+        Returns:
+            List[List[Any]]: The rows produced by the pipeline.
+        """
+        return list(self)
+
+    def sink(self, output_path: str, dialect: str = 'excel', na_rep: str = '', header: bool = True) -> int:
+        """
+        Run the pipeline and stream its rows to a CSV file.
+
+        Args:
+            output_path (str): The file path for the output CSV file.
+            dialect (str): The dialect to use for writing the CSV file.
+            na_rep (str): The value written for None.
+            header (bool): Whether to write the column names as the first row.
+
+        Returns:
+            int: The number of data rows written.
+        """
+        count = 0
+        with Writer(output_path, dialect=dialect, na_rep=na_rep) as writer:
+            if header:
+                writer.writerow(self.columns)
+            for row in self:
+                writer.writerow(row)
+                count += 1
+        return count
+
+    def __iter__(self) -> Iterator[List[Any]]:
+        plan = self._plan()
+        rows = self._source.rows(plan.source_indexes, plan.pushed)
+        for ops, barrier in plan.segments:
+            if ops:
+                rows = _fused(rows, [func for _, func in ops])
+            if barrier is None:
+                continue
+            if barrier[0] == 'head':
+                rows = itertools.islice(rows, barrier[1])
+            else:
+                rows = iter(sort_rows(list(rows), by=barrier[1], nulls=barrier[2]))
+        return iter(rows)
+
+    def _extend(self, stage: tuple) -> 'Pipeline':
+        return Pipeline(self._source, self._stages + (stage,))
+
+    def _schemas(self) -> List[List[Column]]:
+        """
+        Return the logical schema before each stage, followed by the output schema.
+        """
+        schema = self._source.columns()
+        schemas = [schema]
+        for stage in self._stages:
+            kind = stage[0]
+            if kind == 'select':
+                for column in stage[1]:
+                    _position(schema, column)
+                schema = list(stage[1])
+            elif kind == 'with_column':
+                schema = schema if stage[1] in schema else schema + [stage[1]]
+            elif kind == 'filter':
+                for column in stage[2] or []:
+                    _position(schema, column)
+            elif kind == 'sort':
+                for column, _ in stage[1]:
+                    _position(schema, column)
+            schemas.append(schema)
+        return schemas
+
+    def _plan(self) -> '_Plan':
+        schemas = self._schemas()
+        source_columns = schemas[0]
+        stages = list(self._stages)
+
+        # Predicate pushdown: filters on declared source columns move into the scan,
+        # unless a head or a with_column redefining one of their columns comes first.
+        pushed = []
+        redefined = set()
+        for index, stage in enumerate(stages):
+            kind = stage[0]
+            if kind == 'head':
+                break
+            if kind == 'with_column':
+                redefined.add(stage[1])
+            elif kind == 'filter' and stage[2] is not None and not redefined.intersection(stage[2]):
+                pushed.append((stage[1], [source_columns.index(column) for column in stage[2]]))
+                stages[index] = None
+        kept = [(stage, schemas[index]) for index, stage in enumerate(stages) if stage is not None]
+
+        # Projection pushdown: walk backwards to find the columns each stage must produce.
+        needed = set(schemas[-1])
+        needed_after = []
+        for stage, schema in reversed(kept):
+            needed_after.append(set(needed))
+            kind = stage[0]
+            if kind == 'select':
+                needed = needed.intersection(stage[1])
+            elif kind == 'with_column':
+                if stage[1] not in needed:
+                    continue
+                needed.discard(stage[1])
+                needed.update(schema if stage[3] is None else stage[3])
+            elif kind == 'filter':
+                needed.update(schema if stage[2] is None else stage[2])
+            elif kind == 'sort':
+                needed.update(column for column, _ in stage[1])
+        needed_after.reverse()
+
+        physical = [column for column in source_columns if column in needed]
+        source_indexes = [source_columns.index(column) for column in physical]
+
+        segments = []
+        ops = []
+        for (stage, schema), after in zip(kept, needed_after):
+            kind = stage[0]
+            if kind == 'filter':
+                ops.append(('filter', _compile_filter(stage[1], stage[2], physical)))
+            elif kind == 'select':
+                output = [column for column in stage[1] if column in after]
+                if output != physical:
+                    ops.append(('select', _compile_select(output, physical)))
+                physical = output
+            elif kind == 'with_column':
+                if stage[1] not in after:
+                    continue
+                # Keep the physical columns in the logical order, even when a replaced column
+                # was not read because nothing needed its previous value.
+                present = set(physical)
+                present.add(stage[1])
+                schema_after = schema if stage[1] in schema else schema + [stage[1]]
+                output = [column for column in schema_after if column in present]
+                ops.append(('with_column', _compile_with_column(stage[1], stage[2], stage[3], physical, output)))
+                physical = output
+            else:
+                if kind == 'head':
+                    barrier = ('head', stage[1])
+                else:
+                    by = [(_position(physical, column), direction) for column, direction in stage[1]]
+                    barrier = ('sort', by, stage[2])
+                segments.append((ops, barrier))
+                ops = []
+        segments.append((ops, None))
+
+        return _Plan([source_columns[i] for i in source_indexes], source_indexes, pushed, segments)
+
+
+class _Plan:
+    """
+    The physical plan of a pipeline: the scan and the fused segments between barriers.
+    """
+
+    def __init__(self, source_columns, source_indexes, pushed, segments):
+        self.source_columns = source_columns
+        self.source_indexes = source_indexes
+        self.pushed = pushed
+        self.segments = segments
+
+
+class _Source:
+    """
+    A CSV file scanned by a pipeline.
+    """
+
+    def __init__(self, file_path, dialect, has_header, headers, type_cast, na_values, encoding):
+        self.file_path = file_path
+        self.dialect = dialect
+        self.has_header = has_header
+        self.headers = headers
+        self.type_cast = type_cast
+        self.na_values = na_values
+        self.encoding = encoding
+        self._columns = None
+
+    def columns(self) -> List[Column]:
+        """Return the column names, reading the first row once if needed."""
+        if self._columns is None:
+            if self.headers is not None:
+                self._columns = list(self.headers)
+            else:
+                reader, file = self._open()
+                try:
+                    first = next(reader, [])
+                finally:
+                    file.close()
+                self._columns = list(first) if self.has_header else list(range(len(first)))
+        return self._columns
+
+    def rows(self, indexes: List[int], pushed: List[Tuple[Callable[..., bool], List[int]]]) -> Iterator[List[Any]]:
+        """Yield the projected rows that pass the pushed filters."""
+        reader, file = self._open()
+        cast = reader._cast_value if self.type_cast else None
+        try:
+            if self.has_header:
+                next(reader, None)
+            # Short rows contribute None for their missing cells, as in sort_rows.
+            for raw in reader:
+                width = len(raw)
+                if pushed:
+                    if cast is None:
+                        passed = all(predicate(*[raw[i] if i < width else None for i in columns])
+                                     for predicate, columns in pushed)
+                    else:
+                        passed = all(predicate(*[cast(raw[i]) if i < width else None for i in columns])
+                                     for predicate, columns in pushed)
+                    if not passed:
+                        continue
+                if cast is None:
+                    yield [raw[i] if i < width else None for i in indexes]
+                else:
+                    yield [cast(raw[i]) if i < width else None for i in indexes]
+        finally:
+            file.close()
+
+    def _open(self):
+        if self.dialect == 'auto':
+            reader = Reader(self.file_path, dialect='auto', type_cast=False, na_values=self.na_values)
+            return reader, reader
+        file = open(self.file_path, 'r', newline='', encoding=self.encoding)
+        return Reader(file, dialect=self.dialect, type_cast=False, na_values=self.na_values), file
+
+
+def _fused(rows: Iterable[List[Any]], ops: List[Callable[[List[Any]], Optional[List[Any]]]]) -> Iterator[List[Any]]:
+    """
+    Apply consecutive per-row stages in a single pass. A stage returns None to drop a row.
+    """
+    for row in rows:
+        for op in ops:
+            row = op(row)
+            if row is None:
+                break
+        else:
+            yield row
+
+
+def _compile_filter(predicate, columns, physical):
+    if columns is None:
+        return lambda row: row if predicate(row) else None
+    indexes = [_position(physical, column) for column in columns]
+    return lambda row: row if predicate(*[row[i] for i in indexes]) else None
+
+
+def _compile_select(output, physical):
+    indexes = [_position(physical, column) for column in output]
+    return lambda row: [row[i] for i in indexes]
+
+
+def _compile_with_column(name, func, columns, physical, output):
+    if columns is None:
+        compute = func
+    else:
+        indexes = [_position(physical, column) for column in columns]
+        compute = lambda row: func(*[row[i] for i in indexes])
+    target = output.index(name)
+    if name in physical:
+        def replace(row):
+            row[target] = compute(row)
+            return row
+        return replace
+
+    def insert(row):
+        row.insert(target, compute(row))
+        return row
+    return insert
+
+
+def _position(schema: List[Column], column: Column) -> int:
+    try:
+        return schema.index(column)
+    except ValueError:
+        raise ValueError(f"Unknown column: {column!r}") from None
+
+
+def _as_list(columns: Optional[List[Column]]) -> Optional[List[Column]]:
+    if columns is None:
+        return None
+    if isinstance(columns, (str, int)):
+        return [columns]
+    return list(columns)
@@ -0,0 +1,407 @@
+import csv
+import hashlib
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Any, Dict, List, Optional, Tuple
+
+from .reader import Reader
+
+
+class HyperLogLog:
+    """
+    A mergeable sketch estimating the number of distinct values.
+    """
+
+    def __init__(self, precision: int = 12):
+        """
+        Initialize a HyperLogLog instance.
+
+        Args:
+            precision (int, optional): The number of index bits. The sketch uses 2**precision
+                bytes and has a relative error of about 1.04 / sqrt(2**precision). Default is 12.
+        """
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        """
+        Add a value to the sketch.
+        """
+        hashed = int.from_bytes(hashlib.blake2b(value.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'big')
+        index = hashed >> (64 - self.precision)
+        rest = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = 64 - self.precision - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """
+        Merge another sketch with the same precision into this one.
+        """
+        self._registers = bytearray(max(a, b) for a, b in zip(self._registers, other._registers))
+
+    def estimate(self) -> int:
+        """
+        Return the estimated number of distinct values.
+        """
+        size = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        raw = alpha * size * size / sum(2.0 ** -register for register in self._registers)
+        zeros = self._registers.count(0)
+        if raw <= 2.5 * size and zeros:
+            return round(size * math.log(size / zeros))
+        return round(raw)
+
+
+class TDigest:
+    """
+    A mergeable sketch estimating quantiles of a numeric distribution.
+    """
+
+    def __init__(self, compression: int = 100):
+        """
+        Initialize a TDigest instance.
+
+        Args:
+            compression (int, optional): Bounds the number of centroids kept. Higher values
+                are more accurate and use more memory. Default is 100.
+        """
+        self.compression = compression
+        self.count = 0
+        self._centroids = []
+        self._buffer = []
+
+    def add(self, value: float, weight: int = 1) -> None:
+        """
+        Add a value to the sketch.
+        """
+        self._buffer.append((value, weight))
+        self.count += weight
+        if len(self._buffer) >= self.compression * 10:
+            self._compress()
+
+    def merge(self, other: 'TDigest') -> None:
+        """
+        Merge another sketch into this one.
+        """
+        other._compress()
+        self._buffer.extend(other._centroids)
+        self.count += other.count
+        self._compress()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Return the estimated value at quantile q, between 0 and 1, or None if the sketch is empty.
+        """
+        self._compress()
+        centroids = self._centroids
+        if not centroids:
+            return None
+        if len(centroids) == 1:
+            return centroids[0][0]
+
+        target = q * self.count
+        cumulative = 0.0
+        for index, (mean, weight) in enumerate(centroids):
+            center = cumulative + weight / 2
+            if target <= center:
+                if index == 0:
+                    return mean
+                previous_mean, previous_weight = centroids[index - 1]
+                previous_center = cumulative - previous_weight / 2
+                fraction = (target - previous_center) / (center - previous_center)
+                return previous_mean + fraction * (mean - previous_mean)
+            cumulative += weight
+        return centroids[-1][0]
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        items = sorted(self._centroids + self._buffer)
+        self._buffer = []
+        total = self.count
+        merged = []
+        cumulative = 0.0
+        mean, weight = items[0]
+        for item_mean, item_weight in items[1:]:
+            q = (cumulative + weight + item_weight / 2) / total
+            limit = max(1.0, 4 * total * q * (1 - q) / self.compression)
+            if weight + item_weight <= limit:
+                weight += item_weight
+                mean += (item_mean - mean) * item_weight / weight
+            else:
+                merged.append((mean, weight))
+                cumulative += weight
+                mean, weight = item_mean, item_weight
+        merged.append((mean, weight))
+        self._centroids = merged
+
+
+class ColumnProfile:
+    """
+    Mergeable statistics of one CSV column.
+    """
+
+    def __init__(self, name: Any):
+        """
+        Initialize a ColumnProfile instance.
+
+        Args:
+            name (Any): The column name, or its index without a header.
+        """
+        self.name = name
+        self.count = 0
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.type_counts = {'bool': 0, 'int': 0, 'float': 0, 'str': 0}
+        self.min_length = None
+        self.max_length = 0
+        self.total_length = 0
+        self.distinct = HyperLogLog()
+        self.values = TDigest()
+        self.lengths = TDigest()
+
+    def add(self, raw: str, value: Any) -> None:
+        """
+        Add a cell, given as its raw text and its cast value.
+        """
+        self.count += 1
+        if value is None:
+            self.nulls += 1
+            return
+
+        kind = 'bool' if isinstance(value, bool) else type(value).__name__
+        self.type_counts[kind] = self.type_counts.get(kind, 0) + 1
+        key = value if kind in ('int', 'float') else raw
+        if kind in ('int', 'float'):
+            self.values.add(value)
+        if self.min is None or _less(key, self.min):
+            self.min = key
+        if self.max is None or _less(self.max, key):
+            self.max = key
+
+        length = len(raw)
+        self.lengths.add(length)
+        self.total_length += length
+        if self.min_length is None or length < self.min_length:
+            self.min_length = length
+        if length > self.max_length:
+            self.max_length = length
+        self.distinct.add(raw)
+
+    def merge(self, other: 'ColumnProfile') -> None:
+        """
+        Merge the statistics of the same column computed on another part of the data.
+        """
+        self.count += other.count
+        self.nulls += other.nulls
+        for kind, count in other.type_counts.items():
+            self.type_counts[kind] = self.type_counts.get(kind, 0) + count
+        if other.min is not None and (self.min is None or _less(other.min, self.min)):
+            self.min = other.min
+        if other.max is not None and (self.max is None or _less(self.max, other.max)):
+            self.max = other.max
+        if other.min_length is not None and (self.min_length is None or other.min_length < self.min_length):
+            self.min_length = other.min_length
+        self.max_length = max(self.max_length, other.max_length)
+        self.total_length += other.total_length
+        self.distinct.merge(other.distinct)
+        self.values.merge(other.values)
+        self.lengths.merge(other.lengths)
+
+    @property
+    def inferred_type(self) -> Optional[str]:
+        """
+        The narrowest type holding every non-null value: 'bool', 'int', 'float' or 'str',
+        or None if the column only holds missing values.
+        """
+        seen = {kind for kind, count in self.type_counts.items() if count}
+        if not seen:
+            return None
+        if seen == {'bool'}:
+            return 'bool'
+        if seen == {'int'}:
+            return 'int'
+        if seen <= {'int', 'float'}:
+            return 'float'
+        return 'str'
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Return the statistics as a plain dictionary.
+        """
+        present = self.count - self.nulls
+        numeric = self.inferred_type in ('int', 'float')
+        return {
+            'name': self.name,
+            'count': self.count,
+            'nulls': self.nulls,
+            'type': self.inferred_type,
+            'min': self.min,
+            'max': self.max,
+            'distinct': self.distinct.estimate(),
+            'quantiles': {q: self.values.quantile(q) for q in (0.25, 0.5, 0.75, 0.99)} if numeric else None,
+            'length': {
+                'min': self.min_length,
+                'max': self.max_length,
+                'mean': self.total_length / present if present else None,
+                'p50': self.lengths.quantile(0.5),
+                'p99': self.lengths.quantile(0.99),
+            },
+        }
+
+
+class FileProfile:
+    """
+    The statistics of every column of a CSV file.
+    """
+
+    def __init__(self, columns: List[ColumnProfile], rows: int = 0):
+        """
+        Initialize a FileProfile instance.
+
+        Args:
+            columns (List[ColumnProfile]): The profile of each column.
+            rows (int, optional): The number of data rows.
+        """
+        self.columns = columns
+        self.rows = rows
+
+    def merge(self, other: 'FileProfile') -> None:
+        """
+        Merge the profile of another part of the same file.
+        """
+        while len(self.columns) < len(other.columns):
+            self.columns.append(ColumnProfile(other.columns[len(self.columns)].name))
+        for column, other_column in zip(self.columns, other.columns):
+            column.merge(other_column)
+        self.rows += other.rows
+
+    def dtypes(self) -> List[str]:
+        """
+        Return the inferred type of each column, to seed Reader(dtypes=...).
+
+        Columns with only missing values are reported as 'str'.
+        """
+        return [column.inferred_type or 'str' for column in self.columns]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Return the statistics as a plain dictionary.
+        """
+        return {'rows': self.rows, 'columns': [column.as_dict() for column in self.columns]}
+
+
+def profile_rows(rows: Iterable[Iterable[str]], headers: Optional[List[Any]] = None, na_values: Optional[List[str]] = None) -> FileProfile:
+    """
+    Compute the statistics of rows of raw string values in a single pass.
+
+    Args:
+        rows (Iterable[Iterable[str]]): The data rows, as strings.
+        headers (Optional[List[Any]]): The column names. Default is the column indexes.
+        na_values (Optional[List[str]]): Strings representing missing values, as in Reader.
+
+    Returns:
+        FileProfile: The statistics of every column.
+    """
+    cast = Reader([], na_values=na_values)._cast_value
+    columns = [ColumnProfile(name) for name in headers or []]
+    count = 0
+    for row in rows:
+        count += 1
+        while len(columns) < len(row):
+            columns.append(ColumnProfile(len(columns)))
+        for column, raw in zip(columns, row):
+            column.add(raw, cast(raw))
+    return FileProfile(columns, count)
+
+
+def profile_file(file_path: str, dialect: str = 'excel', has_header: bool = True, encoding: str = 'utf-8',
+                 na_values: Optional[List[str]] = None, processes: int = 1) -> FileProfile:
+    """
+    Compute per-column statistics of a CSV file in a single streaming pass.
+
+    Each column gets its row and null counts, min and max, inferred type,
+    approximate distinct count (HyperLogLog), approximate value quantiles for
+    numeric columns and length distribution (t-digest). With several processes,
+    the file is split into byte ranges at line boundaries and the partial
+    profiles are merged, so fields must not contain newlines in that case.
+
+    Args:
+        file_path (str): The file path for the CSV file.
+        dialect (str): The dialect to use for parsing the CSV file.
+        has_header (bool): Whether the CSV file has a header row.
+        encoding (str): The encoding of the CSV file. With several processes, it must be ASCII-compatible.
+        na_values (Optional[List[str]]): Strings representing missing values, as in Reader.
+        processes (int): The number of worker processes.
+
+    Returns:
+        FileProfile: The statistics of every column.
+    """
+    with open(file_path, 'rb') as file:
+        header_line = file.readline() if has_header else b''
+    headers = next(csv.reader([header_line.decode(encoding)], dialect), []) if has_header else None
+    if headers and headers[0].startswith('\ufeff'):
+        headers[0] = headers[0][1:]
+
+    ranges = _byte_ranges(file_path, len(header_line), processes)
+    tasks = [(file_path, start, end, dialect, encoding, headers, na_values) for start, end in ranges]
+    if len(tasks) == 1:
+        return _profile_range(tasks[0])
+
+    with ProcessPoolExecutor(max_workers=len(tasks)) as pool:
+        partials = list(pool.map(_profile_range, tasks))
+    profile = partials[0]
+    for partial in partials[1:]:
+        profile.merge(partial)
+    return profile
+
+
+def _byte_ranges(file_path: str, start: int, parts: int) -> List[Tuple[int, int]]:
+    """
+    Split a file after its header into about parts byte ranges ending at line boundaries.
+    """
+    size = os.path.getsize(file_path)
+    if parts <= 1 or size - start < parts * 65536:
+        return [(start, size)]
+    bounds = [start]
+    with open(file_path, 'rb') as file:
+        for index in range(1, parts):
+            file.seek(start + (size - start) * index // parts)
+            file.readline()
+            position = file.tell()
+            if bounds[-1] < position < size:
+                bounds.append(position)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _profile_range(task) -> FileProfile:
+    """
+    Profile the records between two byte offsets of a file.
+    """
+    file_path, start, end, dialect, encoding, headers, na_values = task
+
+    def lines():
+        with open(file_path, 'rb') as file:
+            file.seek(start)
+            position = start
+            for line in file:
+                if position >= end:
+                    break
+                position += len(line)
+                yield line.decode(encoding)
+
+    return profile_rows(csv.reader(lines(), dialect), headers, na_values)
+
+
+def _less(a: Any, b: Any) -> bool:
+    """
+    Compare values of possibly different types, ordering numbers before strings.
+    """
+    try:
+        return a < b
+    except TypeError:
+        return isinstance(a, (int, float))
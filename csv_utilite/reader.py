@@ -1,5 +1,11 @@
 import csv
-from typing import Iterator, Optional, Any, Union, List, Dict
+import os
+import sys
+import time
+from typing import Iterator, Optional, Any, Union, List, Dict, Tuple
+
+from . import metrics as _metrics
+from .sniffing import sniff, sniff_text
 
 class Reader:
     """
@@ -9,7 +15,8 @@ class Reader:
     handling missing values, and support for different dialects.
     """
 
-    def __init__(self, file_or_iterator, dialect='excel', type_cast=True, na_values=None):
+    def __init__(self, file_or_iterator, dialect='excel', type_cast=True, na_values=None,
+                 intern=None, intern_threshold=0.5, intern_sample=1000, dtypes=None):
         """
         Initialize a Reader instance.
 
@@ -17,15 +24,55 @@ class Reader:
             file_or_iterator (str, path-like, or iterator): A file path, URL, or an iterator
                 to read the CSV data from.
             dialect (str, optional): The dialect to use for parsing the CSV file.
-                Default is 'excel'.
+                Default is 'excel'. With 'auto', the dialect is sniffed from the start of
+                the data, and a file path is opened with the detected encoding; the
+                result is available as the sniffed attribute.
             type_cast (bool, optional): Whether to automatically cast data types.
                 Default is True.
             na_values (str or list, optional): A string or list of strings representing
                 missing or null values in the CSV data.
+            intern (bool or list, optional): Share one string object per distinct value
+                in low-cardinality columns. True picks the columns automatically, a list
+                of column indexes interns exactly those columns. Default is None (off).
+            intern_threshold (float, optional): With intern=True, a column stays interned
+                while its distinct values make up at most this fraction of its strings.
+                A column that goes over it after the sample stops being interned, so
+                that its pool does not grow with the file. Default is 0.5.
+            intern_sample (int, optional): With intern=True, the number of rows observed
+                before deciding which columns stay interned. Default is 1000.
+            dtypes (list or dict, optional): The type of each column, as 'int', 'float',
+                'bool' or 'str', given as a list or as a dictionary of column indexes, for
+                example from profile_file(...).dtypes(). Typed columns are cast directly
+                instead of trying each type in turn; values that do not parse fall back to
+                the automatic cast. Only used when type_cast is True.
         """
+        self.sniffed = None
+        self._file = None
+        if dialect == 'auto':
+            file_or_iterator, dialect = self._sniff(file_or_iterator)
+        self._metrics = _metrics._active
+        if self._metrics is not None:
+            file_or_iterator = self._metrics.timed_lines(file_or_iterator, 'reader')
         self._reader = csv.reader(file_or_iterator, dialect=dialect)
         self.type_cast = type_cast
         self.na_values = na_values or ['']
+        self._auto_intern = intern is True
+        self._bounded_pools = intern is True
+        self._intern_threshold = intern_threshold
+        self._intern_sample = intern_sample
+        self._rows_read = 0
+        self._pools = {}
+        self._intern_stats = {}
+        self._encoders = {}
+        self._casters = None
+        if dtypes is not None:
+            if not isinstance(dtypes, dict):
+                dtypes = dict(enumerate(dtypes))
+            self._casters = [self._typed_caster(dtypes.get(column)) for column in range(max(dtypes, default=-1) + 1)]
+        if intern and not self._auto_intern:
+            for column in intern:
+                self._pools[column] = {}
+                self._intern_stats[column] = [0, 0, 0]
 
     def __iter__(self):
         return self
@@ -41,13 +88,241 @@ class Reader:
         Returns:
             list: A list containing the values of the next row.
         """
+        if self._metrics is not None:
+            return self._next_instrumented()
+
         row = next(self._reader)
 
         if self.type_cast:
-            row = [self._cast_value(value) for value in row]
+            row = self._cast_row(row)
+
+        if self._pools or self._auto_intern:
+            self._intern_row(row)
 
         return row
 
+    def _next_instrumented(self) -> List[Any]:
+        """
+        Return the next row like __next__, recording the parse and cast timings.
+        """
+        metrics = self._metrics
+        start, io_before = time.perf_counter(), metrics._io_seconds
+        row = next(self._reader)
+        metrics._charge('reader.parse', start, io_before)
+        metrics.counters['reader.rows'] += 1
+
+        if self.type_cast:
+            start = time.perf_counter()
+            row = self._cast_row(row)
+            metrics.timings['reader.cast'] += time.perf_counter() - start
+
+        if self._pools or self._auto_intern:
+            self._intern_row(row)
+
+        return row
+
+    def read_batch(self, size: int, encode: Optional[List[int]] = None) -> Tuple[List[List[Any]], Dict[int, List[Any]]]:
+        """
+        Read up to size rows as columns, dictionary-encoding some of them.
+
+        Codes are stable across batches: the dictionary of a column only grows,
+        and the same list object is returned for every batch.
+
+        Args:
+            size (int): The maximum number of rows to read.
+            encode (list, optional): The indexes of the columns to dictionary-encode.
+                Default is the interned columns.
+
+        Returns:
+            tuple: A list of columns, where encoded columns hold integer codes, and a
+            dictionary mapping each encoded column index to its list of values.
+            The columns are empty once the data is exhausted.
+        """
+        if encode is None:
+            # Columns whose pool was dropped keep their dictionary, so that codes stay stable.
+            encode = list(self._pools) + [column for column in self._encoders if column not in self._pools]
+        encoders = {}
+        for column in encode:
+            encoders[column] = self._encoders.setdefault(column, ({}, []))
+
+        columns = []
+        if size < 1:
+            return columns, {column: encoder[1] for column, encoder in encoders.items()}
+        for count, row in enumerate(self):
+            while len(columns) < len(row):
+                columns.append([None] * count)
+            for index, column in enumerate(columns):
+                value = row[index] if index < len(row) else None
+                encoder = encoders.get(index)
+                if encoder is not None:
+                    codes, values = encoder
+                    # 1, 1.0 and True are equal, so the type is part of the key.
+                    key = (type(value), value)
+                    code = codes.get(key)
+                    if code is None:
+                        code = codes[key] = len(values)
+                        values.append(value)
+                    value = code
+                column.append(value)
+            if count + 1 == size:
+                break
+
+        return columns, {column: encoder[1] for column, encoder in encoders.items()}
+
+    def interning_stats(self) -> Dict[int, Dict[str, int]]:
+        """
+        Report the effect of interning for each interned column.
+
+        Returns:
+            dict: For each interned column index, the number of distinct values,
+            the number of values replaced by a shared object, and the approximate
+            number of bytes saved by doing so.
+        """
+        return {column: {'distinct': len(self._pools.get(column, ())), 'hits': hits, 'bytes_saved': saved}
+                for column, (hits, saved, _) in self._intern_stats.items()
+                if column in self._pools}
+
+    def _intern_row(self, row: List[Any]) -> None:
+        """
+        Replace strings in interned columns by the shared object for their value.
+
+        Args:
+            row (list): The row to update in place.
+        """
+        if self._auto_intern:
+            for column in range(len(row)):
+                if column not in self._intern_stats:
+                    self._pools[column] = {}
+                    self._intern_stats[column] = [0, 0, 0]
+
+        dropped = None
+        for column, pool in self._pools.items():
+            if column >= len(row):
+                continue
+            value = row[column]
+            if type(value) is not str:
+                continue
+            stats = self._intern_stats[column]
+            stats[2] += 1
+            shared = pool.setdefault(value, value)
+            if shared is not value:
+                row[column] = shared
+                stats[0] += 1
+                stats[1] += sys.getsizeof(value)
+            elif self._bounded_pools and not self._auto_intern \
+                    and len(pool) > stats[2] * self._intern_threshold:
+                dropped = (dropped or []) + [column]
+        if dropped:
+            for column in dropped:
+                del self._pools[column]
+
+        if self._auto_intern:
+            self._rows_read += 1
+            if self._rows_read == self._intern_sample:
+                self._auto_intern = False
+                for column in list(self._pools):
+                    strings = self._intern_stats[column][2]
+                    if not strings or len(self._pools[column]) > strings * self._intern_threshold:
+                        del self._pools[column]
+
+    def close(self) -> None:
+        """
+        Close the file opened by the Reader, if it opened one from a path.
+        """
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self) -> 'Reader':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _sniff(self, file_or_iterator):
+        """
+        Sniff the dialect of a file path or a seekable text file.
+
+        Args:
+            file_or_iterator (str, path-like, or file object): The CSV data source.
+
+        Returns:
+            tuple: The file to read from and the dialect to parse it with.
+
+        Raises:
+            ValueError: If the source can not be sampled without consuming it.
+        """
+        if isinstance(file_or_iterator, (str, os.PathLike)):
+            self.sniffed = sniff(file_or_iterator)
+            self._file = open(file_or_iterator, 'r', newline='', encoding=self.sniffed.encoding)
+            return self._file, self.sniffed.dialect
+
+        if hasattr(file_or_iterator, 'read') and file_or_iterator.seekable():
+            position = file_or_iterator.tell()
+            sample = file_or_iterator.read(65536)
+            file_or_iterator.seek(position)
+            self.sniffed = sniff_text(sample, complete=len(sample) < 65536)
+            return file_or_iterator, self.sniffed.dialect
+
+        raise ValueError("dialect='auto' requires a file path or a seekable file object")
+
+    def _cast_row(self, row: List[str]) -> List[Any]:
+        """
+        Cast every value of a row, with the caster of its column when dtypes are set.
+        """
+        if self._casters is None:
+            return [self._cast_value(value) for value in row]
+        casters = self._casters
+        cast = self._cast_value
+        return [casters[index](value) if index < len(casters) else cast(value)
+                for index, value in enumerate(row)]
+
+    def _typed_caster(self, dtype: Optional[str]):
+        """
+        Return a function casting the values of a column of a known type.
+
+        Args:
+            dtype (str, optional): 'int', 'float', 'bool', 'str', or None for the automatic cast.
+
+        Returns:
+            callable: The cast function.
+
+        Raises:
+            ValueError: If dtype is invalid.
+        """
+        na_values = frozenset([self.na_values] if isinstance(self.na_values, str) else self.na_values)
+        fallback = self._cast_value
+        if dtype is None:
+            return fallback
+        if dtype == 'str':
+            return lambda value: None if value in na_values else value
+        if dtype == 'bool':
+            booleans = {'true': True, 't': True, 'false': False, 'f': False}
+
+            def cast_bool(value):
+                if value in na_values:
+                    return None
+                result = booleans.get(value.lower())
+                if result is None:
+                    if self._metrics is not None:
+                        self._metrics.count('reader.cast_failures.bool')
+                    return fallback(value)
+                return result
+            return cast_bool
+        if dtype not in ('int', 'float'):
+            raise ValueError(f"Invalid dtype: {dtype}")
+        parse = int if dtype == 'int' else float
+
+        def cast_number(value):
+            if value in na_values:
+                return None
+            try:
+                return parse(value)
+            except ValueError:
+                if self._metrics is not None:
+                    self._metrics.count(f'reader.cast_failures.{dtype}')
+                return fallback(value)
+        return cast_number
+
     def _cast_value(self, value: str) -> Optional[Union[int, float, bool]]:
         """
         Cast a string value to its corresponding data type.
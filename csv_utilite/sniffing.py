@@ -0,0 +1,197 @@
+import codecs
+import csv
+import os
+from collections import OrderedDict
+from typing import Optional, Tuple, Type
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+_DELIMITERS = ',;\t|'
+
+_cache = OrderedDict()
+_CACHE_SIZE = 16384
+
+
+class SniffResult:
+    """
+    The dialect, header presence and encoding detected for a CSV file.
+    """
+
+    def __init__(self, dialect: str, has_header: bool, encoding: str, bom: bool):
+        """
+        Initialize a SniffResult instance.
+
+        Args:
+            dialect (str): The name of the dialect to parse the file with. Built-in dialect
+                names are used when the detected dialect matches one of them.
+            has_header (bool): Whether the first row looks like a header.
+            encoding (str): The encoding to open the file with. Encodings for files starting
+                with a BOM skip the BOM when decoding.
+            bom (bool): Whether the file starts with a byte order mark.
+        """
+        self.dialect = dialect
+        self.has_header = has_header
+        self.encoding = encoding
+        self.bom = bom
+
+    @property
+    def delimiter(self) -> str:
+        return csv.get_dialect(self.dialect).delimiter
+
+    @property
+    def quotechar(self) -> Optional[str]:
+        return csv.get_dialect(self.dialect).quotechar
+
+    def __repr__(self) -> str:
+        return (f"SniffResult(delimiter={self.delimiter!r}, quotechar={self.quotechar!r}, "
+                f"has_header={self.has_header}, encoding={self.encoding!r}, bom={self.bom})")
+
+
+def sniff(file_path: str, sample_size: int = 65536, use_cache: bool = True) -> SniffResult:
+    """
+    Detect the dialect, header presence, encoding and BOM of a CSV file.
+
+    Only the first sample_size bytes are read. Results are cached by path,
+    modification time and size, so sniffing an unchanged file again is free.
+
+    Args:
+        file_path (str): The file path of the CSV file.
+        sample_size (int): The number of bytes to sample from the start of the file.
+        use_cache (bool): Whether to look up and store the result in the cache.
+
+    Returns:
+        SniffResult: The detected properties of the file.
+    """
+    stat = os.stat(file_path)
+    cache_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, sample_size)
+    if use_cache:
+        result = _cache.get(cache_key)
+        if result is not None:
+            _cache.move_to_end(cache_key)
+            return result
+
+    with open(file_path, 'rb') as file:
+        sample = file.read(sample_size)
+    result = sniff_bytes(sample, complete=stat.st_size <= sample_size)
+
+    if use_cache:
+        _cache[cache_key] = result
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def sniff_bytes(sample: bytes, complete: bool = False) -> SniffResult:
+    """
+    Detect the dialect, header presence, encoding and BOM of a sample of CSV data.
+
+    Args:
+        sample (bytes): The first bytes of the CSV data.
+        complete (bool): Whether the sample holds the whole file. Otherwise the
+            possibly truncated last line is ignored.
+
+    Returns:
+        SniffResult: The detected properties of the data.
+    """
+    encoding, bom = _detect_encoding(sample, complete)
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    text = decoder.decode(sample, final=complete)
+    dialect, has_header = _sniff_text(text, complete)
+    return SniffResult(dialect, has_header, encoding, bom)
+
+
+def sniff_text(text: str, complete: bool = False) -> SniffResult:
+    """
+    Detect the dialect and header presence of already decoded CSV data.
+
+    Args:
+        text (str): The first characters of the CSV data.
+        complete (bool): Whether the text holds the whole file.
+
+    Returns:
+        SniffResult: The detected properties of the data. The encoding is reported as None.
+    """
+    bom = text.startswith('\ufeff')
+    dialect, has_header = _sniff_text(text[1:] if bom else text, complete)
+    return SniffResult(dialect, has_header, None, bom)
+
+
+def clear_sniff_cache() -> None:
+    """
+    Remove every cached sniffing result.
+    """
+    _cache.clear()
+
+
+def _detect_encoding(sample: bytes, complete: bool) -> Tuple[str, bool]:
+    """
+    Detect the encoding of a sample from its BOM, falling back to UTF-8 then latin-1.
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding, True
+
+    try:
+        # An incremental decoder tolerates a multi-byte character cut at the end of the sample.
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=complete)
+        return 'utf-8', False
+    except UnicodeDecodeError:
+        return 'latin-1', False
+
+
+def _sniff_text(text: str, complete: bool) -> Tuple[str, bool]:
+    """
+    Sniff the dialect and header presence of a decoded sample.
+    """
+    if not complete:
+        end = max(text.rfind('\n'), text.rfind('\r'))
+        if end > 0:
+            text = text[:end + 1]
+    if not text.strip():
+        return 'excel', True
+
+    sniffer = csv.Sniffer()
+    try:
+        sniffed = sniffer.sniff(text, delimiters=_DELIMITERS)
+    except csv.Error:
+        return 'excel', True
+
+    try:
+        has_header = sniffer.has_header(text)
+    except csv.Error:
+        has_header = True
+
+    return _fast_dialect(sniffed), has_header
+
+
+def _fast_dialect(sniffed: Type[csv.Dialect]) -> str:
+    """
+    Return the name of a built-in dialect equivalent to the sniffed one, registering a new one otherwise.
+
+    Registered dialects are validated once by the csv module instead of
+    being rebuilt from a class for every reader.
+    """
+    quotechar = sniffed.quotechar or '"'
+    # The sniffer reports doublequote=False when the sample has no embedded quotes at all.
+    doublequote = sniffed.doublequote or not sniffed.escapechar
+    for name in ('excel', 'excel-tab'):
+        builtin = csv.get_dialect(name)
+        if (sniffed.delimiter == builtin.delimiter and quotechar == builtin.quotechar
+                and doublequote == builtin.doublequote
+                and not sniffed.skipinitialspace):
+            return name
+
+    escapechar = ord(sniffed.escapechar) if sniffed.escapechar else 0
+    name = (f"sniffed-{ord(sniffed.delimiter)}-{ord(quotechar)}-{escapechar}"
+            f"-{int(doublequote)}-{int(sniffed.skipinitialspace)}")
+    if name not in csv.list_dialects():
+        csv.register_dialect(name, delimiter=sniffed.delimiter, quotechar=quotechar,
+                             doublequote=doublequote, skipinitialspace=sniffed.skipinitialspace,
+                             escapechar=sniffed.escapechar, quoting=csv.QUOTE_MINIMAL)
+    return name
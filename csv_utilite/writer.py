@@ -1,5 +1,9 @@
 import csv
-from typing import Iterable, Any, Union, Optional, IO
+import os
+import time
+from typing import Iterable, Iterator, Any, List, Union, Optional, IO
+
+from . import metrics as _metrics
 
 class Writer:
     """
@@ -9,7 +13,8 @@ class Writer:
     handling missing values, and support for different dialects.
     """
 
-    def __init__(self, file_or_writer: Union[str, IO[str]], dialect='excel', na_rep: str = ''):
+    def __init__(self, file_or_writer: Union[str, IO[str]], dialect='excel', na_rep: str = '',
+                 encoding: Optional[str] = None, buffer_size: int = -1):
         """
         Initialize a Writer instance.
 
@@ -20,19 +25,36 @@ class Writer:
                                        Default is 'excel'.
             na_rep (str, optional): A string representing the value to use for missing or null values.
                                        Default is an empty string.
+            encoding (str, optional): The encoding used when file_or_writer is a path.
+                                       Default is the platform default.
+            buffer_size (int, optional): The buffer size in bytes used when file_or_writer is a path.
+                                       Default is the io module default.
 
         Raises:
             ValueError: If file_or_writer is not a string, path-like object, or a writer object.
         """
-        if not isinstance(file_or_writer, (str, IO[str])):
+        if isinstance(file_or_writer, (str, os.PathLike)):
+            self._file = open(file_or_writer, 'w', newline='', encoding=encoding, buffering=buffer_size)
+            self._owns_file = True
+        elif hasattr(file_or_writer, 'write'):
+            self._file = file_or_writer
+            self._owns_file = False
+        else:
             raise ValueError("file_or_writer must be a string, path-like object, or a writer object")
 
-        if isinstance(file_or_writer, str):
-            self._writer = csv.writer(open(file_or_writer, 'w', newline=''), dialect=dialect)
+        self._metrics = _metrics._active
+        if self._metrics is not None:
+            self._writer = csv.writer(self._metrics.timed_file(self._file, 'writer'), dialect=dialect)
         else:
-            self._writer = csv.writer(file_or_writer, dialect=dialect)
+            self._writer = csv.writer(self._file, dialect=dialect)
         self.na_rep = na_rep
 
+    def __enter__(self) -> 'Writer':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
     def writerow(self, row: Iterable[Any]) -> None:
         """
         Write a row of data to the CSV file.
@@ -45,22 +67,47 @@ class Writer:
         """
         if not row:
             raise ValueError("Cannot write empty row")
+        if self._metrics is not None:
+            metrics = self._metrics
+            start, io_before = time.perf_counter(), metrics._io_seconds
+            self._writer.writerow([self._format_value(value) for value in row])
+            metrics._charge('writer.format', start, io_before)
+            metrics.counters['writer.rows'] += 1
+            return
         self._writer.writerow([self._format_value(value) for value in row])
 
     def writerows(self, rows: Iterable[Iterable[Any]]) -> None:
         """
         Write multiple rows of data to the CSV file.
 
+        Rows are streamed to the output. A list or tuple of rows is checked before
+        anything is written, so an empty row leaves the output untouched; with any
+        other iterable, the rows before an empty one have already been written.
+
         Args:
             rows (Iterable[Iterable[Any]]): An iterable of iterables containing the values for each row.
 
         Raises:
             ValueError: If any row is empty.
         """
-        for row in rows:
-            if not row:
-                raise ValueError("Cannot write empty row")
-        self._writer.writerows([[self._format_value(value) for value in row] for row in rows])
+        if isinstance(rows, (list, tuple)):
+            for row in rows:
+                if not row:
+                    raise ValueError("Cannot write empty row")
+        if self._metrics is not None:
+            for row in rows:
+                self.writerow(row)
+            return
+        self._writer.writerows(self._format_rows(rows))
+
+    def close(self) -> None:
+        """
+        Flush the output, and close it if the Writer opened it from a path.
+        """
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
 
     def set_na_rep(self, na_rep: str) -> None:
         """
@@ -83,3 +130,13 @@ class Writer:
         """
         if value is None:
             return self.na_rep
+        return value
+
+    def _format_rows(self, rows: Iterable[Iterable[Any]]) -> Iterator[List[Any]]:
+        """
+        Lazily format rows, so that writerows consumes its input in a single pass.
+        """
+        for row in rows:
+            if not row:
+                raise ValueError("Cannot write empty row")
+            yield [self._format_value(value) for value in row]
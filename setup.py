@@ -9,16 +9,24 @@ setup(
     author='Khalil Habib Shariff',
     author_email='khaleelhabib@outlook.com',
     packages=find_packages(),
+    python_requires='>=3.7',
+    entry_points={
+        'console_scripts': [
+            'csv-utilite=csv_utilite.cli:main',
+        ],
+    },
     install_requires=[
     
     ],
+    extras_require={
+        'parquet': ['pyarrow'],
+    },
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
         'Topic :: Software Development :: Build Tools',
         'License :: OSI Approved :: MIT License',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',
@@ -0,0 +1,76 @@
+import unittest
+import importlib.util
+import os
+import tempfile
+
+_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'run.py')
+_spec = importlib.util.spec_from_file_location('benchmarks_run', _PATH)
+run = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(run)
+
+
+class BenchmarksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_size(self):
+        self.assertEqual(run.parse_size('16MB'), 16 << 20)
+        self.assertEqual(run.parse_size(' 1.5kb'), 1536)
+        self.assertEqual(run.parse_size('1000'), 1000)
+
+    def test_dataset_rows_are_deterministic(self):
+        for name in run.DATASETS:
+            first, second = run.dataset_rows(name), run.dataset_rows(name)
+            rows = [next(first) for _ in range(5)]
+            self.assertEqual(rows, [next(second) for _ in range(5)])
+            self.assertTrue(all(len(row) == len(rows[0]) for row in rows))
+        with self.assertRaises(ValueError):
+            next(run.dataset_rows('unknown'))
+
+    def test_generate_dataset_is_reused(self):
+        path = run.generate_dataset('narrow', 4096, self.tmp.name)
+        self.assertGreaterEqual(os.path.getsize(path), 4096)
+        self.assertLess(os.path.getsize(path), 4096 + 100)
+        mtime = os.stat(path).st_mtime_ns
+        self.assertEqual(run.generate_dataset('narrow', 4096, self.tmp.name), path)
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+
+    def test_run_one_measures_the_timed_region(self):
+        path = run.generate_dataset('quoted', 8192, self.tmp.name)
+        rows = run.count_rows(path)
+        for benchmark in ('reader', 'writer', 'merge_files'):
+            result = run.run_one(benchmark, path)
+            self.assertEqual(result['rows'], rows * 2 if benchmark == 'merge_files' else rows)
+            self.assertGreater(result['bytes'], 0)
+            self.assertGreater(result['rows_per_sec'], 0)
+            if result['rss_growth_mb'] is not None:
+                self.assertGreaterEqual(result['rss_growth_mb'], 0)
+                self.assertGreaterEqual(result['peak_rss_mb'], result['baseline_rss_mb'])
+
+    def test_compare_reports_regressions(self):
+        baseline = [{'benchmark': 'reader', 'dataset': 'narrow', 'rows_per_sec': 1000.0,
+                     'peak_rss_mb': 50.0, 'rss_growth_mb': 10.0}]
+        fine = [dict(baseline[0], rows_per_sec=950.0, rss_growth_mb=10.5)]
+        self.assertEqual(run.compare(fine, baseline, 0.1), [])
+
+        worse = [dict(baseline[0], rows_per_sec=800.0, rss_growth_mb=20.0)]
+        regressions = run.compare(worse, baseline, 0.1)
+        self.assertEqual(len(regressions), 2)
+        self.assertIn('rows/s', regressions[0])
+        self.assertIn('MB growth', regressions[1])
+
+        unknown = [dict(worse[0], dataset='wide')]
+        self.assertEqual(run.compare(unknown, baseline, 0.1), [])
+
+    def test_compare_falls_back_to_peak_memory(self):
+        baseline = [{'benchmark': 'writer', 'dataset': 'wide', 'rows_per_sec': 1000.0, 'peak_rss_mb': 50.0}]
+        results = [dict(baseline[0], peak_rss_mb=60.0, rss_growth_mb=1.0)]
+        self.assertEqual(run.compare(results, baseline, 0.1), ['writer on wide: 60.0 MB peak, baseline 50.0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
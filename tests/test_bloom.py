@@ -0,0 +1,39 @@
+import unittest
+import os
+import tempfile
+
+from csv_utilite.bloom import BloomFilter
+
+
+class BloomFilterTest(unittest.TestCase):
+
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        bloom = BloomFilter.from_keys((f'key{i}' for i in range(10000)), capacity=10000, error_rate=0.01)
+        self.assertEqual(len(bloom), 10000)
+        self.assertTrue(all(f'key{i}' in bloom for i in range(10000)))
+        false_positives = sum(f'other{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 200)
+        self.assertLess(bloom.nbytes, 10000 * 10 // 8 + 8)
+
+    def test_save_and_load_memory_mapped(self):
+        bloom = BloomFilter.from_keys(['a', 'b', 'c'], capacity=3)
+        bloom.metadata = {'key_column': 'id', 'error_rate': 0.01}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'keys.bloom')
+            bloom.save(path)
+            with BloomFilter.load(path) as loaded:
+                self.assertEqual(len(loaded), 3)
+                self.assertEqual((loaded.num_bits, loaded.num_hashes), (bloom.num_bits, bloom.num_hashes))
+                self.assertEqual(loaded.metadata, {'key_column': 'id', 'error_rate': 0.01})
+                self.assertTrue(all(key in loaded for key in 'abc'))
+                with self.assertRaises(TypeError):
+                    loaded.add('d')
+
+            with open(path, 'wb') as file:
+                file.write(b'not a filter')
+            with self.assertRaises(ValueError):
+                BloomFilter.load(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import os
+import tempfile
+from unittest.mock import patch
+
+from csv_utilite.cache import ColumnarCache, _content_hash
+
+
+class ColumnarCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, 'cache')
+        self.path = os.path.join(self.tmp.name, 'data.csv')
+        with open(self.path, 'w', newline='') as file:
+            file.write('id,country,amount,flag\n1,NG,1.5,true\n2,US,,false\n3,NG,2.25,t\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_load_matches_reader_and_reuses_sidecar(self):
+        cache = ColumnarCache(self.cache_dir)
+        table = cache.load(self.path)
+        expected = [[1, 'NG', 1.5, True], [2, 'US', None, False], [3, 'NG', 2.25, True]]
+        self.assertEqual(table.headers, ['id', 'country', 'amount', 'flag'])
+        self.assertEqual(list(table.rows()), expected)
+        self.assertIsInstance(table.column('id'), memoryview)
+        sidecars = os.listdir(self.cache_dir)
+        self.assertEqual(len(sidecars), 1)
+
+        cached = cache.load(self.path)
+        self.assertEqual(list(cached.rows()), expected)
+        self.assertEqual(os.listdir(self.cache_dir), sidecars)
+        table.close()
+        cached.close()
+
+    def test_modified_file_is_parsed_again(self):
+        cache = ColumnarCache(self.cache_dir)
+        cache.load(self.path).close()
+        with open(self.path, 'a', newline='') as file:
+            file.write('4,GH,3.0,f\n')
+        table = cache.load(self.path)
+        self.assertEqual(len(table), 4)
+        self.assertEqual(list(table.column('country')), ['NG', 'US', 'NG', 'GH'])
+        table.close()
+
+    def test_mixed_int_and_float_column_matches_reader(self):
+        with open(self.path, 'w', newline='') as file:
+            file.write('amount,big\n1,9007199254740993\n2.5,0.5\n,\n')
+        table = ColumnarCache(self.cache_dir).load(self.path)
+        self.assertEqual(table.columns[0].data.format, 'd')
+        rows = list(table.rows())
+        self.assertEqual(rows, [[1, 9007199254740993], [2.5, 0.5], [None, None]])
+        self.assertIs(type(rows[0][0]), int)
+        self.assertIs(type(rows[0][1]), int)
+        table.close()
+
+    def test_touched_file_is_hashed_once(self):
+        cache = ColumnarCache(self.cache_dir)
+        cache.load(self.path).close()
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        with patch('csv_utilite.cache._content_hash', wraps=_content_hash) as content_hash:
+            table = cache.load(self.path)
+            self.assertEqual(list(table.column('country')), ['NG', 'US', 'NG'])
+            table.close()
+            cache.load(self.path).close()
+        self.assertEqual(content_hash.call_count, 1)
+
+    def test_eviction_keeps_directory_bounded(self):
+        other = os.path.join(self.tmp.name, 'other.csv')
+        with open(other, 'w', newline='') as file:
+            file.write('a\n1\n')
+        cache = ColumnarCache(self.cache_dir, max_bytes=1)
+        cache.load(self.path).close()
+        cache.load(other).close()
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+from unittest.mock import patch
+
+from csv_utilite.checkpoint import Checkpoint
+from csv_utilite.conversion import json_to_csv
+from csv_utilite.generation import generate_from_db
+from csv_utilite.manipulation import merge_files
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmp.name, 'out.csv')
+        self.checkpoint = os.path.join(self.tmp.name, 'out.checkpoint')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _read(self, path):
+        with open(path, 'rb') as file:
+            return file.read()
+
+    def _interrupted(self, job):
+        """Run a job that keeps its last checkpoint and leaves extra bytes behind, as a crash would."""
+        with patch.object(Checkpoint, 'complete'):
+            job()
+        self.assertTrue(os.path.exists(self.checkpoint))
+        with open(self.output, 'ab') as file:
+            file.write(b'partial,row')
+
+    def test_merge_files_resumes_byte_identical(self):
+        paths = []
+        for index in range(3):
+            path = os.path.join(self.tmp.name, f'in{index}.csv')
+            with open(path, 'w', newline='') as file:
+                file.write('id,name\n' + ''.join(f'{index}{i},"n\n{i}"\n' for i in range(5)))
+            paths.append(path)
+        expected = os.path.join(self.tmp.name, 'expected.csv')
+        merge_files(paths, expected)
+
+        job = lambda: merge_files(paths, self.output, checkpoint_path=self.checkpoint, checkpoint_every=4)
+        self._interrupted(job)
+        job()
+        self.assertEqual(self._read(self.output), self._read(expected))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def _merge_inputs(self, count=2):
+        paths = []
+        for index in range(count):
+            path = os.path.join(self.tmp.name, f'in{index}.csv')
+            with open(path, 'w', newline='') as file:
+                file.write('id\n' + ''.join(f'{index}{i}\n' for i in range(5)))
+            paths.append(path)
+        return paths
+
+    def test_missing_output_restarts_from_scratch(self):
+        paths = self._merge_inputs()
+        expected = os.path.join(self.tmp.name, 'expected.csv')
+        merge_files(paths, expected)
+
+        job = lambda: merge_files(paths, self.output, checkpoint_path=self.checkpoint, checkpoint_every=3)
+        self._interrupted(job)
+        os.remove(self.output)
+        job()
+        self.assertEqual(self._read(self.output), self._read(expected))
+
+    def test_truncated_output_restarts_from_scratch(self):
+        paths = self._merge_inputs()
+        expected = os.path.join(self.tmp.name, 'expected.csv')
+        merge_files(paths, expected)
+
+        job = lambda: merge_files(paths, self.output, checkpoint_path=self.checkpoint, checkpoint_every=3)
+        self._interrupted(job)
+        with open(self.output, 'wb') as file:
+            file.write(b'id\r\n')
+        job()
+        self.assertEqual(self._read(self.output), self._read(expected))
+
+    def test_rejects_checkpoint_of_another_job(self):
+        paths = self._merge_inputs()
+        job = lambda: merge_files(paths, self.output, checkpoint_path=self.checkpoint, checkpoint_every=3)
+        self._interrupted(job)
+        with open(paths[0], 'a', newline='') as file:
+            file.write('99\n')
+        with self.assertRaises(ValueError):
+            job()
+        other_output = os.path.join(self.tmp.name, 'other.csv')
+        with self.assertRaises(ValueError):
+            merge_files(paths, other_output, checkpoint_path=self.checkpoint)
+
+    def test_merge_files_rejects_different_headers(self):
+        paths = []
+        for index, header in enumerate(['a,b', 'c,d']):
+            path = os.path.join(self.tmp.name, f'in{index}.csv')
+            with open(path, 'w', newline='') as file:
+                file.write(header + '\n1,2\n')
+            paths.append(path)
+        with self.assertRaises(ValueError):
+            merge_files(paths, self.output)
+        merge_files(paths, self.output, header=['x', 'y'])
+        self.assertEqual(self._read(self.output), b'x,y\r\n1,2\r\n1,2\r\n')
+
+    def test_generate_from_db_resumes_byte_identical(self):
+        connection = sqlite3.connect(':memory:')
+        connection.execute('CREATE TABLE users (id INTEGER, name TEXT)')
+        connection.executemany('INSERT INTO users VALUES (?, ?)', [(i, f'user{i}') for i in range(25)])
+        query = 'SELECT id, name FROM users ORDER BY id'
+        expected = os.path.join(self.tmp.name, 'expected.csv')
+        generate_from_db(query, connection, expected)
+
+        job = lambda: generate_from_db(query, connection, self.output, checkpoint_path=self.checkpoint,
+                                       checkpoint_every=7, batch_size=3)
+        self._interrupted(job)
+        job()
+        self.assertEqual(self._read(self.output), self._read(expected))
+
+    def test_json_to_csv_resumes_byte_identical(self):
+        data = [{'id': i, 'name': f'user{i}'} for i in range(10)]
+        expected = os.path.join(self.tmp.name, 'expected.csv')
+        json_to_csv(data, output_path=expected)
+
+        job = lambda: json_to_csv(data, output_path=self.output, checkpoint_path=self.checkpoint, checkpoint_every=3)
+        self._interrupted(job)
+        job()
+        self.assertEqual(self._read(self.output), self._read(expected))
+
+    def test_json_to_csv_rejects_other_data(self):
+        data = [{'id': i, 'name': f'user{i}'} for i in range(10)]
+        self._interrupted(lambda: json_to_csv(data, output_path=self.output, checkpoint_path=self.checkpoint,
+                                              checkpoint_every=3))
+        other = [{'id': i, 'name': f'other{i}'} for i in range(10)]
+        with self.assertRaises(ValueError):
+            json_to_csv(other, output_path=self.output, checkpoint_path=self.checkpoint, checkpoint_every=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
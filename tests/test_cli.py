@@ -0,0 +1,86 @@
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+
+from csv_utilite.cli import main
+
+
+class CLITest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input = self._path('people.csv')
+        with open(self.input, 'w', newline='') as file:
+            file.write('name,age,city\nAnn,31,Oslo\nBob,9,"Rome, IT"\nCid,,Paris\nDee,100,Lyon\n')
+        self.output = self._path('out.csv')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def _read_output(self):
+        with open(self.output, newline='') as file:
+            return file.read()
+
+    def test_sort_numeric_descending(self):
+        self.assertEqual(main(['sort', self.input, '-k', 'age:desc', '-o', self.output]), 0)
+        self.assertEqual(self._read_output(),
+                         'name,age,city\r\nDee,100,Lyon\r\nAnn,31,Oslo\r\nBob,9,"Rome, IT"\r\nCid,,Paris\r\n')
+
+    def test_filter_keeps_original_text(self):
+        self.assertEqual(main(['filter', self.input, '-w', 'age>=31', '-w', 'city~^L', '-o', self.output]), 0)
+        self.assertEqual(self._read_output(), 'name,age,city\r\nDee,100,Lyon\r\n')
+
+    def test_convert_round_trip(self):
+        jsonl = self._path('people.jsonl')
+        self.assertEqual(main(['convert', self.input, '--to', 'jsonl', '-o', jsonl]), 0)
+        self.assertEqual(main(['convert', jsonl, '--from', 'jsonl', '--to', 'csv', '-o', self.output]), 0)
+        self.assertEqual(self._read_output(),
+                         'name,age,city\r\nAnn,31,Oslo\r\nBob,9,"Rome, IT"\r\nCid,,Paris\r\nDee,100,Lyon\r\n')
+
+    def test_validate_reports_invalid_rows(self):
+        self.assertEqual(main(['validate', self.input, '-c', 'age:int', '-o', self.output]), 1)
+        self.assertNotIn('Cid', self._read_output())
+        self.assertEqual(main(['validate', self.input, '--require', 'zip', '-o', self.output]), 1)
+
+    def test_merge_and_split(self):
+        self.assertEqual(main(['merge', self.input, self.input, '-o', self.output]), 0)
+        self.assertEqual(self._read_output().count('Ann'), 2)
+        shards = self._path('shards')
+        self.assertEqual(main(['split', self.output, shards, '-n', '4']), 0)
+        self.assertEqual(sorted(os.listdir(shards)), ['out_00000.csv', 'out_00001.csv'])
+
+    def test_merge_to_file_uses_encoding(self):
+        latin = self._path('latin.csv')
+        with open(latin, 'w', newline='', encoding='latin-1') as file:
+            file.write('name\nJos\xe9\n')
+        self.assertEqual(main(['merge', latin, latin, '--encoding', 'latin-1', '-o', self.output]), 0)
+        with open(self.output, 'rb') as file:
+            self.assertEqual(file.read(), b'name\r\nJos\xe9\r\nJos\xe9\r\n')
+
+    def test_stdin_to_stdout_and_lazy_import(self):
+        with open(self.input, 'rb') as stdin:
+            result = subprocess.run([sys.executable, '-m', 'csv_utilite', 'filter', '-w', 'name==Bob'],
+                                    stdin=stdin, stdout=subprocess.PIPE, check=True,
+                                    cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(result.stdout, b'name,age,city\r\nBob,9,"Rome, IT"\r\n')
+
+        modules = subprocess.run([sys.executable, '-c', 'import csv_utilite, sys; print(sorted(sys.modules))'],
+                                 stdout=subprocess.PIPE, check=True, universal_newlines=True,
+                                 cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+        self.assertNotIn('csv_utilite.reader', modules)
+
+        submodule = subprocess.run([sys.executable, '-c', 'import csv_utilite, csv_utilite.follow as f; '
+                                    'print(csv_utilite.manipulation.merge_files.__name__, f.Follower.__name__, '
+                                    'csv_utilite.follow.follow.__name__)'],
+                                   stdout=subprocess.PIPE, check=True, universal_newlines=True,
+                                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+        self.assertEqual(submodule, 'merge_files Follower follow\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
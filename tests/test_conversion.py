@@ -139,5 +139,85 @@ class TestCsvJsonConversion(unittest.TestCase):
                 result = f.read()
             self.assertEqual(result, expected_csv)
 
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestParquetConversion(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.temp_dir.name, "data.csv")
+        self.parquet_path = os.path.join(self.temp_dir.name, "data.parquet")
+        with open(self.csv_path, "w", newline="") as f:
+            f.write("id,score,active,code\r\n1,2.5,true,007\r\n2,,false,abc\r\n3,4,true,\r\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @unittest.skipIf(pyarrow is not None, "pyarrow is installed")
+    def test_missing_pyarrow(self):
+        from csv_utilite.conversion import csv_to_parquet
+        with self.assertRaises(ImportError):
+            csv_to_parquet(self.csv_path, self.parquet_path)
+
+    @unittest.skipUnless(pyarrow is not None, "pyarrow is not installed")
+    def test_round_trip(self):
+        import pyarrow.parquet as pq
+        from csv_utilite.conversion import csv_to_parquet, parquet_to_csv
+
+        self.assertEqual(csv_to_parquet(self.csv_path, self.parquet_path, row_group_size=2, compression="zstd"), 3)
+        parquet = pq.ParquetFile(self.parquet_path)
+        self.assertEqual(parquet.metadata.num_row_groups, 2)
+        self.assertEqual([str(field.type) for field in parquet.schema_arrow], ["int64", "double", "bool", "string"])
+        self.assertEqual(parquet.read().column("code").to_pylist(), ["007", "abc", None])
+
+        output_path = os.path.join(self.temp_dir.name, "out.csv")
+        self.assertEqual(parquet_to_csv(self.parquet_path, output_path, batch_size=2), 3)
+        with open(output_path, newline="") as f:
+            self.assertEqual(f.read(), "id,score,active,code\r\n1,2.5,True,007\r\n2,,False,abc\r\n3,4.0,True,\r\n")
+
+    @unittest.skipUnless(pyarrow is not None, "pyarrow is not installed")
+    def test_later_value_outside_inferred_type(self):
+        from csv_utilite.conversion import csv_to_parquet
+
+        with self.assertRaises(ValueError):
+            csv_to_parquet(self.csv_path, self.parquet_path, row_group_size=1)
+        self.assertEqual(csv_to_parquet(self.csv_path, self.parquet_path, row_group_size=1,
+                                        dtypes=["int", "float", "bool", "str"]), 3)
+
+    @unittest.skipUnless(pyarrow is not None, "pyarrow is not installed")
+    def test_float_in_later_int_row_group(self):
+        from csv_utilite.conversion import csv_to_parquet
+
+        with open(self.csv_path, "w", newline="") as f:
+            f.write("id,amt\n1,1\n2,2\n3,1.5\n")
+        with self.assertRaises(ValueError):
+            csv_to_parquet(self.csv_path, self.parquet_path, row_group_size=2)
+        self.assertFalse(os.path.exists(self.parquet_path))
+
+    @unittest.skipUnless(pyarrow is not None, "pyarrow is not installed")
+    def test_byte_order_mark_is_stripped(self):
+        import pyarrow.parquet as pq
+        from csv_utilite.conversion import csv_to_parquet
+
+        with open(self.csv_path, "w", newline="", encoding="utf-8-sig") as f:
+            f.write("id,name\n1,a\n")
+        csv_to_parquet(self.csv_path, self.parquet_path)
+        self.assertEqual(pq.ParquetFile(self.parquet_path).schema_arrow.names, ["id", "name"])
+
+    @unittest.skipUnless(pyarrow is not None, "pyarrow is not installed")
+    def test_invalid_input_leaves_no_file(self):
+        from csv_utilite.conversion import csv_to_parquet
+
+        with self.assertRaises(ValueError):
+            csv_to_parquet(self.csv_path, self.parquet_path, dtypes=["int", "date"])
+        with open(self.csv_path, "a", newline="") as f:
+            f.write("4,1.0,true,x,extra\r\n")
+        with self.assertRaises(ValueError):
+            csv_to_parquet(self.csv_path, self.parquet_path, row_group_size=2, dtypes=["int", "float", "bool", "str"])
+        self.assertEqual(os.listdir(self.temp_dir.name), ["data.csv"])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
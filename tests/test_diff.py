@@ -0,0 +1,61 @@
+import unittest
+import csv
+import os
+import tempfile
+
+from csv_utilite.diff import diff_files
+
+
+class DiffFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.old = os.path.join(self.tmp.name, 'old.csv')
+        self.new = os.path.join(self.tmp.name, 'new.csv')
+        self.output = os.path.join(self.tmp.name, 'diff.csv')
+        old = {i: f'v{i}' for i in range(200)}
+        new = {i: value for i, value in old.items() if i >= 20}
+        new.update({i: 'new' for i in range(200, 215)})
+        new.update({i: 'changed' for i in range(50, 55)})
+        self._write(self.old, old)
+        self._write(self.new, new)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, path, data):
+        with open(path, 'w', newline='') as file:
+            file.write('id,value\n' + ''.join(f'{key:05d},{data[key]}\n' for key in sorted(data)))
+
+    def _changes(self):
+        with open(self.output, newline='') as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows[0], ['_change', 'id', 'value'])
+        return sorted(rows[1:])
+
+    def test_diff_in_memory(self):
+        counts = diff_files(self.old, self.new, self.output, key='id')
+        self.assertEqual(counts, {'added': 15, 'removed': 20, 'changed': 5})
+        changes = self._changes()
+        self.assertIn(['changed', '00050', 'changed'], changes)
+        self.assertIn(['removed', '00000', 'v0'], changes)
+        self.assertIn(['added', '00200', 'new'], changes)
+
+    def test_partitioned_and_sorted_paths_agree(self):
+        diff_files(self.old, self.new, self.output, key='id')
+        expected = self._changes()
+        counts = diff_files(self.old, self.new, self.output, key='id', memory_budget=4096, tmp_dir=self.tmp.name)
+        self.assertEqual(counts, {'added': 15, 'removed': 20, 'changed': 5})
+        self.assertEqual(self._changes(), expected)
+        diff_files(self.old, self.new, self.output, key=['id'], assume_sorted=True)
+        self.assertEqual(self._changes(), expected)
+
+    def test_unsorted_input_is_rejected(self):
+        with open(self.new, 'a', newline='') as file:
+            file.write('00001,late\n')
+        with self.assertRaises(ValueError):
+            diff_files(self.old, self.new, self.output, key='id', assume_sorted=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import os
+import tempfile
+
+from csv_utilite.follow import Follower, follow
+
+
+class FollowerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'log.csv')
+        self.checkpoint = os.path.join(self.tmp.name, 'log.checkpoint')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _append(self, data, mode='a'):
+        with open(self.path, mode, newline='') as file:
+            file.write(data)
+
+    def test_poll_returns_only_complete_new_rows(self):
+        self._append('ts,msg\n1,a\n2,"multi\nline', mode='w')
+        with Follower(self.path, has_header=True) as follower:
+            self.assertEqual(list(follower.poll()), [[1, 'a']])
+            self.assertEqual(follower.header, ['ts', 'msg'])
+            self._append('"\n3,c\n4')
+            self.assertEqual(list(follower.poll()), [[2, 'multi\nline'], [3, 'c']])
+            self._append(',d\n')
+            self.assertEqual(list(follower.poll()), [[4, 'd']])
+            self.assertEqual(list(follower.poll()), [])
+
+    def test_checkpoint_resumes_after_restart(self):
+        self._append('1,a\n2,b\n', mode='w')
+        with Follower(self.path, checkpoint_path=self.checkpoint) as follower:
+            self.assertEqual(list(follower.poll()), [[1, 'a'], [2, 'b']])
+        self._append('3,c\n')
+        with Follower(self.path, checkpoint_path=self.checkpoint) as follower:
+            self.assertEqual(list(follower.poll()), [[3, 'c']])
+
+    def test_truncation_and_rotation(self):
+        self._append('1,a\n2,b\n', mode='w')
+        follower = Follower(self.path)
+        self.assertEqual(len(list(follower.poll())), 2)
+        self._append('3,c\n', mode='w')
+        self.assertEqual(list(follower.poll()), [[3, 'c']])
+        self._append('4,d\n')
+        os.rename(self.path, self.path + '.1')
+        self._append('5,e\n', mode='w')
+        self.assertEqual(list(follower.poll()), [[4, 'd'], [5, 'e']])
+        follower.close()
+
+    def test_follow_stops_when_idle(self):
+        self._append('1,a\n', mode='w')
+        rows = list(follow(self.path, poll_interval=0.01, idle_timeout=0.05))
+        self.assertEqual(rows, [[1, 'a']])
+
+
+if __name__ == '__main__':
+    unittest.main()
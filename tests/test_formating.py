@@ -2,45 +2,61 @@ import unittest
 from unittest.mock import patch
 from typing import Iterable, Any, List, Optional
 import csv
-from csv_utilite.formating import quote_fields, remove_quotes, handle_newlines
+from csv_utilite.formating import quote_fields, remove_quotes, handle_newlines, format_rows
 
 
 class CSVUtilsTest(unittest.TestCase):
 
   def test_quote_fields_all(self):
     data = [['apple', 'banana,split'], [1, 2.5]]
-    quoted_rows = quote_fields(data, csv.QUOTE_ALL)
+    quoted_rows = list(quote_fields(data, csv.QUOTE_ALL))
     self.assertEqual(quoted_rows, [['"apple"', '"banana,split"'], ['"1"', '"2.5"']])
 
   def test_quote_fields_nonnumeric(self):
     data = [['apple', 'banana'], [1, 2.5]]
-    quoted_rows = quote_fields(data, csv.QUOTE_NONNUMERIC)
+    quoted_rows = list(quote_fields(data, csv.QUOTE_NONNUMERIC))
     self.assertEqual(quoted_rows, [['"apple"', '"banana"'], ['1', '"2.5"']])
 
   def test_quote_fields_minimal(self):
     data = [['apple', 'banana,split'], [1, 2.5]]
-    quoted_rows = quote_fields(data)  # Default minimal quoting
+    quoted_rows = list(quote_fields(data))  # Default minimal quoting
     self.assertEqual(quoted_rows, [['apple', '"banana,split"'], ['1', '2.5']])
 
   def test_quote_fields_none(self):
     data = [['apple', 'banana,split'], [1, 2.5]]
-    quoted_rows = quote_fields(data, csv.QUOTE_NONE)
+    quoted_rows = list(quote_fields(data, csv.QUOTE_NONE))
     self.assertEqual(quoted_rows, [data[0], data[1]])
 
   def test_remove_quotes(self):
     data = [['"apple"', '"banana,split"'], ['"1"', '"2.5"']]
-    unquoted_rows = remove_quotes(data)
+    unquoted_rows = list(remove_quotes(data))
     self.assertEqual(unquoted_rows, [['apple', 'banana,split'], ['1', '2.5']])
 
   def test_handle_newlines(self):
     data = [['field\nwith\nnewline'], ['another']]
-    formatted_rows = handle_newlines(data)
+    formatted_rows = list(handle_newlines(data))
     self.assertEqual(formatted_rows, [['field\\nwith\\nnewline'], ['another']])
 
   def test_handle_newlines_custom_replacement(self):
     data = [['field\nwith\nnewline'], ['another']]
-    formatted_rows = handle_newlines(data, replacement='<br>')
+    formatted_rows = list(handle_newlines(data, replacement='<br>'))
     self.assertEqual(formatted_rows, [['field<br>with<br>newline'], ['another']])
-    
+
+  def test_transforms_are_lazy(self):
+    rows = quote_fields(iter([['a,b']]))
+    self.assertEqual(next(rows), ['"a,b"'])
+
+  def test_format_rows_matches_chained_functions(self):
+    data = [['"a\nb"', 'plain', 3], ['"x,y"', '', 4.5]]
+    chained = list(quote_fields(handle_newlines(remove_quotes(data), replacement=' '), csv.QUOTE_MINIMAL))
+    fused = list(format_rows(data, quoting=csv.QUOTE_MINIMAL, strip_quotes=True, newline_replacement=' '))
+    self.assertEqual(fused, chained)
+    self.assertEqual(fused, [['a b', 'plain', '3'], ['"x,y"', '', '4.5']])
+
+  def test_format_rows_batches(self):
+    data = [[i] for i in range(5)]
+    batches = list(format_rows(data, batch_size=2))
+    self.assertEqual(batches, [[['0'], ['1']], [['2'], ['3']], [['4']]])
+
 if __name__ == '__main__':
     unittest.main()
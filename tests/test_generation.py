@@ -1,8 +1,9 @@
 import unittest
 from unittest.mock import patch
 import os
+import tempfile
 
-from csv_utilite.generation import generate_from_dict, generate_from_db
+from csv_utilite.generation import generate_from_dict, generate_from_db, generate_from_records
 
 
 class TestCSVGeneration(unittest.TestCase):
@@ -55,5 +56,43 @@ class TestCSVGeneration(unittest.TestCase):
             ['Mary', 35]
         ])
         
+
+class TestGenerateFromRecords(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.tmp.name, 'records.csv')
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _records(self):
+        yield {'id': 1, 'name': 'Alice'}
+        yield {'id': 2, 'name': 'Bob', 'email': 'bob@example.com'}
+        yield {'name': 'Carol', 'id': 3, 'age': None}
+
+    def _read(self):
+        with open(self.output_path, newline='') as file:
+            return file.read()
+
+    def test_first_record_keys_from_generator(self):
+        count = generate_from_records(self._records(), self.output_path, batch_size=2)
+        self.assertEqual(count, 3)
+        self.assertEqual(self._read(), 'id,name\r\n1,Alice\r\n2,Bob\r\n3,Carol\r\n')
+
+    def test_explicit_headers(self):
+        generate_from_records(self._records(), self.output_path, headers=['email'], na_rep='NA')
+        self.assertEqual(self._read(), 'email\r\nNA\r\nbob@example.com\r\nNA\r\n')
+
+    def test_two_pass_and_spill_union(self):
+        expected = 'id,name,email,age\r\n1,Alice,,\r\n2,Bob,bob@example.com,\r\n3,Carol,,\r\n'
+        generate_from_records(list(self._records()), self.output_path, union='two_pass')
+        self.assertEqual(self._read(), expected)
+        generate_from_records(self._records(), self.output_path, union='spill', spill_dir=self.tmp.name)
+        self.assertEqual(self._read(), expected)
+        with self.assertRaises(ValueError):
+            generate_from_records(self._records(), self.output_path, union='two_pass')
+
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
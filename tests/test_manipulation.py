@@ -1,8 +1,14 @@
 import unittest
 import csv
+import gc
+import os
+import tempfile
+import warnings
+from datetime import date
+from decimal import Decimal
 from unittest.mock import patch, MagicMock
 from typing import Iterable, Any, Callable, List, Dict, Optional
-from csv_utilite.manipulation import filter_rows, sort_rows, merge_files 
+from csv_utilite.manipulation import filter_rows, sort_rows, merge_files, top_n, merge_top_n, sample_rows, merge_samples, split_file, semi_join
 
 class CSVUtilsTest(unittest.TestCase):
 
@@ -16,6 +22,144 @@ class CSVUtilsTest(unittest.TestCase):
         sorted_rows = sort_rows(rows, key=lambda row: row[0])
         self.assertEqual(sorted_rows, [[1, 'a'], [2, 'b'], [3, 'a']])
 
+    def test_sort_rows_by_multiple_columns(self):
+        rows = [['2024-01-02', 5], ['2024-01-01', 7], ['2024-01-02', 9], ['2024-01-01', 3]]
+        sorted_rows = sort_rows(rows, by=[('date', 'asc'), ('amount', 'desc')], headers=['date', 'amount'])
+        self.assertEqual(sorted_rows, [['2024-01-01', 7], ['2024-01-01', 3], ['2024-01-02', 9], ['2024-01-02', 5]])
+
+    def test_sort_rows_by_with_nulls_and_indices(self):
+        rows = [[None], [2], [1], [None]]
+        self.assertEqual(sort_rows(rows, by=[(0, 'asc')], return_indices=True), [2, 1, 0, 3])
+        self.assertEqual(sort_rows(rows, by=[(0, 'desc')], nulls='first'), [[None], [None], [2], [1]])
+
+    def test_sort_rows_by_keeps_comparable_types(self):
+        self.assertEqual(sort_rows([[Decimal('10')], [Decimal('9')]], by=[(0, 'asc')]), [[Decimal('9')], [Decimal('10')]])
+        rows = [[date(2024, 1, 10)], [None], [date(2024, 1, 9)]]
+        self.assertEqual(sort_rows(rows, by=[(0, 'asc')]), [[date(2024, 1, 9)], [date(2024, 1, 10)], [None]])
+        self.assertEqual(sort_rows([[Decimal('2.5')], [3], [1.5]], by=[(0, 'asc')]), [[1.5], [Decimal('2.5')], [3]])
+        self.assertEqual(sort_rows([[10], ['9']], by=[(0, 'asc')]), [[10], ['9']])
+
+    def test_sort_rows_by_invalid_direction(self):
+        with self.assertRaises(ValueError):
+            sort_rows([[1]], by=[(0, 'up')])
+
+    def test_top_n(self):
+        rows = [['a', 5], ['b', 1], ['c', 9], ['d', 7]]
+        self.assertEqual(top_n(iter(rows), 2, key=1), [['c', 9], ['d', 7]])
+        self.assertEqual(top_n(rows, 1, key=lambda row: row[1], largest=False), [['b', 1]])
+        merged = merge_top_n([top_n(rows[:2], 2, 1), top_n(rows[2:], 2, 1)], 2, 1)
+        self.assertEqual(merged, [['c', 9], ['d', 7]])
+
+    def test_sample_rows(self):
+        rows = [[i] for i in range(100)]
+        sample, count = sample_rows(iter(rows), 10, seed=1, return_count=True)
+        self.assertEqual(count, 100)
+        self.assertEqual(len(sample), 10)
+        self.assertTrue(all(row in rows for row in sample))
+        self.assertEqual(sorted(sample_rows(rows[:3], 10)), rows[:3])
+
+    def test_merge_samples(self):
+        partials = [sample_rows([[i] for i in range(50)], 5, seed=1, return_count=True),
+                    sample_rows([[i] for i in range(50, 60)], 5, seed=2, return_count=True)]
+        merged = merge_samples(partials, 5, seed=3)
+        self.assertEqual(len(merged), 5)
+        self.assertEqual(len({row[0] for row in merged}), 5)
+
+    def test_semi_join_modes(self):
+        rows = [['007', 'a'], ['8', 'b'], [None, 'c'], ['9', 'd']]
+        with tempfile.TemporaryDirectory() as tmp:
+            keys_path = os.path.join(tmp, 'keys.csv')
+            with open(keys_path, 'w', newline='') as file:
+                file.write('id\n007\n9\n' + ''.join(f'x{i}\n' for i in range(1000)))
+            bloom_path = os.path.join(tmp, 'keys.bloom')
+            for options in ({}, {'mode': 'bloom'}, {'mode': 'bloom', 'verify': True, 'bloom_path': bloom_path},
+                            {'mode': 'bloom', 'verify': True, 'bloom_path': bloom_path}):
+                kept = list(semi_join(iter(rows), keys_path, 0, keys_has_header=True, key_column='id', **options))
+                self.assertEqual(kept, [['007', 'a'], ['9', 'd']])
+                dropped = list(semi_join(rows, keys_path, 0, anti=True, keys_has_header=True, **options))
+                self.assertEqual(dropped, [['8', 'b'], [None, 'c']])
+            self.assertTrue(os.path.exists(bloom_path))
+            with self.assertRaises(ValueError):
+                semi_join(rows, keys_path, 0, mode='fuzzy')
+
+    def test_semi_join_rebuilds_bloom_for_other_options(self):
+        rows = [['1'], ['2'], ['3']]
+        with tempfile.TemporaryDirectory() as tmp:
+            keys_path = os.path.join(tmp, 'keys.csv')
+            with open(keys_path, 'w', newline='') as file:
+                file.write('id,other\n1,3\n')
+            bloom_path = os.path.join(tmp, 'keys.bloom')
+            options = dict(mode='bloom', bloom_path=bloom_path, keys_has_header=True)
+            self.assertEqual(list(semi_join(rows, keys_path, 0, key_column='id', **options)), [['1']])
+            mtime = os.stat(bloom_path).st_mtime_ns
+            self.assertEqual(list(semi_join(rows, keys_path, 0, key_column='id', **options)), [['1']])
+            self.assertEqual(os.stat(bloom_path).st_mtime_ns, mtime)
+            self.assertEqual(list(semi_join(rows, keys_path, 0, key_column='other', **options)), [['3']])
+            self.assertEqual(list(semi_join(rows, keys_path, 0, key_column='other', error_rate=0.001, **options)), [['3']])
+
+    def test_split_file_by_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.csv')
+            with open(path, 'w', newline='') as file:
+                file.write('id,text\r\n1,"a\nb"\r\n2,c\r\n3,d\r\n')
+            shards = split_file(path, os.path.join(tmp, 'out'), 2)
+            self.assertEqual(len(shards), 2)
+            with open(shards[0], newline='') as file:
+                self.assertEqual(file.read(), 'id,text\r\n1,"a\nb"\r\n2,c\r\n')
+            with open(shards[1], newline='') as file:
+                self.assertEqual(file.read(), 'id,text\r\n3,d\r\n')
+
+    def test_split_file_by_key_hash(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.csv')
+            with open(path, 'w', newline='') as file:
+                file.write('id,value\n' + ''.join(f'{i % 5},{i}\n' for i in range(50)))
+            shards = split_file(path, os.path.join(tmp, 'out'), 4, by='key_hash', key='id',
+                                output_dialect='unix', max_open_files=2)
+            self.assertEqual(len(shards), 4)
+            seen = {}
+            total = 0
+            for index, shard in enumerate(shards):
+                with open(shard, newline='') as file:
+                    rows = list(csv.reader(file))
+                self.assertEqual(rows[0], ['id', 'value'])
+                for row in rows[1:]:
+                    self.assertEqual(seen.setdefault(row[0], index), index)
+                total += len(rows) - 1
+            self.assertEqual(total, 50)
+
+    def test_split_file_by_key_name_after_bom(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.csv')
+            with open(path, 'w', newline='', encoding='utf-8-sig') as file:
+                file.write('id,value\n1,a\n2,b\n')
+            shards = split_file(path, os.path.join(tmp, 'out'), 2, by='key_hash', key='id')
+            self.assertEqual(len(shards), 2)
+
+    def test_split_file_with_escapechar(self):
+        csv.register_dialect('escaped', escapechar='\\', doublequote=False)
+        self.addCleanup(csv.unregister_dialect, 'escaped')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.csv')
+            with open(path, 'w', newline='') as file:
+                file.write('id,text\r\n1,"a\\"b"\r\n2,c\r\n')
+            shards = split_file(path, os.path.join(tmp, 'out'), 1, dialect='escaped')
+            self.assertEqual(len(shards), 2)
+            with open(shards[0], newline='') as file:
+                self.assertEqual(list(csv.reader(file, 'escaped')), [['id', 'text'], ['1', 'a"b']])
+
+    def test_split_file_closes_input_on_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.csv')
+            with open(path, 'w', newline='') as file:
+                file.write('id,value\n1,a\n')
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always', ResourceWarning)
+                with self.assertRaises(ValueError):
+                    split_file(path, os.path.join(tmp, 'out'), 2, by='key_hash', key='missing')
+                gc.collect()
+            self.assertFalse([warning for warning in caught if issubclass(warning.category, ResourceWarning)])
+
     def test_merge_files_with_same_headers(self):
         with patch('csv.reader') as mock_reader:
             mock_reader.side_effect = [[['A', 'B'], [1, 'x']], [['A', 'B'], [2, 'y']]]
@@ -0,0 +1,74 @@
+import unittest
+import io
+import os
+import tempfile
+
+from csv_utilite import metrics
+from csv_utilite.manipulation import merge_files
+from csv_utilite.reader import Reader
+from csv_utilite.writer import Writer
+
+
+class MetricsTest(unittest.TestCase):
+
+    def tearDown(self):
+        metrics.disable()
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(metrics.active())
+        self.assertEqual(list(Reader(['1,a'])), [[1, 'a']])
+
+    def test_reader_counters_and_stages(self):
+        with metrics.collect(report=False) as registry:
+            rows = list(Reader(['1,a,2.5\n', 'x,true,\n']))
+        self.assertEqual(rows, [[1, 'a', 2.5], ['x', True, None]])
+        self.assertEqual(registry.counters['reader.rows'], 2)
+        self.assertEqual(registry.counters['reader.bytes_read'], 16)
+        self.assertFalse([name for name in registry.counters if name.startswith('reader.cast_failures.')])
+        for stage in ('reader.parse', 'reader.cast', 'reader.io'):
+            self.assertIn(stage, registry.timings)
+        self.assertIsNone(metrics.active())
+
+    def test_cast_failures_count_declared_dtypes(self):
+        with metrics.collect(report=False) as registry:
+            rows = list(Reader(['1,a,2.5,t\n', 'x,2,,maybe\n'], dtypes={0: 'int', 2: 'float', 3: 'bool'}))
+        self.assertEqual(rows, [[1, 'a', 2.5, True], ['x', 2, None, 'maybe']])
+        self.assertEqual(registry.counters['reader.cast_failures.int'], 1)
+        self.assertEqual(registry.counters['reader.cast_failures.bool'], 1)
+        self.assertNotIn('reader.cast_failures.float', registry.counters)
+
+    def test_writer_and_report(self):
+        output = io.StringIO()
+        report = io.StringIO()
+        with metrics.collect(file=report) as registry:
+            Writer(output).writerows([[1, None], ['a', 'b']])
+        self.assertEqual(output.getvalue(), '1,\r\na,b\r\n')
+        self.assertEqual(registry.counters['writer.rows'], 2)
+        self.assertEqual(registry.counters['writer.bytes_written'], len(output.getvalue()))
+        self.assertIn('writer.format', registry.timings)
+        self.assertIn('writer:', report.getvalue())
+        self.assertIn('format', report.getvalue())
+
+    def test_merge_files_and_callbacks(self):
+        published = []
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for index in range(2):
+                path = os.path.join(tmp, f'{index}.csv')
+                with open(path, 'w', newline='') as file:
+                    file.write('a,b\n1,2\n3,4\n')
+                paths.append(path)
+            output_path = os.path.join(tmp, 'merged.csv')
+            with metrics.collect(report=False, metrics=metrics.Metrics(callbacks=[published.append])):
+                merge_files(paths, output_path)
+            with open(output_path, newline='') as file:
+                self.assertEqual(file.read(), 'a,b\r\n1,2\r\n3,4\r\n1,2\r\n3,4\r\n')
+        self.assertEqual(len(published), 1)
+        self.assertEqual(published[0]['merge_files.rows'], 4)
+        self.assertEqual(published[0]['merge_files.bytes_read'], 24)
+        self.assertIn('merge_files.parse_seconds', published[0])
+        self.assertIn('merge_files.io_seconds', published[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
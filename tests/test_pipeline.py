@@ -0,0 +1,63 @@
+import unittest
+import os
+import tempfile
+
+from csv_utilite.pipeline import scan
+
+
+class PipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'sales.csv')
+        with open(self.path, 'w', newline='') as file:
+            file.write('id,country,amount,note\n1,NG,10,x\n2,US,25,y\n3,NG,7,z\n4,NG,30,w\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_filter_select_with_column_sort_head(self):
+        pipeline = (scan(self.path)
+                    .filter(lambda country: country == 'NG', columns=['country'])
+                    .with_column('double', lambda amount: amount * 2, columns=['amount'])
+                    .select('id', 'double')
+                    .sort([('double', 'desc')])
+                    .head(2))
+        self.assertEqual(pipeline.columns, ['id', 'double'])
+        self.assertEqual(pipeline.collect(), [[4, 60], [1, 20]])
+
+    def test_pushdown_reads_only_needed_columns(self):
+        seen = []
+        pipeline = (scan(self.path)
+                    .filter(lambda country: seen.append(country) or country == 'US', columns=['country'])
+                    .select('id'))
+        self.assertIn("columns=['id'] pushed_filters=1", pipeline.explain())
+        self.assertEqual(pipeline.collect(), [[2]])
+        self.assertEqual(seen, ['NG', 'US', 'NG', 'NG'])
+
+    def test_row_functions_and_replaced_column(self):
+        pipeline = scan(self.path).with_column('amount', lambda row: row[0] * 100).select('amount', 'id')
+        self.assertEqual(pipeline.collect(), [[100, 1], [200, 2], [300, 3], [400, 4]])
+
+    def test_head_stops_early_and_sink(self):
+        output = os.path.join(self.tmp.name, 'out.csv')
+        count = scan(self.path).filter(lambda row: row[2] > 9).head(2).sink(output)
+        self.assertEqual(count, 2)
+        with open(output, newline='') as file:
+            self.assertEqual(file.read(), 'id,country,amount,note\r\n1,NG,10,x\r\n2,US,25,y\r\n')
+
+    def test_short_rows_have_missing_cells(self):
+        with open(self.path, 'a', newline='') as file:
+            file.write('5,NG\n')
+        pipeline = (scan(self.path)
+                    .filter(lambda country, note: country == 'NG' and note != 'x', columns=['country', 'note'])
+                    .select('id', 'amount', 'note'))
+        self.assertEqual(pipeline.collect(), [[3, 7, 'z'], [4, 30, 'w'], [5, None, None]])
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            scan(self.path).select('missing').collect()
+
+
+if __name__ == '__main__':
+    unittest.main()
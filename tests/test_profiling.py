@@ -0,0 +1,96 @@
+import unittest
+import os
+import random
+import tempfile
+
+from csv_utilite.profiling import HyperLogLog, TDigest, profile_file, _byte_ranges
+from csv_utilite.reader import Reader
+
+
+class SketchTest(unittest.TestCase):
+
+    def test_hyperloglog_estimate_and_merge(self):
+        first, second = HyperLogLog(), HyperLogLog()
+        for value in range(20000):
+            first.add(str(value))
+        for value in range(10000, 30000):
+            second.add(str(value))
+        first.merge(second)
+        self.assertAlmostEqual(first.estimate(), 30000, delta=30000 * 0.05)
+
+    def test_hyperloglog_small_counts_are_exact_enough(self):
+        sketch = HyperLogLog()
+        for value in ['a', 'b', 'c', 'a', 'b']:
+            sketch.add(value)
+        self.assertEqual(sketch.estimate(), 3)
+
+    def test_tdigest_quantiles_after_merge(self):
+        rng = random.Random(1)
+        values = [rng.random() * 1000 for _ in range(20000)]
+        first, second = TDigest(), TDigest()
+        for value in values[:10000]:
+            first.add(value)
+        for value in values[10000:]:
+            second.add(value)
+        first.merge(second)
+        values.sort()
+        for q in (0.01, 0.5, 0.99):
+            self.assertAlmostEqual(first.quantile(q), values[int(q * len(values))], delta=10)
+
+
+class ProfileFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'data.csv')
+        with open(self.path, 'w', newline='') as file:
+            file.write('id,score,active,name,empty\n')
+            for index in range(30000):
+                score = '' if index % 10 == 0 else f'{index % 100}.5'
+                file.write(f'{index},{score},{"true" if index % 2 else "false"},name{index % 7},\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_profile_columns(self):
+        profile = profile_file(self.path)
+        self.assertEqual(profile.rows, 30000)
+        self.assertEqual([column.name for column in profile.columns], ['id', 'score', 'active', 'name', 'empty'])
+        self.assertEqual(profile.dtypes(), ['int', 'float', 'bool', 'str', 'str'])
+
+        ids, scores, _, names, empty = profile.columns
+        self.assertEqual((ids.min, ids.max), (0, 29999))
+        self.assertEqual(scores.nulls, 3000)
+        self.assertEqual((names.min, names.max), ('name0', 'name6'))
+        self.assertEqual(names.distinct.estimate(), 7)
+        self.assertEqual((names.min_length, names.max_length), (5, 5))
+        self.assertEqual(empty.nulls, 30000)
+        self.assertIsNone(empty.inferred_type)
+        self.assertAlmostEqual(ids.values.quantile(0.5), 15000, delta=300)
+
+    def test_parallel_profile_matches_serial(self):
+        self.assertGreater(len(_byte_ranges(self.path, 0, 4)), 1)
+        serial = profile_file(self.path).as_dict()
+        parallel = profile_file(self.path, processes=4).as_dict()
+        self.assertEqual(parallel['rows'], serial['rows'])
+        for expected, column in zip(serial['columns'], parallel['columns']):
+            for field in ('count', 'nulls', 'type', 'min', 'max', 'distinct'):
+                self.assertEqual(column[field], expected[field])
+
+    def test_dtypes_seed_reader(self):
+        dtypes = profile_file(self.path).dtypes()
+        with open(self.path, newline='') as file:
+            rows = list(Reader(file, dtypes=dtypes))
+        self.assertEqual(rows[0], ['id', 'score', 'active', 'name', 'empty'])
+        self.assertEqual(rows[1], [0, None, False, 'name0', None])
+        self.assertEqual(rows[2], [1, 1.5, True, 'name1', None])
+
+    def test_reader_dtypes_by_index(self):
+        rows = list(Reader(['1,2,x', 'a,,3'], dtypes={1: 'float', 2: 'str'}))
+        self.assertEqual(rows, [[1, 2.0, 'x'], ['a', None, '3']])
+        with self.assertRaises(ValueError):
+            Reader([], dtypes=['date'])
+
+
+if __name__ == '__main__':
+    unittest.main()
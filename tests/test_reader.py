@@ -2,6 +2,8 @@ import unittest
 from unittest.mock import patch, MagicMock
 import csv
 from typing import Iterator, Optional, Any, Union, List, Dict
+from io import StringIO
+from csv_utilite import reader as reader_module
 from csv_utilite.reader import Reader
 
 class Reader(Reader):
@@ -113,5 +115,46 @@ class ReaderTest(unittest.TestCase):
         # Assert that missing values are handled correctly
         self.assertEqual(row, [1, None, True])
 
+class ReaderInterningTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data = ''.join(f"{i},{['NG', 'US', 'GH'][i % 3]},name{i}\n" for i in range(300))
+
+    def test_auto_interning_shares_low_cardinality_strings(self):
+        reader = reader_module.Reader(StringIO(self.data), intern=True, intern_sample=50)
+        rows = list(reader)
+        self.assertIs(rows[0][1], rows[3][1])
+        stats = reader.interning_stats()
+        self.assertEqual(list(stats), [1])
+        self.assertEqual(stats[1]['distinct'], 3)
+        self.assertEqual(stats[1]['hits'], 297)
+        self.assertGreater(stats[1]['bytes_saved'], 0)
+
+    def test_auto_interning_drops_pools_that_outgrow_the_threshold(self):
+        # The country column repeats in the sample, then every value is new, as in a sorted file.
+        data = ''.join(f"{i},{'NG' if i < 100 else f'C{i}'}\n" for i in range(1000))
+        reader = reader_module.Reader(StringIO(data), intern=True, intern_sample=100)
+        rows = list(reader)
+        self.assertEqual(rows[-1], [999, 'C999'])
+        self.assertEqual(reader.interning_stats(), {})
+        self.assertNotIn(1, reader._pools)
+
+    def test_read_batch_dictionary_encodes_columns(self):
+        reader = reader_module.Reader(StringIO(self.data), intern=[1])
+        columns, dictionaries = reader.read_batch(4)
+        self.assertEqual(columns[0], [0, 1, 2, 3])
+        self.assertEqual(columns[1], [0, 1, 2, 0])
+        self.assertEqual(dictionaries, {1: ['NG', 'US', 'GH']})
+        columns, _ = reader.read_batch(1000)
+        self.assertEqual(len(columns[0]), 296)
+        self.assertEqual(reader.read_batch(10), ([], {1: ['NG', 'US', 'GH']}))
+
+    def test_read_batch_keeps_equal_values_of_other_types_apart(self):
+        reader = reader_module.Reader(StringIO('1\nt\n1.0\nf\n0\n'))
+        columns, dictionaries = reader.read_batch(5, encode=[0])
+        self.assertEqual(columns[0], [0, 1, 2, 3, 4])
+        self.assertEqual([(type(value), value) for value in dictionaries[0]],
+                         [(int, 1), (bool, True), (float, 1.0), (bool, False), (int, 0)])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import codecs
+import os
+import tempfile
+
+from csv_utilite.reader import Reader
+from csv_utilite.sniffing import sniff, sniff_bytes, clear_sniff_cache
+
+
+class SniffingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        clear_sniff_cache()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    def test_sniff_semicolon_latin1(self):
+        result = sniff_bytes('name;city\nJosé;Köln\nAna;"A;B"\n'.encode('latin-1'), complete=True)
+        self.assertEqual(result.delimiter, ';')
+        self.assertEqual(result.encoding, 'latin-1')
+        self.assertFalse(result.bom)
+
+    def test_sniff_utf8_bom_and_builtin_dialect(self):
+        result = sniff_bytes(codecs.BOM_UTF8 + b'id,amount\n1,2.5\n2,3.5\n', complete=True)
+        self.assertEqual(result.encoding, 'utf-8-sig')
+        self.assertTrue(result.bom)
+        self.assertEqual(result.dialect, 'excel')
+        self.assertTrue(result.has_header)
+
+    def test_sniff_is_cached_until_file_changes(self):
+        path = self._write('data.csv', b'a,b\n1,2\n')
+        first = sniff(path)
+        self.assertIs(sniff(path), first)
+        self._write('data.csv', b'a;b\n1;2\n3;4\n')
+        self.assertEqual(sniff(path).delimiter, ';')
+
+    def test_reader_auto_dialect(self):
+        path = self._write('data.csv', codecs.BOM_UTF8 + 'id;name\n1;José\n2;"x;y"\n'.encode('utf-8'))
+        with Reader(path, dialect='auto') as reader:
+            self.assertEqual(list(reader), [['id', 'name'], [1, 'José'], [2, 'x;y']])
+            self.assertEqual(reader.sniffed.delimiter, ';')
+        self.assertTrue(reader._file.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,9 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import csv
+import io
 from typing import Iterable, Any, Union, Optional
+from csv_utilite import writer as writer_module
 from csv_utilite.writer import Writer
 
 
@@ -98,6 +100,12 @@ class WriterTest(unittest.TestCase):
 
         # Assert that the mock writer is called with formatted rows
         mock_writer.return_value.writerows.assert_called_once_with([['x', 'y'], ['a', '1']])
+
+    def test_writerows_rejects_empty_row_before_writing_a_list(self):
+        output = io.StringIO()
+        with self.assertRaises(ValueError):
+            writer_module.Writer(output).writerows([['a', 1], []])
+        self.assertEqual(output.getvalue(), '')
         
 if __name__ == '__main__':
     unittest.main()